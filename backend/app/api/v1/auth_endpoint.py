@@ -2,13 +2,14 @@ from fastapi import APIRouter, Header, Depends, HTTPException
 from typing import Union, Dict
 from app.models import (
     Token,
+    Identity,
     LoginRequest,
     AdminResponse,
     ClientResponse,
     TechnicianResponse,
 )
 from app.models.enums import UserRole
-from app.dependencies import auth_service_dependency, get_auth_service
+from app.dependencies import auth_service_dependency, identity_dependency, get_auth_service
 from app.services import AuthService
 
 router: APIRouter = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -37,3 +38,9 @@ async def get_current_user(
     
     token = authorization[7:]  # Remove "Bearer " prefix
     return await service.get_current_user(token)
+
+
+@router.get("/identity", response_model=Identity, status_code=200)
+async def get_current_identity(identity: identity_dependency) -> Identity:
+    """The id, email and role of the bearer token's user, usually without a database read"""
+    return identity
@@ -1,9 +1,12 @@
 from uuid import UUID
 from typing import List, Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from datetime import date
 from app.models import BookingCreate, BookingResponse, BookingUpdate
-from app.models.enums import BookingStatus
+from app.models.enums import BookingStatus, ExportFormat
+from app.utils.export import MEDIA_TYPES, export_lines
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.dependencies import get_booking_service, booking_service_dependency
 from app.services import BookingService
 
@@ -18,6 +21,25 @@ async def create_booking(
     return await service.create_booking(data)
 
 
+@router.get("/export", response_class=StreamingResponse, status_code=200)
+async def export_bookings(
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    client_id: Optional[UUID] = None,
+    technician_id: Optional[UUID] = None,
+    status: Optional[BookingStatus] = None,
+    booking_date: Optional[date] = None,
+    service: BookingService = Depends(get_booking_service),
+) -> StreamingResponse:
+    """Stream every matching booking as NDJSON or CSV"""
+    return StreamingResponse(
+        export_lines(
+            service.stream_bookings(client_id, technician_id, status, booking_date),
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+    )
+
+
 @router.get("/{booking_id}", response_model=BookingResponse, status_code=200)
 async def readone_booking(
     booking_id: UUID, service: booking_service_dependency
@@ -28,18 +50,23 @@ async def readone_booking(
 
 @router.get("/", response_model=List[BookingResponse], status_code=200)
 async def readall_bookings(
+    response: Response,
     client_id: Optional[UUID] = None,
     technician_id: Optional[UUID] = None,
     status: Optional[BookingStatus] = None,
     booking_date: Optional[date] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: BookingService = Depends(get_booking_service),
 ) -> List[BookingResponse]:
-    """"""
-    return await service.readall_bookings(
-        client_id, technician_id, status, booking_date, skip, limit
+    """Newest first, pass the X-Next-Cursor header back as `cursor` to read the next page"""
+    bookings, next_cursor = await service.readall_bookings(
+        client_id, technician_id, status, booking_date, skip, limit, cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return bookings
 
 
 @router.put("/{booking_id}", response_model=BookingResponse, status_code=200)
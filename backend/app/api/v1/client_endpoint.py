@@ -1,10 +1,12 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends
-from typing import List, Optional
-from pydantic import EmailStr
+from fastapi import APIRouter, Depends, Response
+from typing import Annotated, List, Optional
+from pydantic import EmailStr, Field
+from app.core import settings
 from app.models import ClientCreate, ClientUpdate, ClientResponse, FavoriteTechnicianCreate, TechnicianResponse
 from app.services import ClientService
-from app.dependencies import get_client_service, client_service_dependency
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.dependencies import get_client_service, client_service_dependency, get_current_admin
 
 router: APIRouter = APIRouter(prefix="/client", tags=["Client"])
 
@@ -17,6 +19,17 @@ async def create_client(
     return await service.create_client(data)
 
 
+@router.post(
+    "/bulk", response_model=int, status_code=201, dependencies=[Depends(get_current_admin)]
+)
+async def create_clients(
+    data: Annotated[List[ClientCreate], Field(max_length=settings.BULK_MAX_USERS)],
+    service: client_service_dependency,
+) -> int:
+    """Create many clients at once, admins only"""
+    return await service.create_clients(data)
+
+
 @router.get("/{client_id}", response_model=ClientResponse, status_code=200)
 async def readone_client(
     client_id: UUID, service: client_service_dependency
@@ -27,13 +40,18 @@ async def readone_client(
 
 @router.get("/", response_model=List[ClientResponse], status_code=200)
 async def readall_clients(
+    response: Response,
     active: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: ClientService = Depends(get_client_service),
 ) -> List[ClientResponse]:
-    """Read all clients"""
-    return await service.readall_clients(active, skip, limit)
+    """Read all clients, newest first, the X-Next-Cursor header is the `cursor` of the next page"""
+    clients, next_cursor = await service.readall_clients(active, skip, limit, cursor)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return clients
 
 
 @router.put("/{client_id}", response_model=ClientResponse, status_code=200)
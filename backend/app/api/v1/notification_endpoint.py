@@ -1,8 +1,9 @@
 from uuid import UUID
 from typing import List, Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from app.models import NotificationCreate, NotificationResponse
 from app.services import NotificationService
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.dependencies import get_notification_service, notification_service_dependency
 
 router: APIRouter = APIRouter(prefix="/notification", tags=["Notification"])
@@ -24,27 +25,39 @@ async def read_notification(
 
 @router.get("/", response_model=List[NotificationResponse], status_code=200)
 async def readall_notifications(
+    response: Response,
     read: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     notification_service: NotificationService = Depends(get_notification_service),
 ) -> List[NotificationResponse]:
-    return await notification_service.readall_notifications(read, skip, limit)
+    notifications, next_cursor = await notification_service.readall_notifications(
+        read, skip, limit, cursor
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
 
 
 @router.get(
     "/client/{client_id}", response_model=List[NotificationResponse], status_code=200
 )
 async def readall_notifications_by_client(
+    response: Response,
     client_id: UUID,
     read: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     notification_service: NotificationService = Depends(get_notification_service),
 ) -> List[NotificationResponse]:
-    return await notification_service.readall_notifications_by_client_id(
-        client_id, read, skip, limit
+    notifications, next_cursor = await notification_service.readall_notifications_by_client_id(
+        client_id, read, skip, limit, cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
 
 
 @router.get(
@@ -53,15 +66,20 @@ async def readall_notifications_by_client(
     status_code=200,
 )
 async def readall_notifications_by_technician(
+    response: Response,
     technician_id: UUID,
     read: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     notification_service: NotificationService = Depends(get_notification_service),
 ) -> List[NotificationResponse]:
-    return await notification_service.readall_notifications_by_techniian_id(
-        technician_id, read, skip, limit
+    notifications, next_cursor = await notification_service.readall_notifications_by_techniian_id(
+        technician_id, read, skip, limit, cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
 
 @router.put("/mark/{notification_id}")
 async def mark_as_read(
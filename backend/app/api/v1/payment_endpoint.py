@@ -1,8 +1,11 @@
 from uuid import UUID
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from app.models import PaymentCreate, PaymentUpdate, PaymentResponse
-from app.models.enums import PaymentStatus
+from app.models.enums import PaymentStatus, ExportFormat
+from app.utils.export import MEDIA_TYPES, export_lines
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.services import PaymentService
 from app.dependencies import get_payment_service, payment_service_dependency
 
@@ -17,6 +20,28 @@ async def create_payment(
     return await service.create_payment(data)
 
 
+@router.get("/export", response_class=StreamingResponse, status_code=200)
+async def export_payments(
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    client_id: Optional[UUID] = None,
+    technician_id: Optional[UUID] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    status: Optional[PaymentStatus] = None,
+    service: PaymentService = Depends(get_payment_service),
+) -> StreamingResponse:
+    """Stream every matching payment as NDJSON or CSV"""
+    return StreamingResponse(
+        export_lines(
+            service.stream_payments(
+                client_id, technician_id, min_amount, max_amount, status
+            ),
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+    )
+
+
 @router.get("/{payment_id}", response_model=PaymentResponse, status_code=200)
 async def readone_payment(
     payment_id: UUID, service: payment_service_dependency
@@ -27,6 +52,7 @@ async def readone_payment(
 
 @router.get("/", response_model=List[PaymentResponse], status_code=200)
 async def readall_payments(
+    response: Response,
     client_id: Optional[UUID] = None,
     technician_id: Optional[UUID] = None,
     min_amount: Optional[float] = None,
@@ -34,18 +60,23 @@ async def readall_payments(
     status: Optional[PaymentStatus] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: PaymentService = Depends(get_payment_service)
 ) -> List[PaymentResponse]:
-    """"""
-    return await service.readall_payments(
+    """Newest first, pass the X-Next-Cursor header back as `cursor` to read the next page"""
+    payments, next_cursor = await service.readall_payments(
         client_id,
         technician_id,
         min_amount,
         max_amount,
         status,
         skip,
-        limit
+        limit,
+        cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return payments
 
 @router.put("/{payment_id}", response_model=PaymentResponse, status_code=200)
 async def update_payment(
@@ -1,7 +1,11 @@
 from uuid import UUID
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from app.models import ReviewCreate, ReviewResponse, ReviewUpdate
+from app.models.enums import ExportFormat
+from app.utils.export import MEDIA_TYPES, export_lines
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.dependencies import review_service_dependency, get_review_service
 from app.services import ReviewService
 
@@ -16,6 +20,24 @@ async def create_review(
     return await service.create_review(data)
 
 
+@router.get("/export", response_class=StreamingResponse, status_code=200)
+async def export_reviews(
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    client_id: Optional[UUID] = None,
+    technician_id: Optional[UUID] = None,
+    min_rating: Optional[int] = None,
+    service: ReviewService = Depends(get_review_service),
+) -> StreamingResponse:
+    """Stream every matching review as NDJSON or CSV"""
+    return StreamingResponse(
+        export_lines(
+            service.stream_reviews(client_id, technician_id, min_rating),
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+    )
+
+
 @router.get("/{review_id}", response_model=ReviewResponse, status_code=200)
 async def readone_review(
     review_id: UUID, service: review_service_dependency
@@ -26,17 +48,22 @@ async def readone_review(
 
 @router.get("/", response_model=List[ReviewResponse], status_code=200)
 async def readall_review(
+    response: Response,
     client_id: Optional[UUID] = None,
     technician_id: Optional[UUID] = None,
     min_rating: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: ReviewService = Depends(get_review_service),
 ) -> List[ReviewResponse]:
-    """"""
-    return await service.readall_reviews(
-        client_id, technician_id, min_rating, skip, limit
+    """Newest first, pass the X-Next-Cursor header back as `cursor` to read the next page"""
+    reviews, next_cursor = await service.readall_reviews(
+        client_id, technician_id, min_rating, skip, limit, cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reviews
 
 
 @router.put("/{review_id}", response_model=ReviewResponse, status_code=200)
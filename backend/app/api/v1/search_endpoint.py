@@ -1,9 +1,12 @@
 from uuid import UUID
-from typing import List
-from fastapi import APIRouter, Depends
-from app.models import TechnicianResponse
-from app.dependencies import get_search_service
+from datetime import date, time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Response
+from app.models import TechnicianResponse, ServiceSuggestion
+from app.models.base import TimeSlot
+from app.dependencies import get_search_service, service_service_dependency
 from app.services import SearchService
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 router: APIRouter = APIRouter(prefix="/search", tags=["Search"])
 
@@ -12,16 +15,56 @@ router: APIRouter = APIRouter(prefix="/search", tags=["Search"])
     "/nearby/{client_id}/{radius_km}/", response_model=List[TechnicianResponse], status_code=200
 )
 async def search_nearby_technicians(
+    response: Response,
     client_id: UUID,
     radius_km: float = 10,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    ranked: bool = False,
     service: SearchService = Depends(get_search_service),
 ) -> List[TechnicianResponse]:
-    """"""
-    return await service.search_nearby_technicians(
-        client_id, radius_km, [], skip, limit
+    """
+    Nearest first, or best ranked first with `ranked`; pass the X-Next-Cursor header back
+    as `cursor` to read the next page
+    """
+    technicians, next_cursor = await service.search_nearby_technicians(
+        client_id, radius_km, [], skip, limit, cursor, ranked
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return technicians
+
+
+@router.get(
+    "/available/{client_id}/{radius_km}/", response_model=List[TechnicianResponse], status_code=200
+)
+async def search_available_technicians(
+    response: Response,
+    client_id: UUID,
+    radius_km: float,
+    slot_date: date,
+    start_time: time,
+    end_time: time,
+    service_name: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    service: SearchService = Depends(get_search_service),
+) -> List[TechnicianResponse]:
+    """Nearest first, only technicians free for the whole slot, paged like /nearby"""
+    technicians, next_cursor = await service.search_available_technicians(
+        client_id,
+        radius_km,
+        TimeSlot(slot_date=slot_date, start_time=start_time, end_time=end_time),
+        [service_name.lower()] if service_name else [],
+        skip,
+        limit,
+        cursor,
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return technicians
 
 
 @router.get(
@@ -33,9 +76,20 @@ async def search_technicians_by_description(
     problem_description: str,
     skip: int = 0,
     limit: int = 100,
+    ranked: bool = False,
     service: SearchService = Depends(get_search_service),
 ) -> List[TechnicianResponse]:
     """"""
     return await service.search_technicians_by_description(
-        client_id, problem_description, radius_km, skip, limit
+        client_id, problem_description, radius_km, skip, limit, ranked
     )
+
+
+@router.get(
+    "/services/suggest", response_model=List[ServiceSuggestion], status_code=200
+)
+async def suggest_services(
+    q: str, service: service_service_dependency, limit: int = 10
+) -> List[ServiceSuggestion]:
+    """Service names matching what the user has typed so far, best first"""
+    return await service.suggest_services(q, limit)
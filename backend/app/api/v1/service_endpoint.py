@@ -1,8 +1,10 @@
 from uuid import UUID
-from typing import List
+from typing import Annotated, List
 from fastapi import APIRouter, Depends
+from pydantic import Field
+from app.core import settings
 from app.models import ServiceCreate, ServiceResponse, ServiceUpdate
-from app.dependencies import service_service_dependency, get_service_service
+from app.dependencies import service_service_dependency, get_service_service, get_current_admin
 from app.services import ServiceService
 
 router: APIRouter = APIRouter(prefix="/service", tags=["Service"])
@@ -16,6 +18,17 @@ async def create_service(
     return await service.create_service(data)
 
 
+@router.post(
+    "/bulk", response_model=int, status_code=201, dependencies=[Depends(get_current_admin)]
+)
+async def create_services(
+    data: Annotated[List[ServiceCreate], Field(max_length=settings.BULK_MAX_ROWS)],
+    service: service_service_dependency,
+) -> int:
+    """"""
+    return await service.create_services(data)
+
+
 @router.get("/{service_id}", response_model=ServiceResponse, status_code=200)
 async def readone_service(
     service_id: UUID, service: service_service_dependency
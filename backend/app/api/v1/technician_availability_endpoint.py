@@ -1,6 +1,8 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from fastapi import APIRouter, Depends
+from pydantic import Field
+from app.core import settings
 from app.models import (
     TechnicianAvailabilityCreate,
     TechnicianAvailabilityResponse,
@@ -10,6 +12,7 @@ from app.services import TechnicianAvailablityService
 from app.dependencies import (
     technician_availability_service_dependency,
     get_technician_availability_service,
+    get_current_admin,
 )
 
 router: APIRouter = APIRouter(
@@ -25,6 +28,20 @@ async def create_technician_availability(
     return await technician_availability_service.create_technician_availability(data)
 
 
+@router.post(
+    "/bulk", response_model=int, status_code=201, dependencies=[Depends(get_current_admin)]
+)
+async def create_technician_availabilities(
+    data: Annotated[
+        List[TechnicianAvailabilityCreate], Field(max_length=settings.BULK_MAX_ROWS)
+    ],
+    technician_availability_service: technician_availability_service_dependency,
+) -> int:
+    return await technician_availability_service.create_technician_availabilities(
+        data
+    )
+
+
 @router.get(
     "/{technician_availability_id}",
     response_model=TechnicianAvailabilityResponse,
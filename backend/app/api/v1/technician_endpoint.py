@@ -1,10 +1,12 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends
-from typing import List, Optional
-from pydantic import EmailStr
+from fastapi import APIRouter, Depends, Response
+from typing import Annotated, List, Optional
+from pydantic import EmailStr, Field
+from app.core import settings
 from app.models import TechnicianCreate, TechnicianUpdate, TechnicianResponse
 from app.services import TechnicianService
-from app.dependencies import get_technician_service, technician_service_dependency
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.dependencies import get_technician_service, technician_service_dependency, get_current_admin
 
 router: APIRouter = APIRouter(prefix="/technician", tags=["Technician"])
 
@@ -17,6 +19,17 @@ async def create_technician(
     return await service.create_technician(data)
 
 
+@router.post(
+    "/bulk", response_model=int, status_code=201, dependencies=[Depends(get_current_admin)]
+)
+async def create_technicians(
+    data: Annotated[List[TechnicianCreate], Field(max_length=settings.BULK_MAX_USERS)],
+    service: technician_service_dependency,
+) -> int:
+    """Create many technicians at once, admins only"""
+    return await service.create_technicians(data)
+
+
 @router.get("/{technician_id}", response_model=TechnicianResponse, status_code=200)
 async def readone_technician(
     technician_id: UUID, service: technician_service_dependency
@@ -27,14 +40,21 @@ async def readone_technician(
 
 @router.get("/", response_model=List[TechnicianResponse], status_code=200)
 async def readall_technicians(
+    response: Response,
     active: Optional[bool] = None,
     is_available: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: TechnicianService = Depends(get_technician_service),
 ) -> List[TechnicianResponse]:
-    """Read all technicians"""
-    return await service.readall_technicians(active, is_available, skip, limit)
+    """Read all technicians, newest first, the X-Next-Cursor header is the `cursor` of the next page"""
+    technicians, next_cursor = await service.readall_technicians(
+        active, is_available, skip, limit, cursor
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return technicians
 
 
 @router.put("/{technician_id}", response_model=TechnicianResponse, status_code=200)
@@ -1,3 +1,4 @@
+from typing import Literal, Optional, List
 from pydantic_settings import BaseSettings
 
 
@@ -9,13 +10,66 @@ class Settings(BaseSettings):
     DATABASE_PASSWORD: str = ""
     DATABASE_PORT: int = 5432
 
+    # DATABASE POOL
+    DATABASE_POOL_MIN_SIZE: int = 10
+    DATABASE_POOL_MAX_SIZE: int = 20
+    DATABASE_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024
+    DATABASE_COMMAND_TIMEOUT: Optional[float] = 30.0
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 30000
+    DATABASE_APPLICATION_NAME: str = "jobconnect"
+    # Only search and report reads opt into the replicas
+    DATABASE_REPLICA_DSNS: List[str] = []
+
+    # SEARCH
+    # "numpy" needs the `geo` extra
+    SEARCH_ENGINE: Literal["postgis", "numpy"] = "postgis"
+
+    # SEARCH RANKING
+    # `ranked=true` searches, needs the `geo` extra
+    RANKING_ENABLED: bool = False
+    RANKING_MAX_CANDIDATES: int = 5000
+    RANKING_RECENCY_HALF_LIFE_DAYS: float = 30.0
+    RANKING_WEIGHT_DISTANCE: float = 0.35
+    RANKING_WEIGHT_RATING: float = 0.2
+    RANKING_WEIGHT_REVIEWS: float = 0.1
+    RANKING_WEIGHT_VERIFIED: float = 0.1
+    RANKING_WEIGHT_PRICE: float = 0.1
+    RANKING_WEIGHT_EXPERIENCE: float = 0.05
+    RANKING_WEIGHT_RECENCY: float = 0.1
+    RANKING_WEIGHT_RELEVANCE: float = 0.5
+
+    # SEARCH CACHE
+    NEARBY_CACHE_ENABLED: bool = True
+    NEARBY_CACHE_GEOHASH_PRECISION: int = 5
+    NEARBY_CACHE_MAX_ENTRIES: int = 10000
+    NEARBY_CACHE_TTL_SECONDS: float = 300.0
+    # Whole search results, shared by concurrent identical searches; 0 seconds only coalesces
+    SEARCH_RESULT_CACHE_ENABLED: bool = True
+    SEARCH_RESULT_CACHE_MAX_ENTRIES: int = 5000
+    SEARCH_RESULT_CACHE_TTL_SECONDS: float = 2.0
+
+    # USER CACHE
+    # Admins, clients and technicians by id, dropped on every change NOTIFYed by Postgres
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
     # SECURITY
     JWT_SECRET_TOKEN: str = ""
     TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
+    # Trust the claims of a valid access token until it expires, unless the user was
+    # deactivated or deleted since, instead of reading the user on every request
+    AUTH_STATELESS_IDENTITY: bool = True
+    # Threads hashing and verifying passwords with bcrypt, off the event loop
+    PASSWORD_HASH_WORKERS: int = 4
 
     # API
     API_V1_STR: str = "/api/v1"
+    # Items accepted by one /bulk request; clients and technicians cost a bcrypt hash each
+    BULK_MAX_ROWS: int = 1000
+    BULK_MAX_USERS: int = 100
 
     DEBUG: bool = True
 
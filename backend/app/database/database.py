@@ -1,20 +1,156 @@
+import re
+import json
+import time
+import asyncio
+from collections import OrderedDict
 from loguru import logger
-from typing import Optional, Any
-from asyncpg import Record, Pool, create_pool  # type: ignore
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from typing import (
+    Optional,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+)
+from asyncpg import Connection, Record, Pool, connect, create_pool  # type: ignore
 from fastapi import HTTPException
 from pathlib import Path
 
+WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.IGNORECASE)
+
+# asyncpg's default max_cacheable_statement_size, longer statements are prepared every time
+MAX_CACHEABLE_STATEMENT_SIZE = 15 * 1024
+
+
+@lru_cache(maxsize=1024)
+def is_read_only(query: str) -> bool:
+    """True if the statement only reads and is therefore safe to send to a replica"""
+    stripped: str = query.lstrip().upper()
+    if not stripped.startswith(("SELECT", "WITH")):
+        return False
+    return WRITE_KEYWORDS.search(query) is None
+
+
+class PoolMetrics:
+    """
+    Counters for the traffic that went through one connection pool.
+
+    Statement cache hits and misses are counted against a copy of the LRU of prepared
+    statements asyncpg keeps per connection, by the connection's backend pid: a hit reused a
+    statement prepared earlier on that connection, a miss had to be parsed and planned again.
+    """
+
+    def __init__(self, name: str, statement_cache_size: int = 100) -> None:
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self.statement_cache_size = statement_cache_size
+        self.queries: int = 0
+        self.errors: int = 0
+        self.acquire_wait_total_ms: float = 0.0
+        self.acquire_wait_max_ms: float = 0.0
+        self.statement_hits: int = 0
+        self.statement_misses: int = 0
+        self._statements: Dict[int, "OrderedDict[str, None]"] = {}
+
+    def track(self, connection: Connection) -> None:
+        """Start an empty statement cache for a new connection, dropped when it closes"""
+        pid: int = connection.get_server_pid()  # type: ignore
+        self._statements[pid] = OrderedDict()
+        connection.add_termination_listener(  # type: ignore
+            lambda _: self._statements.pop(pid, None)
+        )
+
+    def record_statement(self, pid: int, query: str) -> None:
+        statements: "OrderedDict[str, None]" = self._statements.setdefault(pid, OrderedDict())
+        if query in statements:
+            statements.move_to_end(query)
+            self.statement_hits += 1
+            return
+        self.statement_misses += 1
+        if 0 < self.statement_cache_size and len(query) <= MAX_CACHEABLE_STATEMENT_SIZE:
+            statements[query] = None
+            if len(statements) > self.statement_cache_size:
+                statements.popitem(last=False)
+
+    def record_acquire(self, waited_seconds: float) -> None:
+        waited_ms: float = waited_seconds * 1000
+        self.queries += 1
+        self.acquire_wait_total_ms += waited_ms
+        self.acquire_wait_max_ms = max(self.acquire_wait_max_ms, waited_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.pool.get_size() if self.pool is not None else 0,  # type: ignore
+            "idle": self.pool.get_idle_size() if self.pool is not None else 0,  # type: ignore
+            "queries": self.queries,
+            "errors": self.errors,
+            "acquire_wait_avg_ms": (
+                self.acquire_wait_total_ms / self.queries if self.queries else 0.0
+            ),
+            "acquire_wait_max_ms": self.acquire_wait_max_ms,
+            "statement_cache_hits": self.statement_hits,
+            "statement_cache_misses": self.statement_misses,
+        }
+
 
 class AsyncDatabase:
     def __init__(
-        self, host: str, database: str, username: str, password: str, port: int = 5432
+        self,
+        host: str,
+        database: str,
+        username: str,
+        password: str,
+        port: int = 5432,
+        min_size: int = 10,
+        max_size: int = 10,
+        max_inactive_connection_lifetime: float = 300.0,
+        statement_cache_size: int = 100,
+        command_timeout: Optional[float] = None,
+        statement_timeout_ms: int = 0,
+        application_name: str = "jobconnect",
+        replica_dsns: Optional[List[str]] = None,
     ) -> None:
         self._host = host
         self._database = database
         self._username = username
         self._password = password
         self._port = port
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        self._statement_cache_size = statement_cache_size
+        self._command_timeout = command_timeout
+        self._statement_timeout_ms = statement_timeout_ms
+        self._application_name = application_name
+        self._replica_dsns: List[str] = replica_dsns or []
         self._connection_pool: Optional[Pool] = None
+        self._replica_pools: List[Tuple[PoolMetrics, Pool]] = []
+        self._next_replica: int = 0
+        self._primary_metrics: PoolMetrics = PoolMetrics("primary", statement_cache_size)
+        self._transaction_connection: ContextVar[Optional[Connection]] = ContextVar(
+            f"transaction_connection_{id(self)}", default=None
+        )
+        self._listener: Optional[Connection] = None
+        self._listeners: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._listener_reconnect: Optional[asyncio.Task[None]] = None
+
+    def _pool_options(self, metrics: PoolMetrics) -> Dict[str, Any]:
+        return {
+            "min_size": self._min_size,
+            "max_size": self._max_size,
+            "max_inactive_connection_lifetime": self._max_inactive_connection_lifetime,
+            "statement_cache_size": self._statement_cache_size,
+            "command_timeout": self._command_timeout,
+            "server_settings": {"application_name": self._application_name},
+            "init": partial(self._init_connection, metrics),
+        }
 
     async def connect(self) -> None:
         """Connect to the database."""
@@ -25,13 +161,56 @@ class AsyncDatabase:
                 user=self._username,
                 password=self._password,
                 port=self._port,
+                **self._pool_options(self._primary_metrics),
             )
+            self._primary_metrics.pool = self._connection_pool
             logger.success(f"Connected to the {self._database} database.")
+            logger.info(
+                f"Database pool: min_size={self._min_size}, max_size={self._max_size}, "
+                f"max_inactive_lifetime={self._max_inactive_connection_lifetime}s, "
+                f"statement_cache_size={self._statement_cache_size}, "
+                f"command_timeout={self._command_timeout}s, "
+                f"statement_timeout={self._statement_timeout_ms}ms, "
+                f"replicas={len(self._replica_dsns)}"
+            )
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
 
+        for index, dsn in enumerate(self._replica_dsns):
+            try:
+                metrics = PoolMetrics(f"replica-{index}", self._statement_cache_size)
+                pool: Pool = await create_pool(dsn=dsn, **self._pool_options(metrics))
+                metrics.pool = pool
+                self._replica_pools.append((metrics, pool))
+                logger.success(f"Connected to read replica {index}.")
+            except Exception as e:
+                logger.error(f"Failed to connect to read replica {index}: {e}")
+
+    async def _init_connection(self, metrics: PoolMetrics, connection: Connection) -> None:
+        """Register codecs and session settings once for every new pool connection."""
+        for typename in ("json", "jsonb"):
+            await connection.set_type_codec(  # type: ignore
+                typename, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+            )
+        await connection.execute(  # type: ignore
+            f"""
+            SET TIME ZONE 'UTC';
+            SET statement_timeout = {int(self._statement_timeout_ms)};
+            """
+        )
+        metrics.track(connection)
+
     async def disconnect(self) -> None:
         """Disconnect from the database"""
+        if self._listener_reconnect is not None:
+            self._listener_reconnect.cancel()
+            self._listener_reconnect = None
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            await listener.close()  # type: ignore
+        for _, pool in self._replica_pools:
+            await pool.close()
+        self._replica_pools = []
         if self._connection_pool is None:
             return
         await self._connection_pool.close()
@@ -49,36 +228,196 @@ class AsyncDatabase:
         except Exception as e:
             logger.error(f"Failed to create database tables: {e}")
 
-    async def execute(self, query: str, *values: Any) -> str:
-        """Execute a query on the database."""
+    async def _connect_listener(self) -> Connection:
+        """Open the dedicated primary connection that LISTENs for every subscribed channel"""
+        connection: Connection = await connect(
+            host=self._host,
+            database=self._database,
+            user=self._username,
+            password=self._password,
+            port=self._port,
+            server_settings={"application_name": f"{self._application_name}-listener"},
+        )
+        connection.add_termination_listener(self._on_listener_lost)  # type: ignore
+        for channel in self._listeners:
+            await connection.add_listener(channel, self._dispatch)  # type: ignore
+        return connection
+
+    def _dispatch(self, connection: Connection, pid: int, channel: str, payload: str) -> None:
+        for callback in self._listeners.get(channel, []):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Listener for {channel} failed: {e}")
+
+    def _on_listener_lost(self, connection: Connection) -> None:
+        if self._listener is not connection:
+            return
+        logger.warning("Lost the LISTEN connection, reconnecting")
+        self._listener = None
+        self._listener_reconnect = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self, delay: float = 1.0) -> None:
+        """
+        Reopen the LISTEN connection with backoff. Notifications sent while it was down are
+        lost, so every callback is called with a None payload to make its cache start over.
+        """
+        while self._listener is None:
+            try:
+                self._listener = await self._connect_listener()
+            except Exception as e:
+                logger.error(f"Failed to reopen the LISTEN connection: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        logger.success("LISTEN connection restored")
+        for channel in self._listeners:
+            for callback in self._listeners[channel]:
+                callback(None)
+
+    async def listen(self, channel: str, callback: Callable[[Optional[str]], None]) -> None:
+        """
+        Call `callback` with the payload of every NOTIFY on `channel`, or with None when
+        notifications may have been missed. Callbacks run on the event loop and must not block.
+        """
+        subscribed: bool = channel in self._listeners
+        self._listeners.setdefault(channel, []).append(callback)
+        if self._listener is None:
+            self._listener = await self._connect_listener()
+        elif not subscribed:
+            await self._listener.add_listener(channel, self._dispatch)  # type: ignore
+
+    async def notify(self, channel: str, payload: str = "") -> None:
+        """Send a NOTIFY, delivered when the surrounding transaction (if any) commits"""
+        await self.execute("SELECT pg_notify($1, $2)", channel, payload)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Per-pool query counts, sizes, acquire wait times and statement cache reuse"""
+        return [
+            self._primary_metrics.as_dict(),
+            *(metrics.as_dict() for metrics, _ in self._replica_pools),
+        ]
+
+    def _route(self, query: str, replica: bool) -> Tuple[PoolMetrics, Pool]:
+        """
+        Pick the pool for a statement: the primary, unless the caller accepts a `replica` for
+        a read-only statement, spread over the replicas.
+        """
         if self._connection_pool is None:
             raise HTTPException(status_code=500, detail="Database is not connected.")
-        async with self._connection_pool.acquire() as connection:  # type: ignore
+        if not replica or not self._replica_pools or not is_read_only(query):
+            return self._primary_metrics, self._connection_pool
+        self._next_replica = (self._next_replica + 1) % len(self._replica_pools)
+        return self._replica_pools[self._next_replica]
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Connection]:
+        """
+        Run every query issued inside the block on one primary connection, as one unit of work.
+        Nested blocks become savepoints of the outer transaction.
+        """
+        connection: Optional[Connection] = self._transaction_connection.get()
+        if connection is not None:
             async with connection.transaction():  # type: ignore
-                return await connection.execute(query, *values)  # type: ignore
+                yield connection
+            return
+        async with self._acquire() as connection:
+            async with connection.transaction():  # type: ignore
+                token = self._transaction_connection.set(connection)
+                try:
+                    yield connection
+                finally:
+                    self._transaction_connection.reset(token)
 
-    async def fetchone(self, query: str, *values: Any) -> Optional[Record]:
-        """Fetch one record from the database."""
-        if self._connection_pool is None:
-            raise HTTPException(status_code=500, detail="Database is not connected.")
+    @asynccontextmanager
+    async def _acquire(
+        self, query: str = "", replica: bool = False, prepared: bool = False
+    ) -> AsyncIterator[Connection]:
+        """
+        Reuse the connection of the enclosing transaction, otherwise borrow one from the pool
+        the statement is routed to. `prepared` statements go through the connection's
+        statement cache and are counted as its hits or misses.
+        """
+        connection: Optional[Connection] = self._transaction_connection.get()
+        if connection is not None:
+            self._primary_metrics.queries += 1
+            if prepared:
+                pid: int = connection.get_server_pid()  # type: ignore
+                self._primary_metrics.record_statement(pid, query)
+            yield connection
+            return
+        metrics, pool = self._route(query, replica)
+        started: float = time.perf_counter()
+        async with pool.acquire() as connection:  # type: ignore
+            metrics.record_acquire(time.perf_counter() - started)
+            if prepared:
+                metrics.record_statement(connection.get_server_pid(), query)  # type: ignore
+            try:
+                yield connection
+            except Exception:
+                metrics.errors += 1
+                raise
+
+    async def execute(self, query: str, *values: Any) -> str:
+        """Execute a query on the database."""
+        # Without arguments asyncpg sends it as a simple query, nothing is prepared
+        async with self._acquire(query, prepared=bool(values)) as connection:
+            return await connection.execute(query, *values)  # type: ignore
+
+    async def fetchone(
+        self, query: str, *values: Any, replica: bool = False
+    ) -> Optional[Record]:
+        """
+        Fetch one record from the database.
+        Read-only statements go to a replica only when the caller opts in with `replica`,
+        for reads that tolerate lag and never decide a write.
+        """
         try:
-            async with self._connection_pool.acquire() as connection:  # type: ignore
-                async with connection.transaction():  # type: ignore
-                    return await connection.fetchrow(query, *values)  # type: ignore
+            async with self._acquire(query, replica, prepared=True) as connection:
+                return await connection.fetchrow(query, *values)  # type: ignore
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch record from database: {e}")
             return None
 
-    async def fetchall(self, query: str, *values: Any) -> list[Record]:
-        """Fetch all records from the database."""
-        if self._connection_pool is None:
-            raise HTTPException(status_code=500, detail="Database is not connected.")
-        async with self._connection_pool.acquire() as connection:  # type: ignore
-            async with connection.transaction():  # type: ignore
-                return await connection.fetch(query, *values)  # type: ignore
-    
-    async def count(self, query: str, *values: Any) -> int:
-        result: Optional[Record] = await self.fetchone(query, *values)
+    async def fetchall(
+        self, query: str, *values: Any, replica: bool = False
+    ) -> list[Record]:
+        """
+        Fetch all records from the database.
+        Read-only statements go to a replica only when the caller opts in with `replica`.
+        """
+        async with self._acquire(query, replica, prepared=True) as connection:
+            return await connection.fetch(query, *values)  # type: ignore
+
+    async def fetch_iter(
+        self, query: str, *values: Any, prefetch: int = 500, replica: bool = False
+    ) -> AsyncIterator[Record]:
+        """
+        Stream records through a server-side cursor, holding at most `prefetch` rows in memory.
+        The connection stays checked out until the iterator is exhausted or closed.
+        """
+        in_transaction: bool = self._transaction_connection.get() is not None
+        async with self._acquire(query, replica, prepared=True) as connection:
+            if in_transaction:
+                async for record in connection.cursor(query, *values, prefetch=prefetch):  # type: ignore
+                    yield record
+                return
+            async with connection.transaction(readonly=True):  # type: ignore
+                async for record in connection.cursor(query, *values, prefetch=prefetch):  # type: ignore
+                    yield record
+
+    async def copy_records(
+        self, table: str, records: Iterable[Sequence[Any]], columns: Sequence[str]
+    ) -> str:
+        """Load records into a table with the binary COPY protocol."""
+        async with self._acquire() as connection:
+            return await connection.copy_records_to_table(  # type: ignore
+                table, records=records, columns=columns
+            )
+
+    async def count(self, query: str, *values: Any, replica: bool = False) -> int:
+        result: Optional[Record] = await self.fetchone(query, *values, replica=replica)
         if result is None:
             return 0
         return result["count"]
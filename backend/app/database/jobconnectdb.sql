@@ -1,5 +1,6 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "postgis";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 CREATE TABLE IF NOT EXISTS admin (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -34,6 +35,8 @@ CREATE TABLE IF NOT EXISTS technician (
     location GEOGRAPHY(POINT, 4326) NOT NULL,
     is_available BOOLEAN NOT NULL DEFAULT TRUE,
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    rating_sum BIGINT NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
@@ -136,6 +139,346 @@ CREATE TABLE IF NOT EXISTS technician_availability (
     FOREIGN KEY (technician_id) REFERENCES technician (id)
 );
 
+-- Running review totals on technician, so reading a rating never aggregates review
+CREATE OR REPLACE FUNCTION update_technician_rating() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE technician
+        SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+        WHERE id = OLD.technician_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE technician
+        SET rating_sum = rating_sum + NEW.rating, rating_count = rating_count + 1
+        WHERE id = NEW.technician_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_update_technician_rating ON review;
+CREATE TRIGGER trg_update_technician_rating
+AFTER INSERT OR DELETE OR UPDATE OF rating, technician_id ON review
+FOR EACH ROW
+EXECUTE FUNCTION update_technician_rating();
+
+-- Recompute the totals from review, returns the number of technicians that had drifted
+CREATE OR REPLACE FUNCTION reconcile_technician_ratings() RETURNS INTEGER AS $$
+DECLARE
+    fixed INTEGER;
+BEGIN
+    WITH totals AS (
+        SELECT t.id, COALESCE(SUM(r.rating), 0) AS rating_sum, COUNT(r.id) AS rating_count
+        FROM technician t
+        LEFT JOIN review r ON r.technician_id = t.id
+        GROUP BY t.id
+    )
+    UPDATE technician t
+    SET rating_sum = totals.rating_sum, rating_count = totals.rating_count
+    FROM totals
+    WHERE t.id = totals.id
+    AND (t.rating_sum, t.rating_count) IS DISTINCT FROM (totals.rating_sum, totals.rating_count);
+    GET DIAGNOSTICS fixed = ROW_COUNT;
+    RETURN fixed;
+END
+$$ LANGUAGE plpgsql;
+
+-- Databases created before the totals existed get the columns and a one-off backfill
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_name = 'technician'
+          AND column_name = 'rating_count'
+    ) THEN
+        ALTER TABLE technician ADD COLUMN rating_sum BIGINT NOT NULL DEFAULT 0;
+        ALTER TABLE technician ADD COLUMN rating_count INTEGER NOT NULL DEFAULT 0;
+        PERFORM reconcile_technician_ratings();
+    END IF;
+END$$;
+
+-- technician_card: the precomputed service names and verified flag of every technician,
+-- kept current by triggers so technician reads join one row instead of running subqueries
+CREATE TABLE IF NOT EXISTS technician_card (
+    technician_id UUID PRIMARY KEY,
+    services TEXT[] NOT NULL DEFAULT '{}',
+    is_verified BOOLEAN NOT NULL DEFAULT FALSE,
+    FOREIGN KEY (technician_id) REFERENCES technician (id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION refresh_technician_card(target UUID) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO technician_card (technician_id, services, is_verified)
+    SELECT
+        t.id,
+        ARRAY(
+            SELECT s.name
+            FROM technician_service ts
+            JOIN service s ON s.id = ts.service_id
+            WHERE ts.technician_id = t.id
+            ORDER BY s.name
+        ),
+        EXISTS (SELECT 1 FROM verified_technician vt WHERE vt.technician_id = t.id)
+    FROM technician t
+    WHERE t.id = target
+    ON CONFLICT (technician_id) DO UPDATE
+    SET services = EXCLUDED.services, is_verified = EXCLUDED.is_verified;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION refresh_technician_card_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'technician' THEN
+        PERFORM refresh_technician_card(NEW.id);
+    ELSIF TG_TABLE_NAME = 'service' THEN
+        PERFORM refresh_technician_card(ts.technician_id)
+        FROM technician_service ts
+        WHERE ts.service_id = NEW.id;
+    ELSE
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM refresh_technician_card(OLD.technician_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM refresh_technician_card(NEW.technician_id);
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_technician_card_technician ON technician;
+CREATE TRIGGER trg_technician_card_technician
+AFTER INSERT ON technician
+FOR EACH ROW
+EXECUTE FUNCTION refresh_technician_card_trigger();
+
+DROP TRIGGER IF EXISTS trg_technician_card_technician_service ON technician_service;
+CREATE TRIGGER trg_technician_card_technician_service
+AFTER INSERT OR DELETE OR UPDATE OF service_id, technician_id ON technician_service
+FOR EACH ROW
+EXECUTE FUNCTION refresh_technician_card_trigger();
+
+DROP TRIGGER IF EXISTS trg_technician_card_verified_technician ON verified_technician;
+CREATE TRIGGER trg_technician_card_verified_technician
+AFTER INSERT OR DELETE OR UPDATE ON verified_technician
+FOR EACH ROW
+EXECUTE FUNCTION refresh_technician_card_trigger();
+
+DROP TRIGGER IF EXISTS trg_technician_card_service ON service;
+CREATE TRIGGER trg_technician_card_service
+AFTER UPDATE OF name ON service
+FOR EACH ROW
+EXECUTE FUNCTION refresh_technician_card_trigger();
+
+-- Technicians whose card is missing or differs from the source tables
+CREATE OR REPLACE FUNCTION technician_card_drift() RETURNS TABLE(technician_id UUID) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT t.id
+    FROM technician t
+    LEFT JOIN technician_card tc ON tc.technician_id = t.id
+    WHERE tc.technician_id IS NULL
+    OR tc.services IS DISTINCT FROM ARRAY(
+        SELECT s.name
+        FROM technician_service ts
+        JOIN service s ON s.id = ts.service_id
+        WHERE ts.technician_id = t.id
+        ORDER BY s.name
+    )
+    OR tc.is_verified IS DISTINCT FROM EXISTS (
+        SELECT 1 FROM verified_technician vt WHERE vt.technician_id = t.id
+    );
+END
+$$ LANGUAGE plpgsql;
+
+-- Rebuild the drifted cards, returns how many were rebuilt
+CREATE OR REPLACE FUNCTION reconcile_technician_cards() RETURNS INTEGER AS $$
+DECLARE
+    fixed INTEGER;
+BEGIN
+    PERFORM refresh_technician_card(drift.technician_id) FROM technician_card_drift() drift;
+    GET DIAGNOSTICS fixed = ROW_COUNT;
+    RETURN fixed;
+END
+$$ LANGUAGE plpgsql;
+
+-- Backfill cards for technicians created before the read model existed
+SELECT refresh_technician_card(t.id)
+FROM technician t
+WHERE NOT EXISTS (SELECT 1 FROM technician_card tc WHERE tc.technician_id = t.id);
+
+-- In-process caches of the service table reload when this channel is notified,
+-- once per writing statement, on commit
+CREATE OR REPLACE FUNCTION notify_service_changed() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('service_changed', TG_OP);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_service_changed ON service;
+CREATE TRIGGER trg_service_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON service
+FOR EACH STATEMENT EXECUTE FUNCTION notify_service_changed();
+
+-- In-process search caches and indexes follow technicians through this channel: the payload
+-- lists the changed technician ids and their old and new points. A technician whose location,
+-- is_active or is_available changes, or whose services change, is sent by row; inserts are sent
+-- once per statement, and an insert of more than 50 rows sends '{}', meaning "everything changed"
+CREATE OR REPLACE FUNCTION technician_point(target UUID) RETURNS JSONB AS $$
+    SELECT jsonb_build_array(ST_X(t.location::geometry), ST_Y(t.location::geometry))
+    FROM technician t
+    WHERE t.id = target
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION notify_technician_changed() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'technician' AND TG_OP = 'UPDATE' THEN
+        PERFORM pg_notify('technician_changed', jsonb_build_object(
+            'ids', jsonb_build_array(NEW.id),
+            'points', jsonb_build_array(
+                jsonb_build_array(ST_X(OLD.location::geometry), ST_Y(OLD.location::geometry)),
+                jsonb_build_array(ST_X(NEW.location::geometry), ST_Y(NEW.location::geometry))
+            )
+        )::text);
+    ELSIF TG_TABLE_NAME = 'technician' THEN
+        PERFORM pg_notify('technician_changed', jsonb_build_object(
+            'ids', jsonb_build_array(OLD.id),
+            'points', jsonb_build_array(
+                jsonb_build_array(ST_X(OLD.location::geometry), ST_Y(OLD.location::geometry))
+            )
+        )::text);
+    ELSE
+        PERFORM pg_notify('technician_changed', jsonb_build_object(
+            'ids', jsonb_build_array(
+                CASE WHEN TG_OP <> 'INSERT' THEN OLD.technician_id END,
+                CASE WHEN TG_OP <> 'DELETE' THEN NEW.technician_id END
+            ),
+            'points', jsonb_build_array(
+                CASE WHEN TG_OP <> 'INSERT' THEN technician_point(OLD.technician_id) END,
+                CASE WHEN TG_OP <> 'DELETE' THEN technician_point(NEW.technician_id) END
+            )
+        )::text);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_technicians_inserted() RETURNS TRIGGER AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM inserted) THEN
+        RETURN NULL;
+    END IF;
+    IF (SELECT COUNT(*) FROM inserted) > 50 THEN
+        PERFORM pg_notify('technician_changed', '{}');
+        RETURN NULL;
+    END IF;
+    PERFORM pg_notify('technician_changed', jsonb_build_object(
+        'ids', (SELECT jsonb_agg(i.id) FROM inserted i),
+        'points', (
+            SELECT jsonb_agg(jsonb_build_array(ST_X(i.location::geometry), ST_Y(i.location::geometry)))
+            FROM inserted i
+        )
+    )::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_technician_changed_insert ON technician;
+CREATE TRIGGER trg_technician_changed_insert
+AFTER INSERT ON technician
+REFERENCING NEW TABLE AS inserted
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_technicians_inserted();
+
+DROP TRIGGER IF EXISTS trg_technician_changed ON technician;
+CREATE TRIGGER trg_technician_changed
+AFTER DELETE OR UPDATE OF location, is_active, is_available ON technician
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_changed();
+
+DROP TRIGGER IF EXISTS trg_technician_changed_service ON technician_service;
+CREATE TRIGGER trg_technician_changed_service
+AFTER INSERT OR DELETE OR UPDATE OF service_id, technician_id ON technician_service
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_changed();
+
+-- The in-process ranking features follow ratings, verification, service prices and experience,
+-- and bookings (activity recency) through this channel, the payload is the technician id
+CREATE OR REPLACE FUNCTION notify_technician_features_changed() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'technician' THEN
+        PERFORM pg_notify('technician_features_changed', NEW.id::text);
+    ELSE
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM pg_notify('technician_features_changed', OLD.technician_id::text);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM pg_notify('technician_features_changed', NEW.technician_id::text);
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_technician_features_rating ON technician;
+CREATE TRIGGER trg_technician_features_rating
+AFTER UPDATE OF rating_sum, rating_count ON technician
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_features_changed();
+
+DROP TRIGGER IF EXISTS trg_technician_features_service ON technician_service;
+CREATE TRIGGER trg_technician_features_service
+AFTER UPDATE OF price, experience_years ON technician_service
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_features_changed();
+
+DROP TRIGGER IF EXISTS trg_technician_features_verified ON verified_technician;
+CREATE TRIGGER trg_technician_features_verified
+AFTER INSERT OR DELETE OR UPDATE ON verified_technician
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_features_changed();
+
+DROP TRIGGER IF EXISTS trg_technician_features_booking ON booking;
+CREATE TRIGGER trg_technician_features_booking
+AFTER INSERT ON booking
+FOR EACH ROW
+EXECUTE FUNCTION notify_technician_features_changed();
+
+-- Spatial indexes: radius filters (ST_DWithin) and nearest-first ordering (<->) run on these
+CREATE INDEX IF NOT EXISTS idx_technician_location ON technician USING GIST (location);
+CREATE INDEX IF NOT EXISTS idx_client_location ON client USING GIST (location);
+CREATE INDEX IF NOT EXISTS idx_booking_location ON booking USING GIST (location);
+
+-- Availability search and booking collisions: a technician's bookings of one day by time,
+-- status included so the overlap check never visits the table
+CREATE INDEX IF NOT EXISTS idx_booking_technician_slot
+ON booking (technician_id, booking_date, start_time, end_time) INCLUDE (status);
+
+-- Description search and service autocomplete: trigram indexes serve the ILIKE and <% matches
+-- on service, and the technician_service indexes join the matched services back to their technicians
+CREATE INDEX IF NOT EXISTS idx_service_name_trgm ON service USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_service_description_trgm ON service USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_technician_service_service_id ON technician_service (service_id);
+CREATE INDEX IF NOT EXISTS idx_technician_service_technician_id ON technician_service (technician_id);
+
+-- Keyset pagination indexes: every list endpoint reads newest first on (created_at, id),
+-- optionally narrowed to one client or technician first
+CREATE INDEX IF NOT EXISTS idx_client_created_at_id ON client (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_technician_created_at_id ON technician (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_booking_created_at_id ON booking (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_booking_client_created_at_id ON booking (client_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_booking_technician_created_at_id ON booking (technician_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_review_created_at_id ON review (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_review_technician_created_at_id ON review (technician_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_payment_created_at_id ON payment (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_payment_client_created_at_id ON payment (client_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_payment_technician_created_at_id ON payment (technician_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_notification_created_at_id ON notification (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_notification_client_created_at_id ON notification (client_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_notification_technician_created_at_id ON notification (technician_id, created_at, id);
+
 -- Indexes
 -- 1. Add `search_vector` column if it doesn't exist
 DO $$
@@ -242,3 +585,94 @@ BEGIN
     ORDER BY relevance DESC, s.name ASC;
 END
 $$ LANGUAGE plpgsql;
+
+-- Access tokens carry the token_version of their user and are trusted until they expire. A
+-- change of is_active bumps the version, revoking every token issued before it, and is sent on
+-- this channel with the new version so every process updates its revocation set at once
+ALTER TABLE admin ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE client ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE technician ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+
+-- The revocation set is loaded from these at startup, a few rows out of every user
+CREATE INDEX IF NOT EXISTS idx_admin_access_revoked ON admin (id)
+WHERE NOT is_active OR token_version > 0;
+CREATE INDEX IF NOT EXISTS idx_client_access_revoked ON client (id)
+WHERE NOT is_active OR token_version > 0;
+CREATE INDEX IF NOT EXISTS idx_technician_access_revoked ON technician (id)
+WHERE NOT is_active OR token_version > 0;
+
+-- Deleted users leave a tombstone, their tokens stay revoked across reloads of the set until
+-- they have all expired; the app prunes tombstones older than its token lifetime
+CREATE TABLE IF NOT EXISTS revoked_user (
+    id UUID PRIMARY KEY,
+    token_version INTEGER NOT NULL,
+    revoked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION revoke_user_tokens() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO revoked_user (id, token_version) VALUES (OLD.id, OLD.token_version + 1)
+        ON CONFLICT (id) DO UPDATE
+        SET token_version = EXCLUDED.token_version, revoked_at = EXCLUDED.revoked_at;
+        PERFORM pg_notify('user_access_changed', jsonb_build_object(
+            'id', OLD.id, 'version', OLD.token_version + 1, 'active', FALSE
+        )::text);
+        RETURN OLD;
+    END IF;
+    IF NEW.is_active IS DISTINCT FROM OLD.is_active THEN
+        NEW.token_version := OLD.token_version + 1;
+        PERFORM pg_notify('user_access_changed', jsonb_build_object(
+            'id', NEW.id, 'version', NEW.token_version, 'active', NEW.is_active
+        )::text);
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_admin_revoke_tokens ON admin;
+CREATE TRIGGER trg_admin_revoke_tokens
+BEFORE DELETE OR UPDATE OF is_active ON admin
+FOR EACH ROW EXECUTE FUNCTION revoke_user_tokens();
+
+DROP TRIGGER IF EXISTS trg_client_revoke_tokens ON client;
+CREATE TRIGGER trg_client_revoke_tokens
+BEFORE DELETE OR UPDATE OF is_active ON client
+FOR EACH ROW EXECUTE FUNCTION revoke_user_tokens();
+
+DROP TRIGGER IF EXISTS trg_technician_revoke_tokens ON technician;
+CREATE TRIGGER trg_technician_revoke_tokens
+BEFORE DELETE OR UPDATE OF is_active ON technician
+FOR EACH ROW EXECUTE FUNCTION revoke_user_tokens();
+
+-- In-process user caches drop a user when their row changes, the payload is the user id
+CREATE OR REPLACE FUNCTION notify_user_changed() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('user_changed', OLD.id::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_admin_user_changed ON admin;
+CREATE TRIGGER trg_admin_user_changed
+AFTER UPDATE OR DELETE ON admin
+FOR EACH ROW EXECUTE FUNCTION notify_user_changed();
+
+DROP TRIGGER IF EXISTS trg_client_user_changed ON client;
+CREATE TRIGGER trg_client_user_changed
+AFTER UPDATE OR DELETE ON client
+FOR EACH ROW EXECUTE FUNCTION notify_user_changed();
+
+DROP TRIGGER IF EXISTS trg_technician_user_changed ON technician;
+CREATE TRIGGER trg_technician_user_changed
+AFTER UPDATE OR DELETE ON technician
+FOR EACH ROW EXECUTE FUNCTION notify_user_changed();
+
+-- Logins read only these columns by email, answered by an index-only scan instead of the row;
+-- the signup check for a taken email or phone is answered by the unique indexes alone
+CREATE INDEX IF NOT EXISTS idx_admin_credentials
+ON admin (email) INCLUDE (id, hashed_password, is_active, token_version);
+CREATE INDEX IF NOT EXISTS idx_client_credentials
+ON client (email) INCLUDE (id, hashed_password, is_active, token_version);
+CREATE INDEX IF NOT EXISTS idx_technician_credentials
+ON technician (email) INCLUDE (id, hashed_password, is_active, token_version);
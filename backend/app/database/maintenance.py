@@ -0,0 +1,73 @@
+"""
+Maintenance commands for the denormalized columns and read models.
+
+    python -m app.database.maintenance reconcile-ratings
+    python -m app.database.maintenance check-technician-cards
+    python -m app.database.maintenance reconcile-technician-cards
+"""
+
+import sys
+import asyncio
+from loguru import logger
+from typing import Awaitable, Callable, Dict, List, Optional
+from asyncpg import Record  # type: ignore
+from app.core import settings
+from .database import AsyncDatabase
+
+
+async def reconcile_ratings(db: AsyncDatabase) -> int:
+    """Recompute technician rating_sum/rating_count from review, returns the rows fixed"""
+    record: Optional[Record] = await db.fetchone(
+        "SELECT reconcile_technician_ratings() AS fixed"
+    )
+    return record["fixed"] if record is not None else 0
+
+
+async def check_technician_cards(db: AsyncDatabase) -> int:
+    """Count the technician cards that are missing or differ from the source tables"""
+    drifted: List[Record] = await db.fetchall(
+        "SELECT technician_id FROM technician_card_drift()"
+    )
+    for record in drifted:
+        logger.warning(f"technician_card out of date for {record['technician_id']}")
+    return len(drifted)
+
+
+async def reconcile_technician_cards(db: AsyncDatabase) -> int:
+    """Rebuild the technician cards that drifted, returns the rows fixed"""
+    record: Optional[Record] = await db.fetchone(
+        "SELECT reconcile_technician_cards() AS fixed"
+    )
+    return record["fixed"] if record is not None else 0
+
+
+COMMANDS: Dict[str, Callable[[AsyncDatabase], Awaitable[int]]] = {
+    "reconcile-ratings": reconcile_ratings,
+    "check-technician-cards": check_technician_cards,
+    "reconcile-technician-cards": reconcile_technician_cards,
+}
+
+
+async def main(command: str) -> None:
+    db = AsyncDatabase(
+        host=settings.DATABASE_HOST,
+        database=settings.DATABASE_NAME,
+        username=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        port=settings.DATABASE_PORT,
+        min_size=1,
+        max_size=1,
+        application_name=f"{settings.DATABASE_APPLICATION_NAME}-maintenance",
+    )
+    await db.connect()
+    try:
+        rows: int = await COMMANDS[command](db)
+        logger.success(f"{command}: {rows} rows")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in COMMANDS:
+        sys.exit(f"usage: python -m app.database.maintenance {{{','.join(COMMANDS)}}}")
+    asyncio.run(main(sys.argv[1]))
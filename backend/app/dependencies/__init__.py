@@ -1,5 +1,7 @@
+from .container import Container
 from .deps import (
     get_db,
+    get_container,
     get_admin_repository,
     get_admin_service,
     get_client_repository,
@@ -10,11 +12,16 @@ from .deps import (
     get_booking_service,
     get_review_repository,
     get_review_service,
+    get_service_catalogue,
     get_service_repository,
     get_service_service,
+    get_nearby_cache,
     get_search_repository,
     get_search_service,
+    get_access_revocations,
     get_auth_service,
+    get_current_identity,
+    get_current_admin,
     get_notification_repository,
     get_notification_service,
     get_technician_availability_repository,
@@ -41,6 +48,8 @@ from .deps import (
     search_repository_dependency,
     search_service_dependency,
     auth_service_dependency,
+    identity_dependency,
+    admin_identity_dependency,
     notification_repository_dependency,
     notification_service_dependency,
     technician_availability_repository_dependency,
@@ -54,7 +63,9 @@ from .deps import (
 )
 
 __all__ = [
+    "Container",
     "get_db",
+    "get_container",
     "get_admin_repository",
     "get_admin_service",
     "get_client_repository",
@@ -65,11 +76,16 @@ __all__ = [
     "get_booking_service",
     "get_review_repository",
     "get_review_service",
+    "get_service_catalogue",
     "get_service_repository",
     "get_service_service",
+    "get_nearby_cache",
     "get_search_repository",
     "get_search_service",
+    "get_access_revocations",
     "get_auth_service",
+    "get_current_identity",
+    "get_current_admin",
     "get_notification_repository",
     "get_notification_service",
     "get_technician_availability_repository",
@@ -96,6 +112,8 @@ __all__ = [
     "search_repository_dependency",
     "search_service_dependency",
     "auth_service_dependency",
+    "identity_dependency",
+    "admin_identity_dependency",
     "notification_repository_dependency",
     "notification_service_dependency",
     "get_technician_availability_repository",
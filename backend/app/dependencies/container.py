@@ -0,0 +1,107 @@
+from typing import Any, Optional
+from app.database import AsyncDatabase
+from app.repository import (
+    AccessRevocations,
+    AdminRepository,
+    BookingRepository,
+    ClientRepository,
+    NearbyCache,
+    NotificationRepository,
+    PaymentRepository,
+    ReportRepository,
+    ReviewRepository,
+    SearchRepository,
+    ServiceCatalogue,
+    ServiceRepository,
+    TechnicianAvailabilityRepository,
+    TechnicianRepository,
+    TechnicianServiceRepository,
+)
+from app.services import (
+    AdminService,
+    AuthService,
+    BookingService,
+    ClientService,
+    NotificationService,
+    PaymentService,
+    ReportService,
+    ReviewService,
+    SearchService,
+    ServiceService,
+    TechnicianAvailablityService,
+    TechnicianService,
+    TechnicianServiceService,
+)
+from app.services.ranking import Ranker
+from app.services.search_engine import SearchEngine
+from app.services.search_results import SearchResultCache
+from app.services.user_cache import UserCache
+
+
+class Container:
+    """
+    Every repository and service of the app, built once in the lifespan and shared by all
+    requests. They hold no per-request state, only the database and the app-scoped caches
+    and indexes, so the dependencies hand these out instead of building new ones per request.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        service_catalogue: ServiceCatalogue,
+        access_revocations: Optional[AccessRevocations] = None,
+        user_cache: Optional[UserCache] = None,
+        nearby_cache: Optional[NearbyCache] = None,
+        search_engine: Optional[SearchEngine] = None,
+        ranker: Optional[Ranker] = None,
+        search_results: Optional[SearchResultCache] = None,
+    ) -> None:
+        self.admin_repository = AdminRepository(db)
+        self.client_repository = ClientRepository(db)
+        self.technician_repository = TechnicianRepository(db)
+        self.booking_repository = BookingRepository(db)
+        self.review_repository = ReviewRepository(db)
+        self.service_repository = ServiceRepository(db, service_catalogue)
+        self.search_repository = SearchRepository(db, nearby_cache)
+        self.notification_repository = NotificationRepository(db)
+        self.technician_availability_repository = TechnicianAvailabilityRepository(db)
+        self.technician_service_repository = TechnicianServiceRepository(db)
+        self.payment_repository = PaymentRepository(db)
+        self.report_repository = ReportRepository(db)
+
+        self.admin_service = AdminService(self.admin_repository, user_cache)
+        self.client_service = ClientService(self.client_repository, user_cache)
+        self.technician_service = TechnicianService(self.technician_repository, user_cache)
+        self.booking_service = BookingService(self.booking_repository)
+        self.review_service = ReviewService(self.review_repository)
+        self.service_service = ServiceService(self.service_repository)
+        self.search_service = SearchService(
+            self.search_repository, search_engine, ranker, search_results
+        )
+        self.auth_service = AuthService(
+            (self.admin_service, self.client_service, self.technician_service),
+            access_revocations,
+        )
+        self.notification_service = NotificationService(self.notification_repository)
+        self.technician_availability_service = TechnicianAvailablityService(
+            self.technician_availability_repository
+        )
+        self.technician_service_service = TechnicianServiceService(
+            self.technician_service_repository
+        )
+        self.payment_service = PaymentService(self.payment_repository)
+        self.report_service = ReportService(self.report_repository)
+
+    @classmethod
+    def from_state(cls, state: Any) -> "Container":
+        """The container of the objects the lifespan put on `app.state`"""
+        return cls(
+            state.db,
+            state.service_catalogue,
+            access_revocations=state.access_revocations,
+            user_cache=state.user_cache,
+            nearby_cache=state.nearby_cache,
+            search_engine=state.search_engine,
+            ranker=state.ranker,
+            search_results=state.search_results,
+        )
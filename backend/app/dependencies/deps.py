@@ -1,5 +1,5 @@
 from fastapi import Depends, Request
-from typing import Annotated
+from typing import Annotated, Optional
 from app.database import AsyncDatabase
 from app.repository import (
     AdminRepository,
@@ -13,8 +13,17 @@ from app.repository import (
     TechnicianAvailabilityRepository,
     TechnicianServiceRepository,
     PaymentRepository,
-    ReportRepository
+    ReportRepository,
+    ServiceCatalogue,
+    NearbyCache,
+    AccessRevocations,
 )
+from app.models import Identity
+from app.models.enums import UserRole
+from app.utils.exceptions import ForbiddenException
+from app.utils.security import SecurityUtils
+
+from .container import Container
 from app.services import (
     AdminService,
     ClientService,
@@ -36,155 +45,136 @@ async def get_db(request: Request) -> AsyncDatabase:
     return request.app.state.db
 
 
-async def get_admin_repository(db: AsyncDatabase = Depends(get_db)) -> AdminRepository:
-    return AdminRepository(db)
+async def get_container(request: Request) -> Container:
+    """The app's shared repositories and services, built in the lifespan"""
+    return request.app.state.container
+
+
+async def get_admin_repository(request: Request) -> AdminRepository:
+    return request.app.state.container.admin_repository
+
+
+async def get_admin_service(request: Request) -> AdminService:
+    return request.app.state.container.admin_service
+
+
+async def get_client_repository(request: Request) -> ClientRepository:
+    return request.app.state.container.client_repository
+
+
+async def get_client_service(request: Request) -> ClientService:
+    return request.app.state.container.client_service
+
+
+async def get_technician_repository(request: Request) -> TechnicianRepository:
+    return request.app.state.container.technician_repository
+
+
+async def get_technician_service(request: Request) -> TechnicianService:
+    return request.app.state.container.technician_service
+
 
+async def get_booking_repository(request: Request) -> BookingRepository:
+    return request.app.state.container.booking_repository
 
-async def get_admin_service(
-    repo: AdminRepository = Depends(get_admin_repository),
-) -> AdminService:
-    return AdminService(repo)
 
+async def get_booking_service(request: Request) -> BookingService:
+    return request.app.state.container.booking_service
 
-async def get_client_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> ClientRepository:
-    return ClientRepository(db)
 
+async def get_review_repository(request: Request) -> ReviewRepository:
+    return request.app.state.container.review_repository
 
-async def get_client_service(
-    repo: ClientRepository = Depends(get_client_repository),
-) -> ClientService:
-    return ClientService(repo)
 
+async def get_review_service(request: Request) -> ReviewService:
+    return request.app.state.container.review_service
 
-async def get_technician_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> TechnicianRepository:
-    return TechnicianRepository(db)
 
+async def get_service_catalogue(request: Request) -> ServiceCatalogue:
+    return request.app.state.service_catalogue
 
-async def get_technician_service(
-    repo: TechnicianRepository = Depends(get_technician_repository),
-) -> TechnicianService:
-    return TechnicianService(repo)
 
+async def get_service_repository(request: Request) -> ServiceRepository:
+    return request.app.state.container.service_repository
 
-async def get_booking_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> BookingRepository:
-    return BookingRepository(db)
 
+async def get_service_service(request: Request) -> ServiceService:
+    return request.app.state.container.service_service
 
-async def get_booking_service(
-    repo: BookingRepository = Depends(get_booking_repository),
-) -> BookingService:
-    return BookingService(repo)
 
+async def get_nearby_cache(request: Request) -> Optional[NearbyCache]:
+    return request.app.state.nearby_cache
 
-async def get_review_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> ReviewRepository:
-    return ReviewRepository(db)
 
+async def get_search_repository(request: Request) -> SearchRepository:
+    return request.app.state.container.search_repository
 
-async def get_review_service(
-    repo: ReviewRepository = Depends(get_review_repository),
-) -> ReviewService:
-    return ReviewService(repo)
 
+async def get_search_service(request: Request) -> SearchService:
+    return request.app.state.container.search_service
 
-async def get_service_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> ServiceRepository:
-    return ServiceRepository(db)
 
+async def get_access_revocations(request: Request) -> Optional[AccessRevocations]:
+    return request.app.state.access_revocations
 
-async def get_service_service(
-    repo: ServiceRepository = Depends(get_service_repository),
-) -> ServiceService:
-    return ServiceService(repo)
 
+async def get_auth_service(request: Request) -> AuthService:
+    return request.app.state.container.auth_service
 
-async def get_search_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> SearchRepository:
-    return SearchRepository(db)
 
+async def get_current_identity(
+    token: str = Depends(SecurityUtils.OUTH_2_SCHEME),
+    service: AuthService = Depends(get_auth_service),
+) -> Identity:
+    """The user of the bearer token, see AuthService.identify"""
+    return await service.identify(token)
 
-async def get_search_service(
-    repo: SearchRepository = Depends(get_search_repository),
-) -> SearchService:
-    return SearchService(repo)
 
+async def get_current_admin(identity: Identity = Depends(get_current_identity)) -> Identity:
+    """The user of the bearer token, who must be an admin"""
+    if identity.user_role != UserRole.ADMIN:
+        raise ForbiddenException("Only admins can do this")
+    return identity
 
-async def get_auth_service(
-    admin_service: AdminService = Depends(get_admin_service),
-    client_service: ClientService = Depends(get_client_service),
-    technician_service: TechnicianService = Depends(get_technician_service),
-) -> AuthService:
-    return AuthService((admin_service, client_service, technician_service))
 
+async def get_notification_repository(request: Request) -> NotificationRepository:
+    return request.app.state.container.notification_repository
 
-async def get_notification_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> NotificationRepository:
-    return NotificationRepository(db)
 
+async def get_notification_service(request: Request) -> NotificationService:
+    return request.app.state.container.notification_service
 
-async def get_notification_service(
-    repo: NotificationRepository = Depends(get_notification_repository),
-) -> NotificationService:
-    return NotificationService(repo)
 
+async def get_technician_availability_repository(request: Request) -> TechnicianAvailabilityRepository:
+    return request.app.state.container.technician_availability_repository
 
-async def get_technician_availability_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> TechnicianAvailabilityRepository:
-    return TechnicianAvailabilityRepository(db)
 
+async def get_technician_availability_service(request: Request) -> TechnicianAvailablityService:
+    return request.app.state.container.technician_availability_service
 
-async def get_technician_availability_service(
-    repo: TechnicianAvailabilityRepository = Depends(
-        get_technician_availability_repository
-    ),
-) -> TechnicianAvailablityService:
-    return TechnicianAvailablityService(repo)
 
+async def get_technician_service_repository(request: Request) -> TechnicianServiceRepository:
+    return request.app.state.container.technician_service_repository
 
-async def get_technician_service_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> TechnicianServiceRepository:
-    return TechnicianServiceRepository(db)
 
+async def get_technician_service_service(request: Request) -> TechnicianServiceService:
+    return request.app.state.container.technician_service_service
 
-async def get_technician_service_service(
-    repo: TechnicianServiceRepository = Depends(get_technician_service_repository),
-) -> TechnicianServiceService:
-    return TechnicianServiceService(repo)
 
+async def get_payment_repository(request: Request) -> PaymentRepository:
+    return request.app.state.container.payment_repository
 
-async def get_payment_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> PaymentRepository:
-    return PaymentRepository(db)
 
+async def get_payment_service(request: Request) -> PaymentService:
+    return request.app.state.container.payment_service
 
-async def get_payment_service(
-    repo: PaymentRepository = Depends(get_payment_repository),
-) -> PaymentService:
-    return PaymentService(repo)
 
+async def get_report_repository(request: Request) -> ReportRepository:
+    return request.app.state.container.report_repository
 
-async def get_report_repository(
-    db: AsyncDatabase = Depends(get_db),
-) -> ReportRepository:
-    return ReportRepository(db)
 
-async def get_report_service(
-    repo: ReportRepository = Depends(get_report_repository)
-) -> ReportService:
-    return ReportService(repo)
+async def get_report_service(request: Request) -> ReportService:
+    return request.app.state.container.report_service
 
 
 db_dependency = Annotated[AsyncDatabase, Depends(get_db)]
@@ -225,6 +215,8 @@ search_repository_dependency = Annotated[
 search_service_dependency = Annotated[SearchService, Depends(get_search_service)]
 
 auth_service_dependency = Annotated[AuthService, Depends(get_auth_service)]
+identity_dependency = Annotated[Identity, Depends(get_current_identity)]
+admin_identity_dependency = Annotated[Identity, Depends(get_current_admin)]
 
 
 notification_repository_dependency = Annotated[
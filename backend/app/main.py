@@ -1,11 +1,20 @@
 import os
-from fastapi import FastAPI
+from typing import Any, Dict
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from contextlib import asynccontextmanager
 from app.database import AsyncDatabase
 from app.core import settings
 from app.api.v1 import v1_router
+from app.dependencies import Container, get_current_admin
+from app.repository import AccessRevocations, ServiceCatalogue, NearbyCache
+from app.services.search_engine import NumpySearchEngine
+from app.services.ranking import FeatureStore, Ranker, RankingWeights
+from app.services.search_results import SearchResultCache
+from app.services.user_cache import UserCache
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.security import SecurityUtils
 
 
 @asynccontextmanager
@@ -18,14 +27,117 @@ async def lifespan(app: FastAPI):
         username=settings.DATABASE_USER,
         password=settings.DATABASE_PASSWORD,
         port=settings.DATABASE_PORT,
+        min_size=settings.DATABASE_POOL_MIN_SIZE,
+        max_size=settings.DATABASE_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=settings.DATABASE_POOL_MAX_INACTIVE_LIFETIME,
+        statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+        command_timeout=settings.DATABASE_COMMAND_TIMEOUT,
+        statement_timeout_ms=settings.DATABASE_STATEMENT_TIMEOUT_MS,
+        application_name=settings.DATABASE_APPLICATION_NAME,
+        replica_dsns=settings.DATABASE_REPLICA_DSNS,
     )
 
     await app.state.db.connect()
     await app.state.db.initialize()
 
+    app.state.service_catalogue = ServiceCatalogue(app.state.db)
+    try:
+        await app.state.service_catalogue.start()
+    except Exception as e:
+        logger.error(f"Service catalogue unavailable, reading services from the database: {e}")
+
+    app.state.access_revocations = AccessRevocations(app.state.db, settings.TOKEN_EXPIRE_MINUTES)
+    try:
+        await app.state.access_revocations.start()
+    except Exception as e:
+        logger.error(f"Access revocations unavailable, every token reads its user: {e}")
+
+    app.state.user_cache = None
+    if settings.USER_CACHE_ENABLED:
+        user_cache = UserCache(
+            app.state.db,
+            maxsize=settings.USER_CACHE_MAX_ENTRIES,
+            ttl=settings.USER_CACHE_TTL_SECONDS,
+        )
+        try:
+            await user_cache.start()
+            app.state.user_cache = user_cache
+        except Exception as e:
+            logger.error(f"User cache disabled, cannot listen for user changes: {e}")
+
+    app.state.nearby_cache = None
+    if settings.NEARBY_CACHE_ENABLED:
+        nearby_cache = NearbyCache(
+            app.state.db,
+            precision=settings.NEARBY_CACHE_GEOHASH_PRECISION,
+            maxsize=settings.NEARBY_CACHE_MAX_ENTRIES,
+            ttl=settings.NEARBY_CACHE_TTL_SECONDS,
+        )
+        try:
+            await nearby_cache.start()
+            app.state.nearby_cache = nearby_cache
+        except Exception as e:
+            logger.error(f"Nearby search cache disabled, cannot listen for technician changes: {e}")
+
+    # None searches with PostGIS
+    app.state.search_engine = None
+    if settings.SEARCH_ENGINE == "numpy":
+        try:
+            search_engine = NumpySearchEngine(app.state.db)
+            await search_engine.start()
+            app.state.search_engine = search_engine
+        except Exception as e:
+            logger.error(f"NumPy search engine unavailable, searching with PostGIS: {e}")
+
+    app.state.search_results = None
+    if settings.SEARCH_RESULT_CACHE_ENABLED:
+        search_results = SearchResultCache(
+            app.state.db,
+            maxsize=settings.SEARCH_RESULT_CACHE_MAX_ENTRIES,
+            ttl=settings.SEARCH_RESULT_CACHE_TTL_SECONDS,
+        )
+        try:
+            await search_results.start()
+            app.state.search_results = search_results
+        except Exception as e:
+            logger.error(f"Search result cache disabled, cannot listen for technician changes: {e}")
+
+    # None serves ranked searches nearest first
+    app.state.ranker = None
+    if settings.RANKING_ENABLED:
+        try:
+            feature_store = FeatureStore(app.state.db)
+            await feature_store.start()
+            app.state.ranker = Ranker(
+                feature_store,
+                RankingWeights(
+                    distance=settings.RANKING_WEIGHT_DISTANCE,
+                    rating=settings.RANKING_WEIGHT_RATING,
+                    reviews=settings.RANKING_WEIGHT_REVIEWS,
+                    verified=settings.RANKING_WEIGHT_VERIFIED,
+                    price=settings.RANKING_WEIGHT_PRICE,
+                    experience=settings.RANKING_WEIGHT_EXPERIENCE,
+                    recency=settings.RANKING_WEIGHT_RECENCY,
+                    relevance=settings.RANKING_WEIGHT_RELEVANCE,
+                ),
+                max_candidates=settings.RANKING_MAX_CANDIDATES,
+                recency_half_life_days=settings.RANKING_RECENCY_HALF_LIFE_DAYS,
+            )
+        except Exception as e:
+            logger.error(f"Search ranking unavailable, ranked searches are nearest first: {e}")
+
+    app.state.container = Container.from_state(app.state)
+
     yield
 
+    if app.state.ranker is not None:
+        await app.state.ranker.store.stop()
+    if app.state.search_engine is not None:
+        await app.state.search_engine.stop()
+    await app.state.service_catalogue.stop()
+    await app.state.access_revocations.stop()
     await app.state.db.disconnect()
+    SecurityUtils.stop_hasher()
 
 
 app: FastAPI = FastAPI(
@@ -43,6 +155,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(v1_router, prefix="/api/v1")
@@ -58,3 +171,26 @@ async def index() -> dict[str, str | None]:
         "redoc": app.redoc_url,
         "mode": "development" if settings.DEBUG else "production",
     }
+
+
+@app.get("/metrics", dependencies=[Depends(get_current_admin)])
+async def metrics() -> Dict[str, Any]:
+    return {
+        "database": app.state.db.metrics(),
+        "service_catalogue": app.state.service_catalogue.stats(),
+        "access_revocations": app.state.access_revocations.stats(),
+        "user_cache": app.state.user_cache.stats() if app.state.user_cache is not None else None,
+        "search_engine": (
+            app.state.search_engine.stats()
+            if app.state.search_engine is not None
+            else {"name": "postgis"}
+        ),
+        "ranking": app.state.ranker.stats() if app.state.ranker is not None else None,
+        "nearby_cache": (
+            app.state.nearby_cache.stats() if app.state.nearby_cache is not None else None
+        ),
+        "search_results": (
+            app.state.search_results.stats() if app.state.search_results is not None else None
+        ),
+        "password_hashing": SecurityUtils.hasher().stats(),
+    }
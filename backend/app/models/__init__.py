@@ -8,7 +8,13 @@ from .technician import (
 )
 from .booking import BookingInDB, BookingCreate, BookingUpdate, BookingResponse
 from .review import ReviewInDB, ReviewCreate, ReviewResponse, ReviewUpdate
-from .service import ServiceInDB, ServiceCreate, ServiceResponse, ServiceUpdate
+from .service import (
+    ServiceInDB,
+    ServiceCreate,
+    ServiceResponse,
+    ServiceUpdate,
+    ServiceSuggestion,
+)
 from .favorite_technician import (
     FavoriteTechnicianInDB,
     FavoriteTechnicianCreate,
@@ -25,7 +31,7 @@ from .technician_service import (
     TechnicianServiceResponse,
     TechnicianServiceUpdate,
 )
-from .auth_models import Token, TokenData, LoginRequest
+from .auth_models import Token, TokenData, Identity, UserCredentials, LoginRequest
 from .notification import NotificationInDB, NotificationCreate, NotificationResponse
 from .technician_availability import (
     TechnicianAvailabilityCreate,
@@ -61,6 +67,7 @@ __all__ = [
     "ServiceCreate",
     "ServiceResponse",
     "ServiceUpdate",
+    "ServiceSuggestion",
     "FavoriteTechnicianInDB",
     "FavoriteTechnicianCreate",
     "FavoriteTechnicianResponse",
@@ -72,6 +79,8 @@ __all__ = [
     "TechnicianServiceResponse",
     "Token",
     "TokenData",
+    "Identity",
+    "UserCredentials",
     "LoginRequest",
     "NotificationInDB",
     "NotificationCreate",
@@ -30,6 +30,30 @@ class TokenData(BaseModel):
     email: Optional[EmailStr] = None
     user_id: Optional[UUID] = None
     user_role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+    token_version: Optional[int] = None
+
+
+class UserCredentials(BaseModel):
+    """
+    What a login checks of a user, without the rest of their profile.
+    """
+
+    id: UUID
+    email: EmailStr
+    hashed_password: str
+    is_active: bool
+    token_version: int
+
+
+class Identity(BaseModel):
+    """
+    The authenticated user, from the verified claims of their access token.
+    """
+
+    user_id: UUID
+    email: EmailStr
+    user_role: UserRole
 
 
 class LoginRequest(BaseModel):
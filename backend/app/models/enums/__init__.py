@@ -1,3 +1,3 @@
-from .enums import AdminRole, BookingStatus, UserRole, PaymentStatus
+from .enums import AdminRole, BookingStatus, UserRole, PaymentStatus, ExportFormat
 
-__all__ = ["AdminRole", "BookingStatus", "UserRole", "PaymentStatus"]
+__all__ = ["AdminRole", "BookingStatus", "UserRole", "PaymentStatus", "ExportFormat"]
@@ -33,3 +33,10 @@ class PaymentStatus(StrEnum):
     EZCROW = "EZCROW"
     COMPLETED = "COMPLETED"
     RETURNED = "RETURNED"
+
+
+class ExportFormat(StrEnum):
+    """Represents the file format of a streamed export"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -45,3 +45,18 @@ class ServiceResponse(ServiceInDB):
                 "created_at": "2025-06-01T00:00:00",
             }
         }
+
+
+class ServiceSuggestion(BaseModel):
+    id: UUID
+    name: str
+    score: float
+
+    class Config:
+        json_schema_extra: Dict[str, Any] = {
+            "example": {
+                "id": "123e4567-e89b-12d3-a456-426655440000",
+                "name": "plumbing",
+                "score": 1.0,
+            }
+        }
@@ -4,7 +4,10 @@ from .technician import TechnicianRepository
 from .booking import BookingRepository
 from .review import ReviewRepository
 from .service import ServiceRepository
+from .service_catalogue import ServiceCatalogue
 from .search import SearchRepository
+from .nearby_cache import NearbyCache
+from .access_revocations import AccessRevocations
 from .notification import NotificationRepository
 from .technician_availability import TechnicianAvailabilityRepository
 from .technician_service import TechnicianServiceRepository
@@ -18,7 +21,10 @@ __all__ = [
     "BookingRepository",
     "ReviewRepository",
     "ServiceRepository",
+    "ServiceCatalogue",
     "SearchRepository",
+    "NearbyCache",
+    "AccessRevocations",
     "NotificationRepository",
     "TechnicianAvailabilityRepository",
     "TechnicianServiceRepository",
@@ -0,0 +1,144 @@
+import json
+import asyncio
+from uuid import UUID
+from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple
+from asyncpg import Record  # type: ignore
+from app.database import AsyncDatabase
+
+# NOTIFYed by the trg_*_revoke_tokens triggers when a user is (de)activated or deleted, the
+# payload is {"id", "version", "active"}; anything else means "reload"
+CHANNEL: str = "user_access_changed"
+
+
+class AccessRevocations:
+    """
+    The users whose access tokens are no longer all valid: inactive users, and users whose
+    token_version moved past 0, i.e. every token issued before their last (de)activation is
+    revoked, and users deleted less than `token_ttl_minutes` ago, from their revoked_user
+    tombstone. Every other user is active at version 0, so the set stays small.
+
+    Loaded at startup and updated from NOTIFYs. Until the first load succeeds, and while a
+    reload after missed notifications is pending, `ready` is False and callers check the
+    user in the database instead.
+    """
+
+    def __init__(self, db: AsyncDatabase, token_ttl_minutes: int) -> None:
+        self.db = db
+        self.token_ttl_minutes = token_ttl_minutes
+        self._users: Dict[UUID, Tuple[int, bool]] = {}
+        self._ready: bool = False
+        self._generation: int = 0
+        self._received: Optional[Dict[UUID, Tuple[int, bool]]] = None
+        self._refresh: Optional[asyncio.Task[None]] = None
+        self.revoked: int = 0
+        self.reloads: int = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def start(self) -> None:
+        """Subscribe to access changes, then load the set"""
+        await self.db.listen(CHANNEL, self.on_change)
+        await self.reload()
+
+    async def reload(self) -> None:
+        """
+        Load the set. Changes NOTIFYed while the query runs may or may not be in its snapshot,
+        so they are merged into it, the highest version of a user winning.
+        """
+        # Every token of a user deleted before this has expired
+        await self.db.execute(
+            "DELETE FROM revoked_user WHERE revoked_at < NOW() - $1 * INTERVAL '1 minute'",
+            self.token_ttl_minutes,
+        )
+        while True:
+            generation: int = self._generation
+            received: Dict[UUID, Tuple[int, bool]] = {}
+            self._received = received
+            records: List[Record] = await self.db.fetchall(
+                """
+                SELECT id, token_version, is_active FROM admin
+                WHERE NOT is_active OR token_version > 0
+                UNION ALL
+                SELECT id, token_version, is_active FROM client
+                WHERE NOT is_active OR token_version > 0
+                UNION ALL
+                SELECT id, token_version, is_active FROM technician
+                WHERE NOT is_active OR token_version > 0
+                UNION ALL
+                SELECT id, token_version, FALSE FROM revoked_user
+                WHERE revoked_at >= NOW() - $1 * INTERVAL '1 minute'
+                """,
+                self.token_ttl_minutes,
+            )
+            if generation != self._generation:
+                continue
+            users: Dict[UUID, Tuple[int, bool]] = {
+                r["id"]: (r["token_version"], r["is_active"]) for r in records
+            }
+            for user_id, change in received.items():
+                self._apply(users, user_id, change)
+            self._users = users
+            self._received = None
+            self._ready = True
+            self.reloads += 1
+            logger.info(f"Access revocations loaded {len(self._users)} users")
+            return
+
+    def on_change(self, payload: Optional[str]) -> None:
+        try:
+            change: Dict[str, Any] = json.loads(payload) if payload else {}
+            user_id: UUID = UUID(change["id"])
+            version: int = int(change["version"])
+            active: bool = bool(change["active"])
+        except (ValueError, KeyError, TypeError):
+            self.invalidate()
+            return
+        self._apply(self._users, user_id, (version, active))
+        if self._received is not None:
+            self._apply(self._received, user_id, (version, active))
+
+    @staticmethod
+    def _apply(
+        users: Dict[UUID, Tuple[int, bool]], user_id: UUID, change: Tuple[int, bool]
+    ) -> None:
+        """Record a user's (version, active) unless a later version is already known"""
+        current: Optional[Tuple[int, bool]] = users.get(user_id)
+        if current is None or current[0] <= change[0]:
+            users[user_id] = change
+
+    def invalidate(self) -> None:
+        """Check users in the database until the set is reloaded"""
+        self._generation += 1
+        self._ready = False
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._reload_in_background())
+
+    async def _reload_in_background(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error(f"Failed to reload access revocations: {e}")
+
+    async def stop(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+
+    def is_revoked(self, user_id: UUID, token_version: int) -> bool:
+        """Whether a token of the user issued at `token_version` is no longer valid"""
+        version, active = self._users.get(user_id, (0, True))
+        if active and token_version >= version:
+            return False
+        self.revoked += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self._ready,
+            "users": len(self._users),
+            "revoked": self.revoked,
+            "reloads": self.reloads,
+        }
@@ -2,9 +2,11 @@ from uuid import UUID
 from typing import Optional, List, Tuple, Dict, Any
 from asyncpg import Record  # type: ignore
 from app.database import AsyncDatabase
-from app.models import AdminInDB
+from app.models import AdminInDB, UserCredentials
 from app.models.enums import AdminRole
 
+from .credentials import email_or_phone_taken, read_access, read_credentials
+
 
 class AdminRepository:
     def __init__(self, db: AsyncDatabase) -> None:
@@ -25,20 +27,21 @@ class AdminRepository:
 
     async def exists(self, email: str, phone: str) -> Tuple[bool, str]:
         """Check if an admin with the given email or phone exists in the database."""
-        query: str = "SELECT * FROM admin WHERE email = $1"
-        admin: Optional[Record] = await self.db.fetchone(query, email)
-
-        if admin is not None:
+        email_taken, phone_taken = await email_or_phone_taken(self.db, "admin", email, phone)
+        if email_taken:
             return True, "Admin with email already exists"
-
-        query = "SELECT * FROM admin WHERE phone = $1"
-        admin = await self.db.fetchone(query, phone)
-
-        if admin is not None:
+        if phone_taken:
             return True, "Admin with phone already exists"
-
         return False, "Admin does not exist"
 
+    async def read_credentials(self, email: str) -> Optional[UserCredentials]:
+        """Id, password hash, active flag and token version of the admin with this email"""
+        return await read_credentials(self.db, "admin", email)
+
+    async def read_access(self, admin_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the admin, None once deleted"""
+        return await read_access(self.db, "admin", admin_id)
+
     async def create(self, data: Dict[str, Any]) -> Optional[AdminInDB]:
         """Create a new admin in the database."""
         query: str = """
@@ -1,9 +1,9 @@
 from uuid import UUID
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator
 from asyncpg import Record # type: ignore
 # from loguru import logger  
 from app.database import AsyncDatabase
-from datetime import date
+from datetime import date, datetime
 from app.models import BookingInDB
 from app.models.enums import BookingStatus
 from app.models.base import Location, TimeSlot
@@ -24,6 +24,16 @@ status,
 created_at
 """
 
+# A booking `b` of the technician on the day overlapping the start..end window that still holds
+# the slot. The slot search and `collides` share it, so a technician listed as free can be booked.
+LIVE_OVERLAP = """
+b.technician_id = {technician}
+AND b.booking_date = {day}
+AND b.start_time < {end}
+AND b.end_time > {start}
+AND b.status NOT IN ('REJECTED', 'CANCELLED')
+"""
+
 
 class BookingRepository:
     def __init__(self, db: AsyncDatabase) -> None:
@@ -53,17 +63,14 @@ class BookingRepository:
 
     async def collides(self, technician_id: UUID, timeslot: TimeSlot) -> bool:
         """
-        Returns true if the technician has a booking within the timeslot
+        Returns true if the technician has a booking overlapping the timeslot that is not
+        rejected or cancelled
         """
-        query: str = """
-        SELECT * FROM booking
-        WHERE technician_id = $1
-        AND booking_date = $2
-        AND start_time < $3
-        AND end_time > $4
-        """
-        values: Tuple[Any, ...] = (technician_id, *timeslot.model_dump().values())
-        records: List[Record] = await self.db.fetchall(query, *values)
+        booked: str = LIVE_OVERLAP.format(technician="$1", day="$2", start="$3", end="$4")
+        query: str = f"SELECT 1 FROM booking b WHERE {booked} LIMIT 1"
+        records: List[Record] = await self.db.fetchall(
+            query, technician_id, timeslot.slot_date, timeslot.start_time, timeslot.end_time
+        )
         return len(records) > 0
 
     async def create(self, data: Dict[str, Any]) -> Optional[BookingInDB]:
@@ -95,16 +102,14 @@ class BookingRepository:
             else None
         )
 
-    async def readall(
+    def filters(
         self,
         client_id: Optional[UUID] = None,
         technician_id: Optional[UUID] = None,
         status: Optional[BookingStatus] = None,
         booking_date: Optional[date] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[BookingInDB]:
-        """Read all bookings from the database"""
+    ) -> Tuple[List[str], List[Any]]:
+        """Build the WHERE conditions and their parameters for the booking filters"""
         filters: List[str] = []
         params: List[Any] = []
         if client_id is not None:
@@ -119,10 +124,31 @@ class BookingRepository:
         if booking_date is not None:
             filters.append(f"booking_date = ${len(filters) + 1}")
             params.append(booking_date)
+        return filters, params
 
+    async def readall(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        status: Optional[BookingStatus] = None,
+        booking_date: Optional[date] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[BookingInDB]:
+        """
+        Read all bookings from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
+        filters, params = self.filters(client_id, technician_id, status, booking_date)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
         query: str = f"""
         SELECT {RETURN_QUERY} FROM booking
         {f"WHERE {" AND ".join(filters)}" if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
@@ -132,6 +158,23 @@ class BookingRepository:
             self.record_to_booking(booking_record) for booking_record in booking_records
         ]
 
+    async def stream(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        status: Optional[BookingStatus] = None,
+        booking_date: Optional[date] = None,
+    ) -> AsyncIterator[BookingInDB]:
+        """Stream every matching booking through a server-side cursor"""
+        filters, params = self.filters(client_id, technician_id, status, booking_date)
+        query: str = f"""
+        SELECT {RETURN_QUERY} FROM booking
+        {f"WHERE {" AND ".join(filters)}" if filters else ""}
+        ORDER BY created_at, id
+        """
+        async for booking_record in self.db.fetch_iter(query, *params):
+            yield self.record_to_booking(booking_record)
+
     async def update(
         self, booking_id: UUID, data: Dict[str, Any]
     ) -> Optional[BookingInDB]:
@@ -1,11 +1,18 @@
 from uuid import UUID
 from typing import Optional, List, Tuple, Dict, Any
+from datetime import datetime
 from asyncpg import Record  # type: ignore
 from app.database import AsyncDatabase
-from app.models import ClientInDB, TechnicianInDB
+from app.models import ClientInDB, TechnicianInDB, UserCredentials
 from app.models.base import Location, PhoneNumber
 
-from .technician import RETURN_QUERY as TECHNICIAN_RETURN_QUERY, record_to_technician
+from .technician import (
+    RETURN_QUERY as TECHNICIAN_RETURN_QUERY,
+    CARD_JOIN,
+    IMPORT_COLUMNS,
+    record_to_technician,
+)
+from .credentials import email_or_phone_taken, read_access, read_credentials
 
 RETURN_QUERY: str = """
     id,
@@ -44,20 +51,21 @@ class ClientRepository:
 
     async def exists(self, email: str, phone: str) -> Tuple[bool, str]:
         """Check if a client with the given email or phone exists in the database."""
-        query: str = "SELECT * FROM client WHERE email = $1"
-        client: Optional[Record] = await self.db.fetchone(query, email)
-
-        if client is not None:
+        email_taken, phone_taken = await email_or_phone_taken(self.db, "client", email, phone)
+        if email_taken:
             return True, "Client with email already exists"
-
-        query = "SELECT * FROM client WHERE phone = $1"
-        admin = await self.db.fetchone(query, phone)
-
-        if admin is not None:
+        if phone_taken:
             return True, "Client with phone already exists"
-
         return False, "Client does not exist"
 
+    async def read_credentials(self, email: str) -> Optional[UserCredentials]:
+        """Id, password hash, active flag and token version of the client with this email"""
+        return await read_credentials(self.db, "client", email)
+
+    async def read_access(self, client_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the client, None once deleted"""
+        return await read_access(self.db, "client", client_id)
+
     async def create(self, data: Dict[str, Any]) -> Optional[ClientInDB]:
         """Create a new client in the database"""
         location_point: str = (
@@ -81,6 +89,49 @@ class ClientRepository:
             self.record_to_client(client_record) if client_record is not None else None
         )
 
+    async def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create many clients at once by COPYing them into a staging table.
+        Rows whose email or phone already exist are skipped, returns the number created.
+        """
+        records: List[Tuple[Any, ...]] = [
+            (
+                row["fullname"],
+                row["email"],
+                row["phone"],
+                row["hashed_password"],
+                row["location"]["location_name"],
+                row["location"]["longitude"],
+                row["location"]["latitude"],
+            )
+            for row in rows
+        ]
+        async with self.db.transaction():
+            await self.db.execute(
+                """
+                CREATE TEMP TABLE client_import (
+                    fullname VARCHAR(255),
+                    email VARCHAR(255),
+                    phone TEXT,
+                    hashed_password VARCHAR(255),
+                    location_name VARCHAR(100),
+                    longitude DOUBLE PRECISION,
+                    latitude DOUBLE PRECISION
+                ) ON COMMIT DROP
+                """
+            )
+            await self.db.copy_records("client_import", records, columns=IMPORT_COLUMNS)
+            result: str = await self.db.execute(
+                """
+                INSERT INTO client (fullname, email, phone, hashed_password, location_name, location)
+                SELECT fullname, email, phone, hashed_password, location_name,
+                    ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+                FROM client_import
+                ON CONFLICT DO NOTHING
+                """
+            )
+        return int(result.split()[-1])
+
     async def readone(self, client_id: UUID) -> Optional[ClientInDB]:
         """Read one client from the database"""
         query: str = f"""
@@ -98,18 +149,27 @@ class ClientRepository:
         active: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[ClientInDB]:
-        """Read all clients from the database"""
+        """
+        Read all clients from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
         filters: List[str] = []
         params: List[Any] = []
         if active is not None:
             filters.append(f"is_active = ${len(filters) + 1}")
             params.append(active)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
 
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM client
         {f"WHERE {" AND ".join(filters)}" if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1} LIMIT ${len(params) + 2}
         """
         values: Tuple[Any, ...] = (*params, skip, limit)
@@ -179,6 +239,7 @@ class ClientRepository:
         query: str = f"""
         SELECT {TECHNICIAN_RETURN_QUERY} FROM technician t
         JOIN favorite_technician ft ON ft.technician_id = t.id AND client_id = $1
+        {CARD_JOIN}
         """
         records: List[Record] = await self.db.fetchall(query, client_id)
         return [record_to_technician(r) for r in records]
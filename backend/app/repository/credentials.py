@@ -0,0 +1,54 @@
+from uuid import UUID
+from typing import Optional, Tuple
+from asyncpg import Record  # type: ignore
+from app.database import AsyncDatabase
+from app.models import UserCredentials
+
+
+async def read_credentials(db: AsyncDatabase, table: str, email: str) -> Optional[UserCredentials]:
+    """What a login checks of the user with this email, answered from the covering index"""
+    record: Optional[Record] = await db.fetchone(
+        f"""
+        SELECT id, hashed_password, is_active, token_version
+        FROM {table}
+        WHERE email = $1
+        """,
+        email,
+    )
+    if record is None:
+        return None
+    return UserCredentials(
+        id=record["id"],
+        email=email,
+        hashed_password=record["hashed_password"],
+        is_active=record["is_active"],
+        token_version=record["token_version"],
+    )
+
+
+async def read_access(db: AsyncDatabase, table: str, user_id: UUID) -> Optional[Tuple[bool, int]]:
+    """(is_active, token_version) of the user, None once the user is deleted"""
+    record: Optional[Record] = await db.fetchone(
+        f"SELECT is_active, token_version FROM {table} WHERE id = $1", user_id
+    )
+    if record is None:
+        return None
+    return record["is_active"], record["token_version"]
+
+
+async def email_or_phone_taken(
+    db: AsyncDatabase, table: str, email: str, phone: str
+) -> Tuple[bool, bool]:
+    """Whether the email and the phone are taken, in one round trip on the unique indexes"""
+    record: Optional[Record] = await db.fetchone(
+        f"""
+        SELECT
+            EXISTS (SELECT 1 FROM {table} WHERE email = $1) AS email_taken,
+            EXISTS (SELECT 1 FROM {table} WHERE phone = $2) AS phone_taken
+        """,
+        email,
+        phone,
+    )
+    if record is None:
+        return False, False
+    return record["email_taken"], record["phone_taken"]
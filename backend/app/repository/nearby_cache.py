@@ -0,0 +1,100 @@
+from uuid import UUID
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from app.database import AsyncDatabase
+from app.utils.cache import TTLCache
+from app.utils.geo import geohash, geohash_bounds, haversine_meters
+
+from .service_catalogue import CHANNEL as SERVICE_CHANNEL
+from .technician_changes import CHANNEL, TechnicianChange, parse_technician_change
+
+# A search radius is rounded up to the next bucket, larger radii are not cached
+RADIUS_BUCKETS_KM: Tuple[float, ...] = (1, 2, 5, 10, 20, 50)
+
+CellKey = Tuple[str, float, Tuple[str, ...]]
+
+
+class Candidates(NamedTuple):
+    """The technicians that can be in range of any client in a cell: (id, longitude, latitude)"""
+
+    center_lon: float
+    center_lat: float
+    radius_meters: float
+    technicians: List[Tuple[UUID, float, float]]
+
+
+class NearbyCache:
+    """
+    Radius search candidates per (geohash cell, radius bucket, service filter).
+
+    Each entry holds every active technician within the bucket radius of any point of the
+    cell, so one database query answers every client in the cell; exact distances and the
+    order are computed per client. An entry is dropped when a technician in its reach is
+    added, removed, moves or changes is_active/is_available, and expires after `ttl` anyway.
+    """
+
+    def __init__(
+        self, db: AsyncDatabase, precision: int, maxsize: int, ttl: float
+    ) -> None:
+        self.db = db
+        self.precision = precision
+        self.entries: TTLCache[CellKey, Candidates] = TTLCache(maxsize, ttl)
+        self._generation: int = 0
+
+    async def start(self) -> None:
+        await self.db.listen(CHANNEL, self.on_technician_changed)
+        await self.db.listen(SERVICE_CHANNEL, self.on_service_changed)
+
+    def bucket(self, radius_km: float) -> Optional[float]:
+        """The cached radius that covers `radius_km`, None when it is too large to cache"""
+        return next((b for b in RADIUS_BUCKETS_KM if radius_km <= b), None)
+
+    def key(
+        self, lon: float, lat: float, bucket_km: float, service_names: Optional[Sequence[str]]
+    ) -> CellKey:
+        return (
+            geohash(lon, lat, self.precision),
+            bucket_km,
+            tuple(sorted(service_names or ())),
+        )
+
+    def reach(self, key: CellKey) -> Tuple[float, float, float]:
+        """Center of the cell and the radius around it that covers the bucket from every point of the cell"""
+        min_lon, min_lat, max_lon, max_lat = geohash_bounds(key[0])
+        center_lon, center_lat = (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+        half_diagonal: float = max(
+            haversine_meters(center_lon, center_lat, lon, lat)
+            for lon in (min_lon, max_lon)
+            for lat in (min_lat, max_lat)
+        )
+        return center_lon, center_lat, key[1] * 1000 + half_diagonal
+
+    def get(self, key: CellKey) -> Tuple[Optional[Candidates], int]:
+        """The cached candidates, and the generation to hand back to `put` after a miss"""
+        return self.entries.get(key), self._generation
+
+    def put(self, key: CellKey, candidates: Candidates, generation: int) -> None:
+        """Store candidates unless a technician changed while they were being read"""
+        if generation == self._generation:
+            self.entries.put(key, candidates)
+
+    def on_technician_changed(self, payload: Optional[str]) -> None:
+        self._generation += 1
+        change: Optional[TechnicianChange] = parse_technician_change(payload)
+        if change is None or not change.points:
+            self.entries.clear()
+            return
+        self.entries.pop_where(
+            lambda _, candidates: any(
+                haversine_meters(candidates.center_lon, candidates.center_lat, lon, lat)
+                <= candidates.radius_meters
+                for lon, lat in change.points
+            )
+        )
+
+    def on_service_changed(self, payload: Optional[str]) -> None:
+        """A renamed service changes which technicians the service filtered entries hold"""
+        self._generation += 1
+        self.entries.pop_where(lambda key, _: bool(key[2]))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"geohash_precision": self.precision, **self.entries.stats()}
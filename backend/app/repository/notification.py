@@ -1,5 +1,6 @@
 from uuid import UUID
 from typing import Optional, List, Tuple, Dict, Any
+from datetime import datetime
 from asyncpg import Record  # type: ignore
 from app.database import AsyncDatabase
 from app.models import NotificationInDB
@@ -58,19 +59,31 @@ class NotificationRepository:
         )
 
     async def readall(
-        self, read: Optional[bool] = None, skip: int = 0, limit: int = 100
+        self,
+        read: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[NotificationInDB]:
-        """Read all notifications from the database"""
+        """
+        Read all notifications from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
         filters: List[str] = []
         params: List[Any] = []
         if read is not None:
             filters.append(f"is_read = ${len(filters) + 1}")
             params.append(read)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
 
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM notification
         {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
@@ -94,8 +107,12 @@ class NotificationRepository:
         read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[NotificationInDB]:
-        """Read all notifications from the database"""
+        """
+        Read all notifications from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
         filters: List[str] = []
         params: List[Any] = []
         filters.append(f"client_id = ${len(filters) + 1}")
@@ -103,11 +120,16 @@ class NotificationRepository:
         if read is not None:
             filters.append(f"is_read = ${len(filters) + 1}")
             params.append(read)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
 
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM notification
         {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
@@ -124,8 +146,12 @@ class NotificationRepository:
         read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[NotificationInDB]:
-        """Read all notifications from the database"""
+        """
+        Read all notifications from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
         filters: List[str] = []
         params: List[Any] = []
         filters.append(f"technician_id = ${len(filters) + 1}")
@@ -133,11 +159,16 @@ class NotificationRepository:
         if read is not None:
             filters.append(f"is_read = ${len(filters) + 1}")
             params.append(read)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
 
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM notification
         {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
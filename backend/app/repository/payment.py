@@ -1,7 +1,7 @@
 from uuid import UUID
 from asyncpg import Record  # type: ignore
-from typing import Optional, List, Tuple, Dict, Any, Callable
-# from datetime import datetime
+from typing import Optional, List, Tuple, Dict, Any, Callable, AsyncIterator
+from datetime import datetime
 from app.database import AsyncDatabase
 from app.models import PaymentInDB
 from app.models.enums import PaymentStatus
@@ -52,17 +52,15 @@ class PaymentRepository:
         record: Optional[Record] = await self.db.fetchone(query, payment_id)
         return self.record_to_payment(record) if record is not None else None
 
-    async def readall_payments(
+    def filters(
         self,
         client_id: Optional[UUID] = None,
         technician_id: Optional[UUID] = None,
         min_amount: Optional[float] = None,
         max_amount: Optional[float] = None,
         status: Optional[PaymentStatus] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[PaymentInDB]:
-        """"""
+    ) -> Tuple[List[str], List[Any]]:
+        """Build the WHERE conditions and their parameters for the payment filters"""
         filters: List[str] = []
         params: List[Any] = []
         n: Callable[[int], int] = lambda x: len(filters) + x
@@ -82,17 +80,62 @@ class PaymentRepository:
         if status is not None:
             filters.append(f"status = ${n(1)}")
             params.append(status)
+        return filters, params
 
+    async def readall_payments(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        status: Optional[PaymentStatus] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[PaymentInDB]:
+        """
+        Read all payments from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
+        filters, params = self.filters(
+            client_id, technician_id, min_amount, max_amount, status
+        )
+        n: Callable[[int], int] = lambda x: len(params) + x
+
+        if after is not None:
+            filters.append(f"(created_at, id) < (${n(1)}, ${n(2)})")
+            params.extend(after)
+            skip = 0
         query: str = f"""
         SELECT * FROM payment
         {f"WHERE {" AND ".join(filters)}" if filters else ""}
-        ORDER BY amount ASC
+        ORDER BY created_at DESC, id DESC
         OFFSET ${n(1)} LIMIT ${n(2)}
         """
         values: Tuple[Any, ...] = (*params, skip, limit)
         records: List[Record] = await self.db.fetchall(query, *values)
         return [self.record_to_payment(r) for r in records]
 
+    async def stream(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        status: Optional[PaymentStatus] = None,
+    ) -> AsyncIterator[PaymentInDB]:
+        """Stream every matching payment through a server-side cursor"""
+        filters, params = self.filters(
+            client_id, technician_id, min_amount, max_amount, status
+        )
+        query: str = f"""
+        SELECT * FROM payment
+        {f"WHERE {" AND ".join(filters)}" if filters else ""}
+        ORDER BY created_at, id
+        """
+        async for record in self.db.fetch_iter(query, *params):
+            yield self.record_to_payment(record)
+
     async def update(
         self, payment_id: UUID, data: Dict[str, Any]
     ) -> Optional[PaymentInDB]:
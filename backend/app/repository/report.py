@@ -7,6 +7,7 @@ from app.models.enums import BookingStatus
 
 from .technician import (
     RETURN_QUERY as TECHNICIAN_RETURN_QUERY,
+    CARD_JOIN,
     record_to_technician
     )
 
@@ -21,6 +22,7 @@ class ReportRepository:
         query: str = f"""
         SELECT {TECHNICIAN_RETURN_QUERY}
         FROM technician t
+        {CARD_JOIN}
         WHERE t.id IN (
             SELECT technician_id
             FROM booking
@@ -29,7 +31,7 @@ class ReportRepository:
             LIMIT 1
         )
         """
-        technician_record: Optional[Record] = await self.db.fetchone(query)
+        technician_record: Optional[Record] = await self.db.fetchone(query, replica=True)
         return (
             record_to_technician(technician_record)
             if technician_record is not None
@@ -41,6 +43,7 @@ class ReportRepository:
         query: str = f"""
         SELECT {TECHNICIAN_RETURN_QUERY}
         FROM technician t
+        {CARD_JOIN}
         WHERE t.id IN (
             SELECT technician_id
             FROM payment
@@ -49,7 +52,7 @@ class ReportRepository:
             LIMIT 1
         )
         """
-        technician_record: Optional[Record] = await self.db.fetchone(query)
+        technician_record: Optional[Record] = await self.db.fetchone(query, replica=True)
         return (
             record_to_technician(technician_record)
             if technician_record is not None
@@ -61,6 +64,7 @@ class ReportRepository:
         query: str = f"""
         SELECT {TECHNICIAN_RETURN_QUERY}
         FROM technician t
+        {CARD_JOIN}
         WHERE t.id IN (
             SELECT technician_id
             FROM favorite_technician
@@ -69,7 +73,7 @@ class ReportRepository:
             LIMIT 1
         )
         """
-        technician_record: Optional[Record] = await self.db.fetchone(query)
+        technician_record: Optional[Record] = await self.db.fetchone(query, replica=True)
         return (
             record_to_technician(technician_record)
             if technician_record is not None
@@ -89,7 +93,7 @@ class ReportRepository:
             LIMIT 1
         )
         """
-        record: Optional[Record] = await self.db.fetchone(query)
+        record: Optional[Record] = await self.db.fetchone(query, replica=True)
         return record["service_name"] if record is not None else None
     
     async def read_number_of_users(
@@ -103,18 +107,20 @@ class ReportRepository:
             return 0
         total: int = 0
         if include_admin:
-            total += await self.db.count("SELECT COUNT(*) AS count FROM admin")
+            total += await self.db.count("SELECT COUNT(*) AS count FROM admin", replica=True)
         if include_technician:
-            total += await self.db.count("SELECT COUNT(*) AS count FROM technician")
+            total += await self.db.count("SELECT COUNT(*) AS count FROM technician", replica=True)
         if include_client:
-            total += await self.db.count("SELECT COUNT(*) AS count FROM client")
+            total += await self.db.count("SELECT COUNT(*) AS count FROM client", replica=True)
         return total
     
     async def read_number_of_bookings(self, status: Optional[BookingStatus] = None) -> int:
         """"""
         if status is None:
-            return await self.db.count("SELECT COUNT(*) AS count FROM booking")
-        return await self.db.count("SELECT COUNT(*) AS count FROM booking WHERE status = $1", status)
+            return await self.db.count("SELECT COUNT(*) AS count FROM booking", replica=True)
+        return await self.db.count(
+            "SELECT COUNT(*) AS count FROM booking WHERE status = $1", status, replica=True
+        )
     
     async def read_technician_report(self, technician_id: UUID) -> Optional[TechnicianReport]:
         """"""
@@ -146,10 +152,10 @@ class ReportRepository:
         ),
         review_stats AS (
             SELECT 
-                COALESCE(AVG(rating)::FLOAT, 0) as rating,
-                COUNT(*) as num_reviews
-            FROM review 
-            WHERE technician_id = $1
+                COALESCE(MAX(rating_sum::FLOAT / NULLIF(rating_count, 0)), 0) as rating,
+                COALESCE(MAX(rating_count), 0) as num_reviews
+            FROM technician 
+            WHERE id = $1
         ),
         client_stats AS (
             SELECT 
@@ -208,5 +214,5 @@ class ReportRepository:
         CROSS JOIN client_stats cs
         CROSS JOIN service_stats ss
         """
-        record: Optional[Record] = await self.db.fetchone(query, technician_id)
+        record: Optional[Record] = await self.db.fetchone(query, technician_id, replica=True)
         return TechnicianReport(**record) if record is not None else None
@@ -1,17 +1,20 @@
 from uuid import UUID
 from asyncpg import Record  # type: ignore
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, AsyncIterator
+from datetime import datetime
 from app.database import AsyncDatabase
 from app.models import ReviewInDB
 
 RETURN_QUERY: str = """
 id,
 booking_id,
+client_id,
 technician_id,
 rating,
 comment,
 (SELECT fullname FROM client c WHERE c.id = client_id) AS client_name,
-(SELECT service_name FROM booking b WHERE b.id = booking_id) AS service_name
+(SELECT service_name FROM booking b WHERE b.id = booking_id) AS service_name,
+created_at
 """
 
 
@@ -30,7 +33,7 @@ class ReviewRepository:
             comment=record["comment"],
             client_name=record["client_name"],
             service_name=record["service_name"],
-            created_at=record["rating"],
+            created_at=record["created_at"],
         )
 
     async def exists(self, booking_id: UUID) -> bool:
@@ -43,10 +46,10 @@ class ReviewRepository:
 
     async def create(self, data: Dict[str, Any]) -> Optional[ReviewInDB]:
         """Create a new review"""
-        query: str = """
-        INSERT INTO review (booking_id, rating, comment)
-        VALUES ($1, $2, $3)
-        RETURNING *
+        query: str = f"""
+        INSERT INTO review (booking_id, client_id, technician_id, rating, comment)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING {RETURN_QUERY}
         """
         values: Tuple[Any, ...] = tuple(data.values())
         review_record: Optional[Record] = await self.db.fetchone(query, *values)
@@ -56,21 +59,19 @@ class ReviewRepository:
 
     async def readone(self, review_id: UUID) -> Optional[ReviewInDB]:
         """Read one review from the database"""
-        query: str = "SELECT * FROM review WHERE id = $1"
+        query: str = f"SELECT {RETURN_QUERY} FROM review WHERE id = $1"
         review_record: Optional[Record] = await self.db.fetchone(query, review_id)
         return (
             self.record_to_review(review_record) if review_record is not None else None
         )
 
-    async def readall(
+    def filters(
         self,
-        client_id: Optional[UUID],
-        technician_id: Optional[UUID],
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
         min_rating: Optional[int] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[ReviewInDB]:
-        """Read all reviews from the database"""
+    ) -> Tuple[List[str], List[Any]]:
+        """Build the WHERE conditions and their parameters for the review filters"""
         filters: List[str] = []
         params: List[Any] = []
         if client_id is not None:
@@ -82,10 +83,30 @@ class ReviewRepository:
         if min_rating is not None:
             filters.append(f"rating >= ${len(filters) + 1}")
             params.append(min_rating)
+        return filters, params
 
+    async def readall(
+        self,
+        client_id: Optional[UUID],
+        technician_id: Optional[UUID],
+        min_rating: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[ReviewInDB]:
+        """
+        Read all reviews from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
+        filters, params = self.filters(client_id, technician_id, min_rating)
+        if after is not None:
+            filters.append(f"(created_at, id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
         query: str = f"""
-        SELECT * FROM review
+        SELECT {RETURN_QUERY} FROM review
         {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY created_at DESC, id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
@@ -95,6 +116,22 @@ class ReviewRepository:
             self.record_to_review(review_record) for review_record in review_records
         ]
 
+    async def stream(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        min_rating: Optional[int] = None,
+    ) -> AsyncIterator[ReviewInDB]:
+        """Stream every matching review through a server-side cursor"""
+        filters, params = self.filters(client_id, technician_id, min_rating)
+        query: str = f"""
+        SELECT {RETURN_QUERY} FROM review
+        {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY created_at, id
+        """
+        async for review_record in self.db.fetch_iter(query, *params):
+            yield self.record_to_review(review_record)
+
     async def update(
         self, review_id: UUID, data: Dict[str, Any]
     ) -> Optional[ReviewInDB]:
@@ -105,7 +142,7 @@ class ReviewRepository:
         query: str = f"""
         UPDATE review SET {", ".join(updates)}
         WHERE id = $1
-        RETURNING *
+        RETURNING {RETURN_QUERY}
         """
         values: Tuple[Any, ...] = (review_id, *data.values())
         updated_review: Optional[Record] = await self.db.fetchone(query, *values)
@@ -1,16 +1,99 @@
 from uuid import UUID
 from asyncpg import Record  # type: ignore
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from app.database import AsyncDatabase
 from app.models import TechnicianInDB
+from app.models.base import TimeSlot
 
-from .technician import record_to_technician
+from app.utils.geo import haversine_meters
+
+from .booking import LIVE_OVERLAP
+from .technician import RETURN_QUERY as TECHNICIAN_RETURN_QUERY, CARD_JOIN, record_to_technician
+from .nearby_cache import Candidates, CellKey, NearbyCache
 # from loguru import logger
 
 
 class SearchRepository:
-    def __init__(self, db: AsyncDatabase) -> None:
+    def __init__(
+        self, db: AsyncDatabase, nearby_cache: Optional[NearbyCache] = None
+    ) -> None:
         self.db = db
+        self.nearby_cache = nearby_cache
+
+    def nearby_query(
+        self, by_service: bool, paged: bool, available: bool = False, ids_only: bool = False
+    ) -> str:
+        """
+        The radius search statement. ST_DWithin and the `<->` ordering both run on the GiST
+        index of technician.location, the client location is looked up once in `origin`.
+        Both measure on the sphere (use_spheroid => false), like the in-memory searches, so
+        every path agrees on who is in range and on the distances the cursors are made of.
+        `ids_only` reads only the ids and distances, for candidates ranked in memory.
+
+        Parameters: $1 client id, $2 radius in km, then the service names when `by_service`,
+        the weekday, date, start and end time when `available`, the (distance, id) cursor when
+        `paged`, and last the offset and limit.
+        """
+        filters: List[str] = []
+        n: int = 3
+        if by_service:
+            filters.append(
+                f"""
+                t.id IN (
+                    SELECT ts.technician_id
+                    FROM technician_service ts
+                    JOIN service s ON ts.service_id = s.id
+                    WHERE s.name = ANY(${n}::text[])
+                )
+                """
+            )
+            n += 1
+        if available:
+            # Working that weekday for the whole window, without an overlapping live booking
+            weekday, day, start, end = n, n + 1, n + 2, n + 3
+            booked: str = LIVE_OVERLAP.format(
+                technician="t.id", day=f"${day}::date", start=f"${start}::time", end=f"${end}::time"
+            )
+            filters.append(
+                f"""
+                t.is_available = TRUE
+                AND EXISTS (
+                    SELECT 1 FROM technician_availability ta
+                    WHERE ta.technician_id = t.id
+                    AND ta.day = ${weekday}::smallint
+                    AND ta.active = TRUE
+                    AND ta.start_time <= ${start}::time
+                    AND ta.end_time >= ${end}::time
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM booking b
+                    WHERE {booked}
+                )
+                """
+            )
+            n += 4
+        if paged:
+            # Continue after the previous page instead of skipping over it
+            filters.append(
+                f"(t.location <-> (SELECT location FROM origin), t.id) > (${n}, ${n + 1})"
+            )
+            n += 2
+        return f"""
+        WITH origin AS MATERIALIZED (
+            SELECT c.location FROM client c WHERE c.id = $1
+        )
+        SELECT
+            {"t.id" if ids_only else TECHNICIAN_RETURN_QUERY},
+            t.location <-> (SELECT location FROM origin) AS distance_meters
+        FROM technician t
+        {"" if ids_only else CARD_JOIN}
+        WHERE ST_DWithin(t.location, (SELECT location FROM origin), $2::float8 * 1000, false)
+        AND t.is_active = TRUE
+        {" ".join(f"AND {condition}" for condition in filters)}
+        ORDER BY t.location <-> (SELECT location FROM origin), t.id
+        OFFSET ${n}
+        LIMIT ${n + 1}
+        """
 
     async def search_nearby_technicians(
         self,
@@ -19,86 +102,204 @@ class SearchRepository:
         service_names: Optional[List[str]] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[TechnicianInDB]:
+        after: Optional[Tuple[float, UUID]] = None,
+        slot: Optional[TimeSlot] = None,
+    ) -> List[Tuple[TechnicianInDB, float]]:
         """
         Search for technicians within a given radius (in km) of a client's location.
         Optionally filter by one or more service names.
+        `after` continues from the `(distance_meters, id)` of the last row of the previous page.
+        `slot` keeps only the technicians free for the whole slot: available that weekday
+        (0 is Sunday, as in technician_availability.day) and without an overlapping booking that is not rejected or cancelled.
 
         Returns:
-            List of TechnicianInDB objects
+            List of (TechnicianInDB, distance in meters) pairs, nearest first
         """
-        # Prepare base query
-        query = f"""
-            SELECT
-                t.id,
-                t.fullname,
-                t.email,
-                t.phone,
-                t.hashed_password,
-                t.location_name,
-                ST_X(t.location::geometry) AS longitude,
-                ST_Y(t.location::geometry) AS latitude,
-                (
-                    SELECT AVG(r.rating)
-                    FROM review r
-                    WHERE r.technician_id = t.id
-                ) AS rating,
-                ARRAY(
-                    SELECT s.name
-                    FROM technician_service ts
-                    JOIN service s ON s.id = ts.service_id
-                    WHERE ts.technician_id = t.id
-                ) AS services,
-                t.is_available,
-                (
-                    SELECT COUNT(*) > 0
-                    FROM verified_technician vt
-                    WHERE vt.technician_id = t.id
-                ) AS is_verified,
-                t.is_active,
-                t.created_at,
-                ST_Distance(
-                    t.location,
-                    (SELECT c.location FROM client c WHERE c.id = $1)
-                ) AS distance_meters
-            FROM technician t
-            WHERE
-                ST_Distance(
-                    t.location,
-                    (SELECT c.location FROM client c WHERE c.id = $1)
-                ) / 1000 <= $2
-                AND t.is_active = TRUE
+        if (
+            slot is None
+            and self.nearby_cache is not None
+            and self.nearby_cache.bucket(radius_km)
+        ):
+            return await self.search_nearby_technicians_cached(
+                self.nearby_cache, client_id, radius_km, service_names, skip, limit, after
+            )
+        params: List[Any] = [client_id, radius_km]
+        if service_names:
+            params.append(service_names)
+        if slot is not None:
+            params.extend(
+                [slot.slot_date.isoweekday() % 7, slot.slot_date, slot.start_time, slot.end_time]
+            )
+        if after is not None:
+            params.extend(after)
+            skip = 0
+        params.extend([skip, limit])
+
+        query: str = self.nearby_query(
+            bool(service_names), after is not None, slot is not None
+        )
+        technician_records: List[Record] = await self.db.fetchall(query, *params, replica=True)
+        return [
+            (record_to_technician(record), record["distance_meters"])
+            for record in technician_records
+        ]
+
+    async def nearby_candidates(
+        self,
+        cache: NearbyCache,
+        lon: float,
+        lat: float,
+        radius_km: float,
+        service_names: Optional[List[str]],
+    ) -> Candidates:
+        """The candidates of the client's cell, read from the database on a miss"""
+        key: CellKey = cache.key(lon, lat, cache.bucket(radius_km) or radius_km, service_names)
+        candidates, generation = cache.get(key)
+        if candidates is not None:
+            return candidates
+        center_lon, center_lat, radius_meters = cache.reach(key)
+        params: List[Any] = [center_lon, center_lat, radius_meters]
+        service_filter: str = ""
+        if key[2]:
+            service_filter = """
+            AND t.id IN (
+                SELECT ts.technician_id
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE s.name = ANY($4::text[])
+            )
+            """
+            params.append(list(key[2]))
+        query: str = f"""
+        SELECT
+            t.id,
+            ST_X(t.location::geometry) AS longitude,
+            ST_Y(t.location::geometry) AS latitude
+        FROM technician t
+        WHERE ST_DWithin(
+            t.location, ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography, $3::float8, false
+        )
+        AND t.is_active = TRUE
+        {service_filter}
         """
+        # From the primary: the candidates are kept until a NOTIFY drops them, one read from a
+        # lagging replica after the NOTIFY would stay stale for the whole TTL
+        records: List[Record] = await self.db.fetchall(query, *params)
+        candidates = Candidates(
+            center_lon,
+            center_lat,
+            radius_meters,
+            [(r["id"], r["longitude"], r["latitude"]) for r in records],
+        )
+        cache.put(key, candidates, generation)
+        return candidates
 
-        # Parameters for the query
-        params: List[Any] = [client_id, radius_km]
+    async def search_nearby_technicians_cached(
+        self,
+        cache: NearbyCache,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[Tuple[TechnicianInDB, float]]:
+        """
+        `search_nearby_technicians` answered from the cell candidates: distances and order are
+        computed here, then only the technicians of the requested page are read.
+        """
+        origin: Optional[Tuple[float, float]] = await self.client_point(client_id)
+        if origin is None:
+            return []
+        in_range: List[Tuple[float, UUID]] = await self.in_range(
+            cache, *origin, radius_km, service_names
+        )
+        if after is not None:
+            in_range = [row for row in in_range if row > after]
+            skip = 0
+        return await self.readall_ranked(in_range[skip : skip + limit])
 
-        # Add optional service filter
+    async def in_range(
+        self,
+        cache: NearbyCache,
+        lon: float,
+        lat: float,
+        radius_km: float,
+        service_names: Optional[List[str]],
+    ) -> List[Tuple[float, UUID]]:
+        """
+        (distance in meters, id) of every technician in range of the point, nearest first,
+        measured on the sphere nearby_query measures on
+        """
+        candidates: Candidates = await self.nearby_candidates(
+            cache, lon, lat, radius_km, service_names
+        )
+        return sorted(
+            (distance, technician_id)
+            for technician_id, t_lon, t_lat in candidates.technicians
+            if (distance := haversine_meters(lon, lat, t_lon, t_lat)) <= radius_km * 1000
+        )
+
+    async def nearest_ids(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]] = None,
+        limit: int = 5000,
+    ) -> List[Tuple[float, UUID]]:
+        """(distance in meters, id) of the nearest `limit` technicians in range, nearest first"""
+        if self.nearby_cache is not None and self.nearby_cache.bucket(radius_km):
+            origin: Optional[Tuple[float, float]] = await self.client_point(client_id)
+            if origin is None:
+                return []
+            in_range: List[Tuple[float, UUID]] = await self.in_range(
+                self.nearby_cache, *origin, radius_km, service_names
+            )
+            return in_range[:limit]
+        params: List[Any] = [client_id, radius_km]
         if service_names:
-            query += """
-                AND t.id IN (
-                    SELECT ts.technician_id
-                    FROM technician_service ts
-                    JOIN service s ON ts.service_id = s.id
-                    WHERE s.name = ANY($3::text[])
-                )
-            """
             params.append(service_names)
+        params.extend([0, limit])
+        records: List[Record] = await self.db.fetchall(
+            self.nearby_query(bool(service_names), False, ids_only=True), *params, replica=True
+        )
+        return [(r["distance_meters"], r["id"]) for r in records]
 
-        # Add ordering and pagination
-        offset_param_index = len(params) + 1
-        limit_param_index = len(params) + 2
+    async def client_point(self, client_id: UUID) -> Optional[Tuple[float, float]]:
+        """(longitude, latitude) of a client"""
+        record: Optional[Record] = await self.db.fetchone(
+            """
+            SELECT ST_X(location::geometry) AS longitude, ST_Y(location::geometry) AS latitude
+            FROM client WHERE id = $1
+            """,
+            client_id,
+            replica=True,
+        )
+        return (record["longitude"], record["latitude"]) if record is not None else None
 
-        query += f"""
-            ORDER BY distance_meters ASC
-            OFFSET ${offset_param_index}
-            LIMIT ${limit_param_index}
+    async def readall_ranked(
+        self, ranked: List[Tuple[float, UUID]]
+    ) -> List[Tuple[TechnicianInDB, float]]:
+        """Read the active technicians of a page ranked in memory, keeping its order and distances"""
+        if not ranked:
+            return []
+        query: str = f"""
+        SELECT {TECHNICIAN_RETURN_QUERY}
+        FROM technician t
+        {CARD_JOIN}
+        WHERE t.id = ANY($1::uuid[]) AND t.is_active = TRUE
         """
-        params.extend([skip, limit])
-
-        # Execute query
-        technician_records: List[Record] = await self.db.fetchall(query, *params)
-        return [record_to_technician(record) for record in technician_records]
+        records: List[Record] = await self.db.fetchall(
+            query, [technician_id for _, technician_id in ranked], replica=True
+        )
+        technicians: Dict[UUID, TechnicianInDB] = {
+            r["id"]: record_to_technician(r) for r in records
+        }
+        return [
+            (technicians[technician_id], distance)
+            for distance, technician_id in ranked
+            if technician_id in technicians
+        ]
 
     # async def search_technicians_by_description(
     #     self,
@@ -178,6 +379,68 @@ class SearchRepository:
     #     technician_records: List[Record] = await self.db.fetchall(query, *params)
     #     return [record_to_technician(record) for record in technician_records]
     
+    def description_query(self, ids_only: bool = False) -> str:
+        """
+        The description search statement, in two stages.
+        `terms` turns the description into its tsqueries and ILIKE pattern once, `matched` scores
+        the matching services through the GIN search_vector and trigram indexes, and only the
+        technicians offering those services are then checked against the radius.
+        A technician scores the best score among its matching services.
+        `ids_only` reads only the ids, distances in meters and scores, for candidates ranked in memory.
+        """
+        columns: str = (
+            "t.id, ST_Distance(t.location, c.location) AS distance_meters"
+            if ids_only
+            else f"""
+                {TECHNICIAN_RETURN_QUERY},
+                ST_Distance(t.location::geometry, c.location::geometry) AS distance_meters"""
+        )
+        return f"""
+        WITH terms AS MATERIALIZED (
+            SELECT
+                '%' || $3::text || '%' AS pattern,
+                plainto_tsquery('english', $3) AS plain,
+                websearch_to_tsquery('english', $3) AS websearch,
+                to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g')) AS words
+        ),
+        matched AS (
+            SELECT
+                s.id,
+                GREATEST(
+                    CASE WHEN s.name ILIKE (SELECT pattern FROM terms) THEN 1.0 ELSE 0.0 END,
+                    CASE WHEN s.description ILIKE (SELECT pattern FROM terms) THEN 0.9 ELSE 0.0 END,
+                    CASE WHEN s.search_vector @@ (SELECT plain FROM terms)
+                        THEN ts_rank(s.search_vector, (SELECT plain FROM terms)) * 0.8 END,
+                    CASE WHEN s.search_vector @@ (SELECT websearch FROM terms)
+                        THEN ts_rank(s.search_vector, (SELECT websearch FROM terms)) * 0.85 END,
+                    CASE WHEN s.search_vector @@ (SELECT words FROM terms)
+                        THEN ts_rank(s.search_vector, (SELECT words FROM terms)) * 0.7 END
+                ) AS score
+            FROM service s
+            WHERE s.name ILIKE (SELECT pattern FROM terms)
+            OR s.description ILIKE (SELECT pattern FROM terms)
+            OR s.search_vector @@ (SELECT plain FROM terms)
+            OR s.search_vector @@ (SELECT websearch FROM terms)
+            OR s.search_vector @@ (SELECT words FROM terms)
+        ),
+        scored AS (
+            SELECT ts.technician_id, MAX(m.score) AS relevance_score
+            FROM matched m
+            JOIN technician_service ts ON ts.service_id = m.id
+            GROUP BY ts.technician_id
+        )
+        SELECT
+            {columns},
+            scored.relevance_score
+        FROM scored
+        JOIN technician t ON t.id = scored.technician_id
+        JOIN client c ON c.id = $1
+        {"" if ids_only else CARD_JOIN}
+        WHERE ST_DWithin(t.location, c.location, $2::float8 * 1000)
+        ORDER BY relevance_score DESC, distance_meters ASC, t.id
+        OFFSET $4 LIMIT $5
+        """
+
     async def search_technicians_by_description(
         self,
         client_id: UUID,
@@ -190,104 +453,36 @@ class SearchRepository:
         Search technicians whose services match the given problem description using multiple
         search strategies for maximum flexibility and relevance.
         """
-
-        # Clean and prepare the search term
-        cleaned_description = problem_description.strip()
-        
-        # Base SELECT clause for technician data
-        select_clause = """
-            t.id,
-            t.fullname,
-            t.email,
-            t.phone,
-            t.hashed_password,
-            t.location_name,
-            ST_X(t.location::geometry) AS longitude,
-            ST_Y(t.location::geometry) AS latitude,
-            (SELECT AVG(r.rating) FROM review r WHERE r.technician_id = t.id) AS rating,
-            ARRAY(
-                SELECT s.name
-                FROM technician_service ts
-                JOIN service s ON s.id = ts.service_id
-                WHERE ts.technician_id = t.id
-            ) AS services,
-            t.is_available,
-            (SELECT COUNT(*) > 0 FROM verified_technician vt WHERE vt.technician_id = t.id) AS is_verified,
-            t.is_active,
-            t.created_at,
-            ST_Distance(t.location::geometry, c.location::geometry) AS distance_meters
-        """
-
-        # Enhanced SQL query with multiple search strategies
-        query = f"""
-            SELECT {select_clause},
-            -- Calculate relevance score using multiple search methods
-            GREATEST(
-                -- Exact phrase match in name (highest priority)
-                (SELECT MAX(CASE WHEN s.name ILIKE '%' || $3 || '%' THEN 1.0 ELSE 0.0 END)
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id),
-                
-                -- Exact phrase match in description
-                (SELECT MAX(CASE WHEN s.description ILIKE '%' || $3 || '%' THEN 0.9 ELSE 0.0 END)
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id),
-                
-                -- Full-text search with plainto_tsquery (flexible)
-                (SELECT MAX(ts_rank(s.search_vector, plainto_tsquery('english', $3)) * 0.8)
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id
-                AND s.search_vector @@ plainto_tsquery('english', $3)),
-                
-                -- Full-text search with websearch_to_tsquery (handles phrases better)
-                (SELECT MAX(ts_rank(s.search_vector, websearch_to_tsquery('english', $3)) * 0.85)
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id
-                AND s.search_vector @@ websearch_to_tsquery('english', $3)),
-                
-                -- Individual word matching (OR strategy)
-                (SELECT MAX(ts_rank(s.search_vector, 
-                    to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g'))) * 0.7)
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id
-                AND s.search_vector @@ to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g')))
-            ) AS relevance_score
-            
-            FROM technician t
-            JOIN client c ON c.id = $1
-            WHERE ST_Distance(t.location, c.location) / 1000 <= $2
-            AND EXISTS (
-                SELECT 1
-                FROM technician_service ts
-                JOIN service s ON ts.service_id = s.id
-                WHERE ts.technician_id = t.id
-                AND (
-                    -- Multiple search conditions
-                    s.name ILIKE '%' || $3 || '%'
-                    OR s.description ILIKE '%' || $3 || '%'
-                    OR s.search_vector @@ plainto_tsquery('english', $3)
-                    OR s.search_vector @@ websearch_to_tsquery('english', $3)
-                    OR s.search_vector @@ to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g'))
-                )
-            )
-            ORDER BY relevance_score DESC, distance_meters ASC
-            OFFSET $4 LIMIT $5
-        """
-
-        # Parameters for the query
         params: List[Any] = [
             client_id,  # $1
             radius_km,  # $2
-            cleaned_description,  # $3
+            problem_description.strip(),  # $3
             skip,  # $4
             limit,  # $5
         ]
-
-        # Execute the query and map results
-        technician_records: List[Record] = await self.db.fetchall(query, *params)
+        technician_records: List[Record] = await self.db.fetchall(
+            self.description_query(), *params, replica=True
+        )
         return [record_to_technician(record) for record in technician_records]
+
+    async def description_candidates(
+        self,
+        client_id: UUID,
+        problem_description: str,
+        radius_km: float,
+        limit: int = 5000,
+    ) -> List[Tuple[float, UUID, float]]:
+        """(distance in meters, id, relevance score) of the best `limit` description matches in range"""
+        technician_records: List[Record] = await self.db.fetchall(
+            self.description_query(ids_only=True),
+            client_id,
+            radius_km,
+            problem_description.strip(),
+            0,
+            limit,
+            replica=True,
+        )
+        return [
+            (r["distance_meters"], r["id"], float(r["relevance_score"]))
+            for r in technician_records
+        ]
@@ -2,12 +2,39 @@ from uuid import UUID
 from asyncpg import Record  # type: ignore
 from typing import Any, Dict, List, Tuple, Optional
 from app.database import AsyncDatabase
-from app.models import ServiceInDB
+from app.models import ServiceInDB, ServiceSuggestion
+
+from .service_catalogue import ServiceCatalogue
+
+
+def escape_like(text: str) -> str:
+    """Escape the LIKE wildcards in user input so it only matches literally"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class ServiceRepository:
-    def __init__(self, db: AsyncDatabase) -> None:
+    def __init__(
+        self, db: AsyncDatabase, catalogue: Optional[ServiceCatalogue] = None
+    ) -> None:
         self.db = db
+        self.catalogue = catalogue
+
+    def cached(self) -> Optional[ServiceCatalogue]:
+        """The catalogue if it can answer reads right now, else None and the read goes to the database"""
+        if self.catalogue is None:
+            return None
+        if not self.catalogue.ready:
+            self.catalogue.miss()
+            return None
+        return self.catalogue
+
+    def invalidate(self) -> None:
+        """
+        Drop this process's catalogue straight after a write so it reads its own writes,
+        other processes hear about it through the NOTIFY of the service trigger.
+        """
+        if self.catalogue is not None:
+            self.catalogue.invalidate()
 
     def record_to_service(self, record: Record) -> ServiceInDB:
         """Convert a database record to a ServiceInDB object."""
@@ -20,6 +47,8 @@ class ServiceRepository:
 
     async def exists(self, service_name: str) -> bool:
         """Check if a service exists in the database"""
+        if catalogue := self.cached():
+            return catalogue.get_by_name(service_name) is not None
         query: str = "SELECT * FROM service WHERE LOWER(name) = $1"
         service: Optional[Record] = await self.db.fetchone(query, service_name.lower())
         return service is not None
@@ -33,14 +62,47 @@ class ServiceRepository:
         """
         values: Tuple[Any, ...] = tuple(data.values())
         service_record: Optional[Record] = await self.db.fetchone(query, *values)
+        self.invalidate()
         return (
             self.record_to_service(service_record)
             if service_record is not None
             else None
         )
 
+    async def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create many services at once by COPYing them into a staging table.
+        Services whose name already exists are skipped, returns the number created.
+        """
+        records: List[Tuple[Any, ...]] = [
+            (row["name"], row["description"]) for row in rows
+        ]
+        async with self.db.transaction():
+            await self.db.execute(
+                """
+                CREATE TEMP TABLE service_import (
+                    name VARCHAR(255),
+                    description TEXT
+                ) ON COMMIT DROP
+                """
+            )
+            await self.db.copy_records(
+                "service_import", records, columns=["name", "description"]
+            )
+            result: str = await self.db.execute(
+                """
+                INSERT INTO service (name, description)
+                SELECT name, description FROM service_import
+                ON CONFLICT (name) DO NOTHING
+                """
+            )
+        self.invalidate()
+        return int(result.split()[-1])
+
     async def readone(self, service_id: UUID) -> Optional[ServiceInDB]:
         """Read one service from the database"""
+        if catalogue := self.cached():
+            return catalogue.get(service_id)
         query: str = "SELECT * FROM service WHERE id = $1"
         service_record: Optional[Record] = await self.db.fetchone(query, service_id)
         return (
@@ -50,9 +112,12 @@ class ServiceRepository:
         )
 
     async def readall(self, skip: int = 0, limit: int = 100) -> List[ServiceInDB]:
-        """Read all services from the database"""
+        """Read all services from the database, by name"""
+        if catalogue := self.cached():
+            return catalogue.all(skip, limit)
         query: str = """
         SELECT * FROM service
+        ORDER BY name
         OFFSET $1
         LIMIT $2
         """
@@ -75,6 +140,7 @@ class ServiceRepository:
         """
         values: Tuple[Any, ...] = (service_id, *data.values())
         updated_service: Optional[Record] = await self.db.fetchone(query, *values)
+        self.invalidate()
         return (
             self.record_to_service(updated_service)
             if updated_service is not None
@@ -85,18 +151,48 @@ class ServiceRepository:
         """Delete an existing service"""
         query: str = "DELETE FROM service WHERE id = $1"
         result: str = await self.db.execute(query, service_id)
+        self.invalidate()
         return "0" not in result
 
     async def readone_by_name(self, service_name: str) -> Optional[ServiceInDB]:
         """Read one service from the database by name"""
-        query: str = (
-            "SELECT * FROM service WHERE LOWER(name) LIKE LOWER('%' || $1 || '%')"
-        )
+        if catalogue := self.cached():
+            return catalogue.find_by_name(service_name)
+        query: str = """
+        SELECT * FROM service WHERE name ILIKE '%' || $1::text || '%'
+        ORDER BY name LIMIT 1
+        """
         service_record: Optional[Record] = await self.db.fetchone(
-            query, service_name.lower()
+            query, escape_like(service_name)
         )
         return (
             self.record_to_service(service_record)
             if service_record is not None
             else None
         )
+
+    async def suggest(self, text: str, limit: int = 10) -> List[ServiceSuggestion]:
+        """
+        Services whose name starts with `text` first, then the closest fuzzy matches.
+        Both predicates are answered by the trigram index on service.name.
+        """
+        query: str = """
+        SELECT
+            id,
+            name,
+            CASE
+                WHEN name ILIKE $2::text || '%' THEN 1.0
+                ELSE word_similarity($1::text, name)
+            END AS score
+        FROM service
+        WHERE name ILIKE $2::text || '%' OR $1::text <% name
+        ORDER BY score DESC, name
+        LIMIT $3
+        """
+        records: List[Record] = await self.db.fetchall(
+            query, text, escape_like(text), limit
+        )
+        return [
+            ServiceSuggestion(id=r["id"], name=r["name"], score=r["score"])
+            for r in records
+        ]
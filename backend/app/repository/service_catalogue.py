@@ -0,0 +1,121 @@
+import asyncio
+from uuid import UUID
+from loguru import logger
+from typing import Any, Dict, List, Optional
+from asyncpg import Record  # type: ignore
+from app.database import AsyncDatabase
+from app.models import ServiceInDB
+
+# NOTIFYed by the trg_service_changed statement trigger on every write to service
+CHANNEL: str = "service_changed"
+
+
+class ServiceCatalogue:
+    """
+    The whole service table held in memory: services by id, by name and in name order.
+
+    Loaded at startup and reloaded whenever Postgres NOTIFYs a write to the table. Until the
+    first load succeeds, and while a reload is pending, `ready` is False and callers read
+    from the database instead.
+    """
+
+    def __init__(self, db: AsyncDatabase) -> None:
+        self.db = db
+        self._by_id: Dict[UUID, ServiceInDB] = {}
+        self._by_name: Dict[str, ServiceInDB] = {}
+        self._ordered: List[ServiceInDB] = []
+        self._ready: bool = False
+        self._generation: int = 0
+        self._refresh: Optional[asyncio.Task[None]] = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.reloads: int = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def start(self) -> None:
+        """Subscribe to service changes, then load the catalogue"""
+        await self.db.listen(CHANNEL, self.invalidate)
+        await self.reload()
+
+    async def reload(self) -> None:
+        """
+        Load the service table, repeating the load if it was invalidated meanwhile so the
+        catalogue never goes ready with rows older than the last NOTIFY.
+        """
+        while True:
+            generation: int = self._generation
+            records: List[Record] = await self.db.fetchall(
+                "SELECT id, name, description, created_at FROM service ORDER BY name"
+            )
+            services: List[ServiceInDB] = [
+                ServiceInDB(
+                    id=r["id"],
+                    name=r["name"],
+                    description=r["description"],
+                    created_at=r["created_at"],
+                )
+                for r in records
+            ]
+            if generation != self._generation:
+                continue
+            self._ordered = services
+            self._by_id = {service.id: service for service in services}
+            self._by_name = {service.name.lower(): service for service in services}
+            self._ready = True
+            self.reloads += 1
+            logger.info(f"Service catalogue loaded {len(services)} services")
+            return
+
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        """Stop answering from memory and reload in the background"""
+        self._generation += 1
+        self._ready = False
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._reload_in_background())
+
+    async def _reload_in_background(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error(f"Failed to reload the service catalogue: {e}")
+
+    async def stop(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+
+    def get(self, service_id: UUID) -> Optional[ServiceInDB]:
+        self.hits += 1
+        return self._by_id.get(service_id)
+
+    def get_by_name(self, name: str) -> Optional[ServiceInDB]:
+        self.hits += 1
+        return self._by_name.get(name.lower())
+
+    def find_by_name(self, text: str) -> Optional[ServiceInDB]:
+        """First service, by name, whose name contains `text`"""
+        self.hits += 1
+        text = text.lower()
+        return next((s for s in self._ordered if text in s.name.lower()), None)
+
+    def all(self, skip: int = 0, limit: int = 100) -> List[ServiceInDB]:
+        self.hits += 1
+        return self._ordered[skip : skip + limit]
+
+    def miss(self) -> None:
+        """Count a lookup that had to go to the database"""
+        self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups: int = self.hits + self.misses
+        return {
+            "ready": self._ready,
+            "services": len(self._ordered),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "reloads": self.reloads,
+        }
@@ -1,10 +1,13 @@
 from uuid import UUID
 from typing import Optional, List, Tuple, Dict, Any
+from datetime import datetime
 from asyncpg import Record  # type: ignore
 from app.database import AsyncDatabase
-from app.models import TechnicianInDB
+from app.models import TechnicianInDB, UserCredentials
 from app.models.base import Location, PhoneNumber
 
+from .credentials import email_or_phone_taken, read_access, read_credentials
+
 RETURN_QUERY: str = """
     t.id,
     t.fullname,
@@ -14,19 +17,27 @@ RETURN_QUERY: str = """
     t.location_name,
     ST_X(t.location::geometry) AS longitude,
     ST_Y(t.location::geometry) AS latitude,
-    (SELECT AVG(r.rating) FROM review r WHERE technician_id = t.id) AS rating,
-    ARRAY(
-        SELECT s.name
-        FROM technician_service ts
-        JOIN service s ON s.id = ts.service_id
-        WHERE ts.technician_id = t.id
-    ) AS services,
+    COALESCE(t.rating_sum::FLOAT / NULLIF(t.rating_count, 0), 0) AS rating,
+    COALESCE(tc.services, ARRAY[]::TEXT[]) AS services,
     t.is_available,
-    (SELECT COUNT(*) > 0 FROM verified_technician vt WHERE vt.technician_id = t.id) AS is_verified,
+    COALESCE(tc.is_verified, FALSE) AS is_verified,
     t.is_active,
     t.created_at
 """
 
+# Every query selecting RETURN_QUERY joins the precomputed card of `t`
+CARD_JOIN: str = "LEFT JOIN technician_card tc ON tc.technician_id = t.id"
+
+IMPORT_COLUMNS: List[str] = [
+    "fullname",
+    "email",
+    "phone",
+    "hashed_password",
+    "location_name",
+    "longitude",
+    "latitude",
+]
+
 
 def record_to_technician(record: Record) -> TechnicianInDB:
     """Convert a database record to a TechnicianInDB object"""
@@ -56,20 +67,21 @@ class TechnicianRepository:
 
     async def exists(self, email: str, phone: str) -> Tuple[bool, str]:
         """Check if a technician with the given email or phone exists in the database."""
-        query: str = "SELECT * FROM technician WHERE email = $1"
-        technician: Optional[Record] = await self.db.fetchone(query, email)
-
-        if technician is not None:
+        email_taken, phone_taken = await email_or_phone_taken(self.db, "technician", email, phone)
+        if email_taken:
             return True, "Technician with email already exists"
-
-        query = "SELECT * FROM technician WHERE phone = $1"
-        technician = await self.db.fetchone(query, phone)
-
-        if technician is not None:
+        if phone_taken:
             return True, "Technician with phone already exists"
-
         return False, "Technician does not exist"
 
+    async def read_credentials(self, email: str) -> Optional[UserCredentials]:
+        """Id, password hash, active flag and token version of the technician with this email"""
+        return await read_credentials(self.db, "technician", email)
+
+    async def read_access(self, technician_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the technician, None once deleted"""
+        return await read_access(self.db, "technician", technician_id)
+
     async def create(self, data: Dict[str, Any]) -> Optional[TechnicianInDB]:
         """Create a new technician in the database"""
         location_point: str = (
@@ -91,16 +103,60 @@ class TechnicianRepository:
         record: Optional[Record] = await self.db.fetchone(query, *values)
         return await self.readone(record["id"]) if record else None
 
+    async def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create many technicians at once by COPYing them into a staging table.
+        Rows whose email or phone already exist are skipped, returns the number created.
+        """
+        records: List[Tuple[Any, ...]] = [
+            (
+                row["fullname"],
+                row["email"],
+                row["phone"],
+                row["hashed_password"],
+                row["location"]["location_name"],
+                row["location"]["longitude"],
+                row["location"]["latitude"],
+            )
+            for row in rows
+        ]
+        async with self.db.transaction():
+            await self.db.execute(
+                """
+                CREATE TEMP TABLE technician_import (
+                    fullname VARCHAR(255),
+                    email VARCHAR(255),
+                    phone TEXT,
+                    hashed_password VARCHAR(255),
+                    location_name VARCHAR(100),
+                    longitude DOUBLE PRECISION,
+                    latitude DOUBLE PRECISION
+                ) ON COMMIT DROP
+                """
+            )
+            await self.db.copy_records(
+                "technician_import", records, columns=IMPORT_COLUMNS
+            )
+            result: str = await self.db.execute(
+                """
+                INSERT INTO technician (fullname, email, phone, hashed_password, location_name, location)
+                SELECT fullname, email, phone, hashed_password, location_name,
+                    ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+                FROM technician_import
+                ON CONFLICT DO NOTHING
+                """
+            )
+        return int(result.split()[-1])
+
     async def readone(self, technician_id: UUID) -> Optional[TechnicianInDB]:
         """Read one technician from the database"""
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM technician t
+        {CARD_JOIN}
         WHERE t.id = $1
         """
-        technician_record: Optional[Record] = await self.db.fetchone(
-            query, technician_id
-        )
+        technician_record: Optional[Record] = await self.db.fetchone(query, technician_id)
         return (
             record_to_technician(technician_record)
             if technician_record is not None
@@ -113,8 +169,12 @@ class TechnicianRepository:
         is_available: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
     ) -> List[TechnicianInDB]:
-        """Read all technicians from the database"""
+        """
+        Read all technicians from the database, newest first.
+        `after` continues from the `(created_at, id)` of the last row of the previous page.
+        """
         filters: List[str] = []
         params: List[Any] = []
         if active is not None:
@@ -123,11 +183,17 @@ class TechnicianRepository:
         if is_available is not None:
             filters.append(f"t.is_available = ${len(filters) + 1}")
             params.append(is_available)
+        if after is not None:
+            filters.append(f"(t.created_at, t.id) < (${len(params) + 1}, ${len(params) + 2})")
+            params.extend(after)
+            skip = 0
 
         query: str = f"""
         SELECT {RETURN_QUERY}
         FROM technician t
+        {CARD_JOIN}
         {"WHERE " + " AND ".join(filters) if filters else ""}
+        ORDER BY t.created_at DESC, t.id DESC
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
@@ -143,12 +209,17 @@ class TechnicianRepository:
     ) -> Optional[TechnicianInDB]:
         """Update an existing technician"""
         updates: List[str] = [
-            f"t.{key} = ${i}" for i, key in enumerate(data.keys(), start=2)
+            f"{key} = ${i}" for i, key in enumerate(data.keys(), start=2)
         ]
         query: str = f"""
-        UPDATE technician t SET {", ".join(updates)}
-        WHERE t.id = $1
-        RETURNING {RETURN_QUERY}
+        WITH updated AS (
+            UPDATE technician t SET {", ".join(updates)}
+            WHERE t.id = $1
+            RETURNING t.*
+        )
+        SELECT {RETURN_QUERY}
+        FROM updated t
+        {CARD_JOIN}
         """
         values: Tuple[Any, ...] = (technician_id, *data.values())
         updated_technician: Optional[Record] = await self.db.fetchone(query, *values)
@@ -166,7 +237,7 @@ class TechnicianRepository:
 
     async def readone_by_email(self, email: str) -> Optional[TechnicianInDB]:
         """Read one technician from the database using their email"""
-        query: str = f"SELECT {RETURN_QUERY} FROM technician t WHERE t.email = $1"
+        query: str = f"SELECT {RETURN_QUERY} FROM technician t {CARD_JOIN} WHERE t.email = $1"
         technician_record: Optional[Record] = await self.db.fetchone(query, email)
         return (
             record_to_technician(technician_record)
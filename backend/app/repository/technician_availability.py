@@ -59,6 +59,36 @@ class TechnicianAvailabilityRepository:
             else None
         )
 
+    async def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Create or replace many availability slots in one statement, returns the slots written.
+        A technician has one slot per day, so an existing slot for the day is overwritten,
+        and of several slots for the same day in `rows` the last one wins.
+        """
+        slots: Dict[Tuple[UUID, int], Tuple[Any, Any]] = {
+            (row["technician_id"], row["timeslot"]["day"]): (
+                row["timeslot"]["start_time"],
+                row["timeslot"]["end_time"],
+            )
+            for row in rows
+        }
+        if not slots:
+            return 0
+        query: str = """
+        INSERT INTO technician_availability (technician_id, day, start_time, end_time)
+        SELECT * FROM unnest($1::uuid[], $2::smallint[], $3::time[], $4::time[])
+        ON CONFLICT (technician_id, day)
+        DO UPDATE SET start_time = EXCLUDED.start_time, end_time = EXCLUDED.end_time, active = TRUE
+        """
+        result: str = await self.db.execute(
+            query,
+            [technician_id for technician_id, _ in slots],
+            [day for _, day in slots],
+            [start_time for start_time, _ in slots.values()],
+            [end_time for _, end_time in slots.values()],
+        )
+        return int(result.split()[-1])
+
     async def readone(
         self, technician_availability_id: UUID
     ) -> Optional[TechnicianAvailabilityInDB]:
@@ -157,7 +187,7 @@ class TechnicianAvailabilityRepository:
 
         query: str = f"""
         SELECT * FROM technician_availability
-        {"WHERE" + " AND ".join(filters) if filters else ""}
+        {"WHERE " + " AND ".join(filters) if filters else ""}
         OFFSET ${len(params) + 1}
         LIMIT ${len(params) + 2}
         """
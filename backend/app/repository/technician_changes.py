@@ -0,0 +1,34 @@
+import json
+from uuid import UUID
+from loguru import logger
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# NOTIFYed by the trg_technician_changed* triggers, see jobconnectdb.sql
+CHANNEL: str = "technician_changed"
+
+
+class TechnicianChange(NamedTuple):
+    """The technicians a notification is about and their old and new points (longitude, latitude)"""
+
+    ids: List[UUID]
+    points: List[Tuple[float, float]]
+
+
+def parse_technician_change(payload: Optional[str]) -> Optional[TechnicianChange]:
+    """
+    The change a technician_changed payload describes, None when it means that anything may
+    have changed: a bulk insert, a malformed payload or a reconnect of the LISTEN connection.
+    """
+    if not payload:
+        return None
+    try:
+        change: Dict[str, Any] = json.loads(payload)
+        if not change.get("ids"):
+            return None
+        return TechnicianChange(
+            [UUID(i) for i in change["ids"] if i is not None],
+            [(p[0], p[1]) for p in change.get("points") or [] if p is not None],
+        )
+    except (ValueError, TypeError, IndexError) as e:
+        logger.error(f"Bad {CHANNEL} payload {payload!r}: {e}")
+        return None
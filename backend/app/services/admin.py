@@ -1,6 +1,6 @@
 from uuid import UUID
-from typing import List, Optional, Dict, Any
-from app.models import AdminInDB, AdminCreate, AdminUpdate, AdminResponse
+from typing import List, Optional, Dict, Any, Tuple
+from app.models import AdminInDB, AdminCreate, AdminUpdate, AdminResponse, UserCredentials
 from app.models.enums import AdminRole, UserRole
 from app.repository import AdminRepository
 from app.utils.security import SecurityUtils
@@ -10,6 +10,7 @@ from app.utils.exceptions import (
     InternalServerException,
     UnauthorizedException,
 )
+from .user_cache import UserCache
 
 
 def admin_in_db_to_response(admin: AdminInDB) -> AdminResponse:
@@ -18,14 +19,15 @@ def admin_in_db_to_response(admin: AdminInDB) -> AdminResponse:
 
 
 class AdminService:
-    def __init__(self, repo: AdminRepository) -> None:
+    def __init__(self, repo: AdminRepository, users: Optional[UserCache] = None) -> None:
         self.repo = repo
+        self.users = users
 
     async def create_admin(self, data: AdminCreate) -> AdminResponse:
         exists, message = await self.repo.exists(data.email, data.phone)
         if exists:
             raise ConflictException(message)
-        hashed_password: str = SecurityUtils.hash_password(data.password)
+        hashed_password: str = await SecurityUtils.hash_password_async(data.password)
         admin: Optional[AdminInDB] = await self.repo.create(
             {
                 "hashed_password": hashed_password,
@@ -39,6 +41,11 @@ class AdminService:
 
     async def readone_admin(self, admin_id: UUID) -> AdminResponse:
         """Read one admin from the database, if no admin is found NotFoundException will be raised"""
+        if self.users is None:
+            return await self._readone_admin(admin_id)
+        return await self.users.get(admin_id, lambda: self._readone_admin(admin_id))
+
+    async def _readone_admin(self, admin_id: UUID) -> AdminResponse:
         admin: Optional[AdminInDB] = await self.repo.readone(admin_id)
         if admin is None:
             raise NotFoundException(f"Admin with id '{admin_id}' not found")
@@ -67,12 +74,14 @@ class AdminService:
             return admin_in_db_to_response(admin)
 
         if "password" in update_data:
-            hashed_password: str = SecurityUtils.hash_password(
+            hashed_password: str = await SecurityUtils.hash_password_async(
                 update_data.pop("password")
             )
             update_data["hashed_password"] = hashed_password
 
         admin = await self.repo.update(admin_id, update_data)
+        if self.users is not None:
+            self.users.invalidate(admin_id)
 
         if admin is None:
             raise InternalServerException("Failed to update admin")
@@ -81,7 +90,10 @@ class AdminService:
 
     async def delete_admin(self, admin_id: UUID) -> bool:
         """Delete an existing admin"""
-        return await self.repo.delete(admin_id)
+        deleted: bool = await self.repo.delete(admin_id)
+        if self.users is not None:
+            self.users.invalidate(admin_id)
+        return deleted
 
     async def readone_admin_by_email(self, email: str) -> AdminResponse:
         admin: Optional[AdminInDB] = await self.repo.readone_by_email(email)
@@ -115,15 +127,29 @@ class AdminService:
         if role == UserRole.ADMIN and admin.role != AdminRole.SUPER_ADMIN:
             raise UnauthorizedException(f"Only super admin can set admin active status")
 
-        return await self.repo.set_user_active_status(
+        updated: bool = await self.repo.set_user_active_status(
             user_id, role.value.lower(), status
         )
+        if self.users is not None:
+            self.users.invalidate(user_id)
+        return updated
+
+    async def read_access(self, admin_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the admin, None once deleted"""
+        return await self.repo.read_access(admin_id)
+
+    async def verify_credentials(self, email: str, password: str) -> Optional[UserCredentials]:
+        """The credentials of the admin with this email, None unless the password matches"""
+        credentials: Optional[UserCredentials] = await self.repo.read_credentials(email)
+        if credentials is None:
+            return None
+        if not await SecurityUtils.verify_password_async(password, credentials.hashed_password):
+            return None
+        return credentials
 
     async def authenticate(self, email: str, password: str) -> Optional[AdminResponse]:
         """Authenticate an admin"""
-        admin: Optional[AdminInDB] = await self.repo.readone_by_email(email)
-        if admin is None:
-            return None
-        if not SecurityUtils.verify_password(password, admin.hashed_password):
+        credentials: Optional[UserCredentials] = await self.verify_credentials(email, password)
+        if credentials is None:
             return None
-        return admin_in_db_to_response(admin)
+        return await self.readone_admin(credentials.id)
@@ -6,11 +6,14 @@ from jose import JWTError
 from app.models import (
     Token,
     TokenData,
+    Identity,
+    UserCredentials,
     AdminResponse,
     ClientResponse,
     TechnicianResponse,
 )
 from app.models.enums import UserRole
+from app.repository import AccessRevocations
 from app.utils.security import SecurityUtils
 from app.utils.exceptions import UnauthorizedException
 from app.core import settings
@@ -24,7 +27,9 @@ User = Union[AdminResponse, ClientResponse, TechnicianResponse]
 
 class AuthService:
     def __init__(
-        self, services: Tuple[AdminService, ClientService, TechnicianService]
+        self,
+        services: Tuple[AdminService, ClientService, TechnicianService],
+        revocations: Optional[AccessRevocations] = None,
     ) -> None:
         self._admin_service: AdminService = services[0]
         self._client_service: ClientService = services[1]
@@ -37,6 +42,7 @@ class AuthService:
             UserRole.CLIENT: self._client_service,
             UserRole.TECHNICIAN: self._technician_service,
         }
+        self._revocations: Optional[AccessRevocations] = revocations
 
     async def authenticate(self, email: str, password: str, role: UserRole) -> Token:
         """
@@ -48,49 +54,92 @@ class AuthService:
         if not service:
             raise UnauthorizedException("Invalid role")
 
-        user: Optional[User] = await service.authenticate(email, password)  # type: ignore[attr-defined]
-        if user is None:
+        credentials: Optional[UserCredentials] = await service.verify_credentials(email, password)
+        if credentials is None:
             raise UnauthorizedException("Invalid credentials")
 
-        token_data: TokenData = TokenData(email=user.email, user_id=user.id, user_role=role)
+        token_data: TokenData = TokenData(
+            email=credentials.email,
+            user_id=credentials.id,
+            user_role=role,
+            is_active=credentials.is_active,
+            token_version=credentials.token_version,
+        )
         access_token: str = SecurityUtils.create_access_token(
             data=token_data,
             expires_delta=timedelta(minutes=settings.TOKEN_EXPIRE_MINUTES),
         )
         return Token(access_token=access_token, token_type="bearer")
 
-    async def get_current_user(self, token: str) -> Dict[str, Union[User, UserRole]]:
-        """
-        Decode token and retrieve the current user from the appropriate service.
-        """
+    def _claims(self, token: str) -> Tuple[UUID, str, UserRole, TokenData]:
+        """The verified user id, email and role of a token"""
         try:
             payload: TokenData = SecurityUtils.decode_token(token)
-            email: Optional[str] = payload.email
-            user_id: Optional[UUID] = payload.user_id
-            role: Optional[UserRole] = payload.user_role
-
-            if (email is None) or (user_id is None) or (role is None):
-                raise UnauthorizedException("Could not validate credentials")
         except JWTError:
             raise UnauthorizedException("Could not validate credentials")
+        if (payload.email is None) or (payload.user_id is None) or (payload.user_role is None):
+            raise UnauthorizedException("Could not validate credentials")
+        return payload.user_id, payload.email, payload.user_role, payload
 
+    async def _read_user(self, user_id: UUID, role: UserRole) -> User:
         service: Optional[Union[AdminService, ClientService, TechnicianService]] = (
             self._services.get(role)
         )
         if not service:
             raise UnauthorizedException("Invalid token role")
 
-        response: Dict[str, Union[User, UserRole]] = {"user_role": role}
-
+        user: Optional[User] = None
         match role:
             case UserRole.ADMIN:
-                response["user"] = await service.readone_admin(user_id)  # type: ignore[attr-defined]
+                user = await service.readone_admin(user_id)  # type: ignore[attr-defined]
             case UserRole.CLIENT:
-                response["user"] = await service.readone_client(user_id)  # type: ignore[attr-defined]
+                user = await service.readone_client(user_id)  # type: ignore[attr-defined]
             case UserRole.TECHNICIAN:
-                response["user"] = await service.readone_technician(user_id)  # type: ignore[attr-defined]
+                user = await service.readone_technician(user_id)  # type: ignore[attr-defined]
 
-        if response.get("user") is None:
+        if user is None:
             raise UnauthorizedException("Invalid token")
+        return user
+
+    async def get_current_user(self, token: str) -> Dict[str, Union[User, UserRole]]:
+        """
+        Decode token and retrieve the current user from the appropriate service.
+        """
+        user_id, _, role, _ = self._claims(token)
+        return {"user_role": role, "user": await self._read_user(user_id, role)}
 
-        return response
+    async def identify(self, token: str) -> Identity:
+        """
+        The user a token was issued to, from its claims, unless the user was deactivated or
+        deleted after the token was issued. With AUTH_STATELESS_IDENTITY the revocation set
+        answers that; otherwise, or while the set is not loaded, the user's active flag and
+        token version are read. Both give the same answer for the same token.
+        """
+        user_id, email, role, payload = self._claims(token)
+        token_version: int = payload.token_version or 0
+        if payload.is_active is False:
+            raise UnauthorizedException("Token has been revoked")
+        if (
+            settings.AUTH_STATELESS_IDENTITY
+            and self._revocations is not None
+            and self._revocations.ready
+        ):
+            revoked: bool = self._revocations.is_revoked(user_id, token_version)
+        else:
+            revoked = await self._is_revoked(user_id, role, token_version)
+        if revoked:
+            raise UnauthorizedException("Token has been revoked")
+        return Identity(user_id=user_id, email=email, user_role=role)
+
+    async def _is_revoked(self, user_id: UUID, role: UserRole, token_version: int) -> bool:
+        """Whether the user is gone, inactive or (de)activated since the token was issued"""
+        service: Optional[Union[AdminService, ClientService, TechnicianService]] = (
+            self._services.get(role)
+        )
+        if not service:
+            raise UnauthorizedException("Invalid token role")
+        access: Optional[Tuple[bool, int]] = await service.read_access(user_id)
+        if access is None:
+            return True
+        active, version = access
+        return not active or token_version < version
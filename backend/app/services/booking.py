@@ -1,9 +1,10 @@
 from uuid import UUID
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple, AsyncIterator
 from datetime import date
 from app.models import BookingInDB, BookingCreate, BookingUpdate, BookingResponse
 from app.models.enums import BookingStatus
 from app.repository import BookingRepository
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import (
     NotFoundException,
     ConflictException,
@@ -57,8 +58,9 @@ class BookingService:
         booking_date: Optional[date] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[BookingResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[BookingResponse], Optional[str]]:
+        """Returns one page of bookings and the cursor of the next page"""
         bookings: List[BookingInDB] = await self.repo.readall(
             client_id,
             technician_id,
@@ -66,8 +68,25 @@ class BookingService:
             booking_date,
             skip,
             limit,
+            decode_created_cursor(cursor),
+        )
+        return (
+            [booking_in_db_to_response(booking) for booking in bookings],
+            next_created_cursor(bookings, limit),
         )
-        return [booking_in_db_to_response(booking) for booking in bookings]
+
+    async def stream_bookings(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        status: Optional[BookingStatus] = None,
+        booking_date: Optional[date] = None,
+    ) -> AsyncIterator[BookingResponse]:
+        """Stream every matching booking without loading them all into memory"""
+        async for booking in self.repo.stream(
+            client_id, technician_id, status, booking_date
+        ):
+            yield booking_in_db_to_response(booking)
 
     async def update_booking(
         self, booking_id: UUID, data: BookingUpdate
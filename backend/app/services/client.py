@@ -1,13 +1,16 @@
+import asyncio
 from uuid import UUID
-from typing import Any, Dict, List, Optional
-from app.models import ClientInDB, ClientCreate, ClientResponse, ClientUpdate, FavoriteTechnicianCreate, TechnicianResponse, TechnicianInDB
+from typing import Any, Dict, List, Optional, Tuple
+from app.models import ClientInDB, ClientCreate, ClientResponse, ClientUpdate, FavoriteTechnicianCreate, TechnicianResponse, TechnicianInDB, UserCredentials
 from app.repository import ClientRepository
 from app.utils.security import SecurityUtils
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import (
     NotFoundException,
     ConflictException,
     InternalServerException,
 )
+from .user_cache import UserCache
 from .technician import technician_in_db_to_response
 
 
@@ -17,15 +20,16 @@ def client_in_db_to_response(client: ClientInDB) -> ClientResponse:
 
 
 class ClientService:
-    def __init__(self, repo: ClientRepository) -> None:
+    def __init__(self, repo: ClientRepository, users: Optional[UserCache] = None) -> None:
         self.repo = repo
+        self.users = users
 
     async def create_client(self, data: ClientCreate) -> ClientResponse:
         """"""
         exists, message = await self.repo.exists(data.email, data.phone)
         if exists:
             raise ConflictException(message)
-        hashed_password: str = SecurityUtils.hash_password(data.password)
+        hashed_password: str = await SecurityUtils.hash_password_async(data.password)
         client: Optional[ClientInDB] = await self.repo.create(
             {
                 "hashed_password": hashed_password,
@@ -36,8 +40,28 @@ class ClientService:
             raise InternalServerException("Error creating client")
         return client_in_db_to_response(client)
 
+    async def create_clients(self, data: List[ClientCreate]) -> int:
+        """Create many clients at once, returns the number created"""
+        hashed_passwords: List[str] = await asyncio.gather(
+            *(SecurityUtils.hash_password_async(client.password) for client in data)
+        )
+        return await self.repo.create_many(
+            [
+                {
+                    "hashed_password": hashed_password,
+                    **client.model_dump(exclude={"password"}),
+                }
+                for client, hashed_password in zip(data, hashed_passwords)
+            ]
+        )
+
     async def readone_client(self, client_id: UUID) -> ClientResponse:
         """"""
+        if self.users is None:
+            return await self._readone_client(client_id)
+        return await self.users.get(client_id, lambda: self._readone_client(client_id))
+
+    async def _readone_client(self, client_id: UUID) -> ClientResponse:
         client: Optional[ClientInDB] = await self.repo.readone(client_id)
         if client is None:
             raise NotFoundException(f"Client with id '{client_id}' not found")
@@ -48,10 +72,16 @@ class ClientService:
         active: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[ClientResponse]:
-        """"""
-        clients: List[ClientInDB] = await self.repo.readall(active, skip, limit)
-        return [client_in_db_to_response(client) for client in clients]
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ClientResponse], Optional[str]]:
+        """Returns one page of clients and the cursor of the next page"""
+        clients: List[ClientInDB] = await self.repo.readall(
+            active, skip, limit, decode_created_cursor(cursor)
+        )
+        return (
+            [client_in_db_to_response(client) for client in clients],
+            next_created_cursor(clients, limit),
+        )
 
     async def update_client(
         self, client_id: UUID, data: ClientUpdate
@@ -66,7 +96,7 @@ class ClientService:
             return client_in_db_to_response(client)
 
         if "password" in update_data:
-            hashed_password: str = SecurityUtils.hash_password(
+            hashed_password: str = await SecurityUtils.hash_password_async(
                 update_data.pop("password")
             )
             update_data["hashed_password"] = hashed_password
@@ -80,13 +110,18 @@ class ClientService:
             update_data.pop("location")
 
         client: Optional[ClientInDB] = await self.repo.update(client_id, update_data)
+        if self.users is not None:
+            self.users.invalidate(client_id)
         if client is None:
             raise InternalServerException("Error updating client")
         return client_in_db_to_response(client)
 
     async def delete_client(self, client_id: UUID) -> bool:
         """"""
-        return await self.repo.delete(client_id)
+        deleted: bool = await self.repo.delete(client_id)
+        if self.users is not None:
+            self.users.invalidate(client_id)
+        return deleted
 
     async def readone_client_by_email(self, email: str) -> ClientResponse:
         """"""
@@ -112,14 +147,25 @@ class ClientService:
         """"""
         return await self.repo.remove_favorite_technician(data.client_id, data.technician_id)
 
+    async def read_access(self, client_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the client, None once deleted"""
+        return await self.repo.read_access(client_id)
+
+    async def verify_credentials(self, email: str, password: str) -> Optional[UserCredentials]:
+        """The credentials of the client with this email, None unless the password matches"""
+        credentials: Optional[UserCredentials] = await self.repo.read_credentials(email)
+        if credentials is None:
+            return None
+        if not await SecurityUtils.verify_password_async(password, credentials.hashed_password):
+            return None
+        return credentials
+
     async def authenticate(self, email: str, password: str) -> Optional[ClientResponse]:
         """"""
-        client: Optional[ClientInDB] = await self.repo.readone_by_email(email)
-        if client is None:
-            return None
-        if not SecurityUtils.verify_password(password, client.hashed_password):
+        credentials: Optional[UserCredentials] = await self.verify_credentials(email, password)
+        if credentials is None:
             return None
-        return client_in_db_to_response(client)
+        return await self.readone_client(credentials.id)
     
     async def readall_favorite_technicians(self, client_id: UUID) -> List[TechnicianResponse]:
         """"""
@@ -1,7 +1,8 @@
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from app.models import NotificationInDB, NotificationResponse, NotificationCreate
 from app.repository import NotificationRepository
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import NotFoundException, InternalServerException
 
 
@@ -36,16 +37,23 @@ class NotificationService:
         return self.notification_in_db_to_response(notification)
 
     async def readall_notifications(
-        self, read: Optional[bool] = None, skip: int = 0, limit: int = 100
-    ) -> List[NotificationResponse]:
-        """"""
+        self,
+        read: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[NotificationResponse], Optional[str]]:
+        """Returns one page of notifications and the cursor of the next page"""
         notifications: List[NotificationInDB] = await self.repo.readall(
-            read, skip, limit
+            read, skip, limit, decode_created_cursor(cursor)
+        )
+        return (
+            [
+                self.notification_in_db_to_response(notification)
+                for notification in notifications
+            ],
+            next_created_cursor(notifications, limit),
         )
-        return [
-            self.notification_in_db_to_response(notification)
-            for notification in notifications
-        ]
 
     async def delete_notification(self, notification_id: UUID) -> bool:
         """"""
@@ -57,15 +65,19 @@ class NotificationService:
         read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[NotificationResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[NotificationResponse], Optional[str]]:
+        """Returns one page of the client's notifications and the cursor of the next page"""
         notifications: List[NotificationInDB] = await self.repo.readall_by_client_id(
-            client_id, read, skip, limit
+            client_id, read, skip, limit, decode_created_cursor(cursor)
+        )
+        return (
+            [
+                self.notification_in_db_to_response(notification)
+                for notification in notifications
+            ],
+            next_created_cursor(notifications, limit),
         )
-        return [
-            self.notification_in_db_to_response(notification)
-            for notification in notifications
-        ]
 
     async def readall_notifications_by_techniian_id(
         self,
@@ -73,15 +85,21 @@ class NotificationService:
         read: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[NotificationResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[NotificationResponse], Optional[str]]:
+        """Returns one page of the technician's notifications and the cursor of the next page"""
         notifications: List[
             NotificationInDB
-        ] = await self.repo.readall_by_technician_id(technician_id, read, skip, limit)
-        return [
-            self.notification_in_db_to_response(notification)
-            for notification in notifications
-        ]
+        ] = await self.repo.readall_by_technician_id(
+            technician_id, read, skip, limit, decode_created_cursor(cursor)
+        )
+        return (
+            [
+                self.notification_in_db_to_response(notification)
+                for notification in notifications
+            ],
+            next_created_cursor(notifications, limit),
+        )
     
     async def mark_as_read(self, notification_id: UUID) -> None:
         """"""
@@ -1,8 +1,9 @@
 from uuid import UUID
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple, AsyncIterator
 from app.models import PaymentInDB, PaymentCreate, PaymentResponse, PaymentUpdate
 from app.models.enums import PaymentStatus
 from app.repository import PaymentRepository
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import (
     NotFoundException,
     ConflictException,
@@ -43,12 +44,37 @@ class PaymentService:
         status: Optional[PaymentStatus] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[PaymentResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[PaymentResponse], Optional[str]]:
+        """Returns one page of payments and the cursor of the next page"""
         payments: List[PaymentInDB] = await self.repo.readall_payments(
-            client_id, technician_id, min_amount, max_amount, status, skip, limit
+            client_id,
+            technician_id,
+            min_amount,
+            max_amount,
+            status,
+            skip,
+            limit,
+            decode_created_cursor(cursor),
+        )
+        return (
+            [self.payment_in_db_to_response(p) for p in payments],
+            next_created_cursor(payments, limit),
         )
-        return [self.payment_in_db_to_response(p) for p in payments]
+
+    async def stream_payments(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        status: Optional[PaymentStatus] = None,
+    ) -> AsyncIterator[PaymentResponse]:
+        """Stream every matching payment without loading them all into memory"""
+        async for payment in self.repo.stream(
+            client_id, technician_id, min_amount, max_amount, status
+        ):
+            yield self.payment_in_db_to_response(payment)
 
     async def update_payment(
         self, payment_id: UUID, data: PaymentUpdate
@@ -0,0 +1,460 @@
+import time
+import asyncio
+from math import log1p
+from uuid import UUID
+from loguru import logger
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from app.database import AsyncDatabase
+from app.repository.technician_changes import (
+    CHANNEL as TECHNICIAN_CHANNEL,
+    TechnicianChange,
+    parse_technician_change,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional, installed with the `geo` extra
+    np = None  # type: ignore
+
+# NOTIFYed with a technician id when its rating, verification, prices or bookings change,
+# see trg_technician_features_* in jobconnectdb.sql
+CHANNEL: str = "technician_features_changed"
+
+# A technician's rating is pulled towards PRIOR_RATING as if it had PRIOR_REVIEWS more reviews
+PRIOR_RATING: float = 3.5
+PRIOR_REVIEWS: float = 5.0
+# Review counts and experience years score 1 from these on
+REVIEW_SATURATION: int = 200
+EXPERIENCE_SATURATION: float = 15.0
+# Added to prices before comparing them, so a free service does not zero every other price
+PRICE_SMOOTHING: float = 1.0
+# Activity recency is measured in whole hours, so a page and the next score alike
+RECENCY_RESOLUTION_SECONDS: float = 3600.0
+
+# (id, rating_sum, rating_count, is_verified, lowest price, most experience years, idle seconds)
+FeatureRow = Tuple[UUID, int, int, bool, Optional[float], int, float]
+
+
+class RankingWeights(NamedTuple):
+    """How much each feature, scored between 0 and 1, adds to a technician's score"""
+
+    distance: float
+    rating: float
+    reviews: float
+    verified: float
+    price: float
+    experience: float
+    recency: float
+    relevance: float
+
+
+class FeatureStore:
+    """
+    The ranking features of every active technician in NumPy arrays, one row per technician.
+
+    Rating, review count, verification and experience are stored already scored between 0 and
+    1; the lowest service price and the time of the last activity (its last booking, or when it
+    joined) are stored raw, since they are scored against the other candidates and the clock.
+    Built at startup and kept current like the NumPy search index: the rows of the technicians
+    named in a technician_changed or technician_features_changed notification are re-read.
+    """
+
+    def __init__(self, db: AsyncDatabase) -> None:
+        if np is None:
+            raise RuntimeError("RANKING_ENABLED needs numpy, install the `geo` extra")
+        self.db = db
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._ready: bool = False
+        self._stale: bool = False
+        self._pending: Set[UUID] = set()
+        self._sync: Optional[asyncio.Task[None]] = None
+        self.rebuilds: int = 0
+        self.updates: int = 0
+        self.failures: int = 0
+        self.load([])
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def start(self) -> None:
+        """Subscribe to technician changes, then build the store"""
+        await self.db.listen(TECHNICIAN_CHANNEL, self.on_technician_changed)
+        await self.db.listen(CHANNEL, self.on_features_changed)
+        async with self._lock:
+            await self.rebuild()
+
+    async def stop(self) -> None:
+        if self._sync is not None:
+            self._sync.cancel()
+            self._sync = None
+
+    def load(self, rows: Iterable[FeatureRow], now: Optional[float] = None) -> None:
+        """Replace the whole store"""
+        loaded: List[FeatureRow] = list(rows)
+        size: int = len(loaded)
+        capacity: int = max(16, size)
+        columns = list(zip(*loaded)) if loaded else [[] for _ in range(7)]
+        self._row: Dict[UUID, int] = {row[0]: i for i, row in enumerate(loaded)}
+        self._size: int = size
+        # rating, reviews, verified, experience
+        self._scored = np.zeros((capacity, 4), dtype=np.float32)
+        self._scored[:size] = self._score_columns(
+            np.array(columns[1], dtype=np.float64),
+            np.array(columns[2], dtype=np.float64),
+            np.array(columns[3], dtype=bool),
+            np.array(columns[5], dtype=np.float64),
+        )
+        self._price = np.full(capacity, np.nan, dtype=np.float64)
+        self._price[:size] = np.array(
+            [np.nan if price is None else max(0.0, price) for price in columns[4]],
+            dtype=np.float64,
+        )
+        self._active_at = np.zeros(capacity, dtype=np.float64)
+        self._active_at[:size] = (time.time() if now is None else now) - np.maximum(
+            np.array(columns[6], dtype=np.float64), 0.0
+        )
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:size] = True
+        self._free: List[int] = []
+        self._released: List[int] = []
+        self._sort()
+
+    @staticmethod
+    def _score_columns(
+        rating_sum: Any, rating_count: Any, is_verified: Any, experience_years: Any
+    ) -> Any:
+        """The rating, reviews, verified and experience scores, between 0 and 1"""
+        return np.column_stack(
+            [
+                (rating_sum + PRIOR_RATING * PRIOR_REVIEWS) / (rating_count + PRIOR_REVIEWS) / 5,
+                np.minimum(1.0, np.log1p(rating_count) / log1p(REVIEW_SATURATION)),
+                is_verified.astype(np.float64),
+                np.minimum(1.0, np.maximum(experience_years, 0) / EXPERIENCE_SATURATION),
+            ]
+        )
+
+    def _sort(self) -> None:
+        """
+        Snapshot the ids sorted by their two 64 bit halves, so the rows of a batch of
+        candidates are found with one searchsorted instead of hashing every UUID. Ids the
+        snapshot misses are looked up in `_row`; rows released since are only reused after the
+        next snapshot, so the snapshot never points at another technician's row.
+        """
+        words = self._words(list(self._row))
+        order = np.lexsort((words[:, 1], words[:, 0]))
+        self._key_high = words[order, 0]
+        self._key_low = words[order, 1]
+        self._key_rows = np.fromiter(self._row.values(), dtype=np.int64, count=len(self._row))[
+            order
+        ]
+        self._added: int = 0
+        self._free.extend(self._released)
+        self._released = []
+
+    @staticmethod
+    def _words(technician_ids: Sequence[UUID]) -> Any:
+        """The ids as rows of two unsigned 64 bit integers"""
+        return (
+            np.frombuffer(b"".join([i.bytes for i in technician_ids]), dtype=">u8")
+            .astype(np.uint64)
+            .reshape(-1, 2)
+        )
+
+    def _touch(self) -> None:
+        if self._added + len(self._released) > max(1024, len(self._row) // 20):
+            self._sort()
+
+    def upsert(
+        self,
+        technician_id: UUID,
+        rating_sum: int,
+        rating_count: int,
+        is_verified: bool,
+        price: Optional[float],
+        experience_years: int,
+        idle_seconds: float,
+        now: Optional[float] = None,
+    ) -> None:
+        row: Optional[int] = self._row.get(technician_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._grow()
+            self._row[technician_id] = row
+            self._added += 1
+        self._scored[row] = self._score_columns(
+            np.array([rating_sum], dtype=np.float64),
+            np.array([rating_count], dtype=np.float64),
+            np.array([is_verified]),
+            np.array([experience_years], dtype=np.float64),
+        )[0]
+        self._price[row] = np.nan if price is None else max(0.0, price)
+        self._active_at[row] = (time.time() if now is None else now) - max(0.0, idle_seconds)
+        self._alive[row] = True
+        self._touch()
+
+    def remove(self, technician_id: UUID) -> None:
+        row: Optional[int] = self._row.pop(technician_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._released.append(row)
+        self._touch()
+
+    def _grow(self) -> int:
+        """Append one row, doubling the arrays when they are full"""
+        row: int = self._size
+        if row == len(self._price):
+            capacity: int = 2 * row
+            scored = np.zeros((capacity, 4), dtype=np.float32)
+            scored[:row] = self._scored
+            self._scored = scored
+            self._price = np.resize(self._price, capacity)
+            self._active_at = np.resize(self._active_at, capacity)
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:row] = self._alive
+            self._alive = alive
+        self._size += 1
+        return row
+
+    def rows(self, technician_ids: Sequence[UUID]) -> Any:
+        """The row of every technician, -1 for those not in the store"""
+        rows = np.full(len(technician_ids), -1, dtype=np.int64)
+        if len(self._key_rows) and len(technician_ids):
+            words = self._words(technician_ids)
+            at = np.minimum(
+                np.searchsorted(self._key_high, words[:, 0]), len(self._key_rows) - 1
+            )
+            found = (self._key_high[at] == words[:, 0]) & (self._key_low[at] == words[:, 1])
+            rows[found] = self._key_rows[at[found]]
+            rows[found & ~self._alive[np.maximum(rows, 0)]] = -1
+        for i in np.flatnonzero(rows < 0).tolist():
+            # Added since the snapshot, or sharing the first half of its id with another
+            rows[i] = self._row.get(technician_ids[i], -1)
+        return rows
+
+    async def _read(self, technician_ids: Optional[List[UUID]] = None) -> List[FeatureRow]:
+        """The features of the given active technicians, of all of them without ids"""
+        query: str = f"""
+        SELECT
+            t.id,
+            t.rating_sum,
+            t.rating_count,
+            COALESCE(tc.is_verified, FALSE) AS is_verified,
+            offered.price,
+            COALESCE(offered.experience_years, 0) AS experience_years,
+            EXTRACT(EPOCH FROM LOCALTIMESTAMP - GREATEST(t.created_at, last_booking.created_at))::float8
+                AS idle_seconds
+        FROM technician t
+        LEFT JOIN technician_card tc ON tc.technician_id = t.id
+        LEFT JOIN LATERAL (
+            SELECT MIN(ts.price)::float8 AS price, MAX(ts.experience_years) AS experience_years
+            FROM technician_service ts
+            WHERE ts.technician_id = t.id
+        ) offered ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT b.created_at
+            FROM booking b
+            WHERE b.technician_id = t.id
+            ORDER BY b.created_at DESC
+            LIMIT 1
+        ) last_booking ON TRUE
+        WHERE t.is_active = TRUE
+        {"AND t.id = ANY($1::uuid[])" if technician_ids is not None else ""}
+        """
+        args: List[Any] = [technician_ids] if technician_ids is not None else []
+        return [
+            (
+                r["id"],
+                r["rating_sum"],
+                r["rating_count"],
+                r["is_verified"],
+                r["price"],
+                r["experience_years"],
+                r["idle_seconds"],
+            )
+            async for r in self.db.fetch_iter(query, *args)
+        ]
+
+    async def rebuild(self) -> None:
+        rows: List[FeatureRow] = await self._read()
+        self.load(rows)
+        self._ready = True
+        self.rebuilds += 1
+        logger.info(f"Ranking features loaded for {len(rows)} technicians")
+
+    async def refresh(self, technician_ids: List[UUID]) -> None:
+        """Re-read some technicians, dropping those that are gone or no longer active"""
+        rows: List[FeatureRow] = await self._read(technician_ids)
+        for row in rows:
+            self.upsert(*row)
+        for technician_id in set(technician_ids) - {row[0] for row in rows}:
+            self.remove(technician_id)
+        self.updates += len(technician_ids)
+
+    def on_technician_changed(self, payload: Optional[str]) -> None:
+        change: Optional[TechnicianChange] = parse_technician_change(payload)
+        if change is None:
+            self._stale = True
+        else:
+            self._pending.update(change.ids)
+        self._schedule()
+
+    def on_features_changed(self, payload: Optional[str]) -> None:
+        try:
+            self._pending.add(UUID(payload or ""))
+        except ValueError:
+            self._stale = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._sync is None or self._sync.done():
+            self._sync = asyncio.create_task(self._apply_changes())
+
+    async def _apply_changes(self, delay: float = 1.0) -> None:
+        """
+        Drain the pending changes, re-reading rows from the primary so no write is missed.
+        A failed read leaves the store behind the database, so it stops being ready (searches
+        order by distance) and is rebuilt with backoff until a rebuild succeeds.
+        """
+        async with self._lock:
+            while self._stale or self._pending:
+                try:
+                    if self._stale:
+                        self._stale = False
+                        self._pending.clear()
+                        await self.rebuild()
+                    else:
+                        technician_ids: List[UUID] = list(self._pending)
+                        self._pending.clear()
+                        await self.refresh(technician_ids)
+                except Exception as e:
+                    self._stale = True
+                    self._ready = False
+                    self.failures += 1
+                    logger.error(
+                        f"Failed to update the ranking features, retrying in {delay:.0f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self._ready,
+            "technicians": len(self._row),
+            "rebuilds": self.rebuilds,
+            "updates": self.updates,
+            "failures": self.failures,
+        }
+
+
+class Ranker:
+    """
+    Orders search candidates by a weighted sum of their features instead of by distance.
+
+    Distance scores 1 at the client and 0 at the edge of the radius, price scores 1 for the
+    cheapest candidate and less the dearer a technician is, and activity halves in score every
+    `recency_half_life_days`. Technicians missing from the store score like a new technician.
+    """
+
+    def __init__(
+        self,
+        store: FeatureStore,
+        weights: RankingWeights,
+        max_candidates: int = 5000,
+        recency_half_life_days: float = 30.0,
+    ) -> None:
+        self.store = store
+        self.weights = weights
+        self.max_candidates = max_candidates
+        self.recency_half_life: float = recency_half_life_days * 86400
+        self._scored_weights = np.array(
+            [weights.rating, weights.reviews, weights.verified, weights.experience],
+            dtype=np.float32,
+        )
+        self._new_technician: float = weights.rating * PRIOR_RATING / 5
+        self.queries: int = 0
+
+    def score(
+        self,
+        technician_ids: Sequence[UUID],
+        distances: Sequence[float],
+        radius_meters: float,
+        relevance: Optional[Sequence[float]] = None,
+        now: Optional[float] = None,
+    ) -> Any:
+        """The score of every candidate, higher is better"""
+        store: FeatureStore = self.store
+        rows = store.rows(technician_ids)
+        known = rows >= 0
+        rows = np.where(known, rows, 0)
+        scores = np.where(
+            known,
+            (store._scored[rows] @ self._scored_weights).astype(np.float64),
+            self._new_technician,
+        )
+        scores += self.weights.distance * (
+            1 - np.minimum(np.asarray(distances, dtype=np.float64) / max(radius_meters, 1.0), 1.0)
+        )
+        prices = np.where(known, store._price[rows], np.nan)
+        offered = ~np.isnan(prices)
+        if offered.any():
+            cheapest: float = float(prices[offered].min())
+            scores[offered] += self.weights.price * (
+                (cheapest + PRICE_SMOOTHING) / (prices[offered] + PRICE_SMOOTHING)
+            )
+        if now is None:
+            now = time.time() // RECENCY_RESOLUTION_SECONDS * RECENCY_RESOLUTION_SECONDS
+        idle = np.maximum(now - store._active_at[rows], 0.0)
+        scores += np.where(
+            known, self.weights.recency * 0.5 ** (idle / self.recency_half_life), 0.0
+        )
+        if relevance is not None:
+            scores += self.weights.relevance * np.asarray(relevance, dtype=np.float64)
+        return scores
+
+    def rank(
+        self,
+        candidates: Sequence[Tuple[float, UUID]],
+        radius_meters: float,
+        relevance: Optional[Sequence[float]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[Tuple[float, float, UUID]]:
+        """
+        One page of (score, distance in meters, id) out of (distance, id) candidates, best
+        first and ties by id. `after` continues from the (score, id) of the previous page.
+        """
+        if not candidates:
+            return []
+        self.queries += 1
+        distances, technician_ids = zip(*candidates)
+        scores = self.score(technician_ids, distances, radius_meters, relevance)
+        indexes = np.arange(len(candidates))
+        if after is not None:
+            below = scores < after[0]
+            ties = np.flatnonzero(scores == after[0])
+            below[[i for i in ties.tolist() if technician_ids[i] > after[1]]] = True
+            indexes = indexes[below]
+            skip = 0
+        wanted: int = skip + limit
+        if len(indexes) > wanted:
+            # Only the best `wanted` need sorting, plus whatever ties the last of them
+            kth: float = -np.partition(-scores[indexes], wanted - 1)[wanted - 1]
+            indexes = indexes[scores[indexes] >= kth]
+        ranked: List[Tuple[float, float, UUID]] = sorted(
+            (
+                (score, distances[i], technician_ids[i])
+                for score, i in zip(scores[indexes].tolist(), indexes.tolist())
+            ),
+            key=lambda row: (-row[0], row[2]),
+        )
+        return ranked[skip : skip + limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.store.stats(),
+            "weights": self.weights._asdict(),
+            "max_candidates": self.max_candidates,
+            "queries": self.queries,
+        }
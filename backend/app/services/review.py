@@ -1,7 +1,8 @@
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Tuple, AsyncIterator
 from app.models import ReviewInDB, ReviewCreate, ReviewUpdate, ReviewResponse
 from app.repository import ReviewRepository
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import (
     NotFoundException,
     InternalServerException,
@@ -41,12 +42,31 @@ class ReviewService:
         min_rating: Optional[int] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[ReviewResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ReviewResponse], Optional[str]]:
+        """Returns one page of reviews and the cursor of the next page"""
         reviews: List[ReviewInDB] = await self.repo.readall(
-            client_id, technician_id, min_rating, skip, limit
+            client_id,
+            technician_id,
+            min_rating,
+            skip,
+            limit,
+            decode_created_cursor(cursor),
+        )
+        return (
+            [review_in_db_to_response(review) for review in reviews],
+            next_created_cursor(reviews, limit),
         )
-        return [review_in_db_to_response(review) for review in reviews]
+
+    async def stream_reviews(
+        self,
+        client_id: Optional[UUID] = None,
+        technician_id: Optional[UUID] = None,
+        min_rating: Optional[int] = None,
+    ) -> AsyncIterator[ReviewResponse]:
+        """Stream every matching review without loading them all into memory"""
+        async for review in self.repo.stream(client_id, technician_id, min_rating):
+            yield review_in_db_to_response(review)
 
     async def update_review(
         self, review_id: UUID, data: ReviewUpdate
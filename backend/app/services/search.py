@@ -1,16 +1,48 @@
 from uuid import UUID
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Hashable, Optional, List, Tuple, TypeVar
 from app.models import TechnicianInDB, TechnicianResponse
-from app.models.base import Location
+from app.models.base import Location, TimeSlot
 from app.repository import SearchRepository
-from app.utils.exceptions import NotImplementedException
+from app.utils.exceptions import BadRequestException, NotImplementedException
+from app.utils.pagination import encode_cursor, decode_cursor
 
 from .technician import technician_in_db_to_response
+from .search_engine import SearchEngine, PostGISSearchEngine
+from .ranking import Ranker
+from .search_results import SearchResultCache
+
+T = TypeVar("T")
 
 
 class SearchService:
-    def __init__(self, repo: SearchRepository) -> None:
+    def __init__(
+        self,
+        repo: SearchRepository,
+        engine: Optional[SearchEngine] = None,
+        ranker: Optional[Ranker] = None,
+        results: Optional[SearchResultCache] = None,
+    ) -> None:
         self.repo = repo
+        self.engine: SearchEngine = engine or PostGISSearchEngine(repo)
+        self.ranker = ranker
+        self.results = results
+
+    async def shared(
+        self, key: Hashable, search: Callable[[], Awaitable[T]], keep: bool = True
+    ) -> T:
+        """
+        Run `search` once for every concurrent identical search, through the result cache
+        unless `keep` is False
+        """
+        if self.results is None:
+            return await search()
+        if not keep:
+            return await self.results.coalesce(key, search)
+        return await self.results.get(key, search)
+
+    def can_rank(self) -> bool:
+        """Ranked searches are served nearest first until the ranking features are loaded"""
+        return self.ranker is not None and self.ranker.store.ready
 
     async def search_nearby_technicians(
         self,
@@ -19,12 +51,164 @@ class SearchService:
         service_names: Optional[List[str]] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[TechnicianResponse]:
-        """"""
-        technicians: List[TechnicianInDB] = await self.repo.search_nearby_technicians(
-            client_id, abs(radius_km), service_names, skip, limit
+        cursor: Optional[str] = None,
+        ranked: bool = False,
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """
+        Returns one page of technicians, nearest first or best ranked first when `ranked`,
+        and the cursor of the next page
+        """
+        key: Tuple[Any, ...] = (
+            "nearby",
+            client_id,
+            abs(radius_km),
+            tuple(service_names or ()),
+            skip,
+            limit,
+            cursor,
+            ranked,
+        )
+        return await self.shared(
+            key,
+            lambda: self.nearby_page(
+                client_id, abs(radius_km), service_names, skip, limit, cursor, ranked
+            ),
+        )
+
+    async def nearby_page(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+        ranked: bool,
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """One page of `search_nearby_technicians`, read from the search engine"""
+        if ranked and self.can_rank():
+            return await self.search_ranked_technicians(
+                client_id, radius_km, service_names, skip, limit, cursor
+            )
+        technicians: List[
+            Tuple[TechnicianInDB, float]
+        ] = await self.engine.search_nearby(
+            client_id,
+            radius_km,
+            service_names,
+            skip,
+            limit,
+            decode_cursor(cursor, float, UUID) if cursor else None,
+        )
+        return self.nearest_page(technicians, limit)
+
+    async def search_available_technicians(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        slot: TimeSlot,
+        service_names: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """Like `search_nearby_technicians`, keeping only the technicians free for the whole slot"""
+        if slot.start_time >= slot.end_time:
+            raise BadRequestException("start_time must be before end_time")
+        key: Tuple[Any, ...] = (
+            "available",
+            client_id,
+            abs(radius_km),
+            slot.slot_date,
+            slot.start_time,
+            slot.end_time,
+            tuple(service_names or ()),
+            skip,
+            limit,
+            cursor,
+        )
+        # Bookings changing status and availability edits are not NOTIFYed, so slot
+        # results are only shared by concurrent searches and never kept
+        return await self.shared(
+            key,
+            lambda: self.available_page(
+                client_id, abs(radius_km), slot, service_names, skip, limit, cursor
+            ),
+            keep=False,
+        )
+
+    async def available_page(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        slot: TimeSlot,
+        service_names: Optional[List[str]],
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """One page of `search_available_technicians`, read from Postgres"""
+        technicians: List[
+            Tuple[TechnicianInDB, float]
+        ] = await self.repo.search_nearby_technicians(
+            client_id,
+            radius_km,
+            service_names,
+            skip,
+            limit,
+            decode_cursor(cursor, float, UUID) if cursor else None,
+            slot,
+        )
+        return self.nearest_page(technicians, limit)
+
+    async def search_ranked_technicians(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """The nearest technicians in range, up to the ranker's maximum, ordered by score"""
+        ranker: Ranker = self.ranker  # type: ignore
+        candidates: List[Tuple[float, UUID]] = await self.engine.nearest_ids(
+            client_id, radius_km, service_names, ranker.max_candidates
+        )
+        ranked: List[Tuple[float, float, UUID]] = ranker.rank(
+            candidates,
+            radius_km * 1000,
+            None,
+            skip,
+            limit,
+            decode_cursor(cursor, float, UUID) if cursor else None,
+        )
+        technicians: List[
+            Tuple[TechnicianInDB, float]
+        ] = await self.repo.readall_ranked(
+            [(distance, technician_id) for _, distance, technician_id in ranked]
+        )
+        next_cursor: Optional[str] = None
+        if ranked and len(ranked) >= limit:
+            score, _, last_id = ranked[-1]
+            next_cursor = encode_cursor(score, last_id)
+        return (
+            [technician_in_db_to_response(technician) for technician, _ in technicians],
+            next_cursor,
+        )
+
+    def nearest_page(
+        self, technicians: List[Tuple[TechnicianInDB, float]], limit: int
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """The responses of a nearest first page and the cursor of the next page"""
+        next_cursor: Optional[str] = None
+        if technicians and len(technicians) >= limit:
+            last, distance = technicians[-1]
+            next_cursor = encode_cursor(distance, last.id)
+        return (
+            [technician_in_db_to_response(technician) for technician, _ in technicians],
+            next_cursor,
         )
-        return [technician_in_db_to_response(technician) for technician in technicians]
 
     async def search_technicians_by_description(
         self,
@@ -33,12 +217,62 @@ class SearchService:
         radius_km: float,
         skip: int = 0,
         limit: int = 100,
+        ranked: bool = False,
     ) -> List[TechnicianResponse]:
-        """"""
+        """Best matching first, or best ranked first with the match score as one more feature"""
+        # Matching ignores case and surrounding whitespace, so those variants share a result;
+        # whitespace inside the description changes the match pattern and stays in the key
+        problem_description = problem_description.strip()
+        key: Tuple[Any, ...] = (
+            "description",
+            client_id,
+            abs(radius_km),
+            problem_description.lower(),
+            skip,
+            limit,
+            ranked,
+        )
+        return await self.shared(
+            key,
+            lambda: self.description_matches(
+                client_id, problem_description, abs(radius_km), skip, limit, ranked
+            ),
+        )
+
+    async def description_matches(
+        self,
+        client_id: UUID,
+        problem_description: str,
+        radius_km: float,
+        skip: int,
+        limit: int,
+        ranked: bool,
+    ) -> List[TechnicianResponse]:
+        """One page of `search_technicians_by_description`, read from Postgres"""
+        if ranked and self.can_rank():
+            ranker: Ranker = self.ranker  # type: ignore
+            candidates: List[
+                Tuple[float, UUID, float]
+            ] = await self.repo.description_candidates(
+                client_id, problem_description, radius_km, ranker.max_candidates
+            )
+            page: List[Tuple[float, float, UUID]] = ranker.rank(
+                [(distance, technician_id) for distance, technician_id, _ in candidates],
+                radius_km * 1000,
+                [relevance for _, _, relevance in candidates],
+                skip,
+                limit,
+            )
+            matches: List[
+                Tuple[TechnicianInDB, float]
+            ] = await self.repo.readall_ranked(
+                [(distance, technician_id) for _, distance, technician_id in page]
+            )
+            return [technician_in_db_to_response(technician) for technician, _ in matches]
         technicians: List[
             TechnicianInDB
         ] = await self.repo.search_technicians_by_description(
-            client_id, problem_description, abs(radius_km), skip, limit
+            client_id, problem_description, radius_km, skip, limit
         )
         return [technician_in_db_to_response(technician) for technician in technicians]
 
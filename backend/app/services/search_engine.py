@@ -0,0 +1,453 @@
+import asyncio
+from math import asin, cos, pi, radians, sin
+from uuid import UUID
+from loguru import logger
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+)
+from app.database import AsyncDatabase
+from app.models import TechnicianInDB
+from app.repository import SearchRepository
+from app.repository.service_catalogue import CHANNEL as SERVICE_CHANNEL
+from app.repository.technician_changes import (
+    CHANNEL as TECHNICIAN_CHANNEL,
+    TechnicianChange,
+    parse_technician_change,
+)
+from app.utils.geo import EARTH_RADIUS_METERS
+
+try:
+    import numpy as np
+except ImportError:  # optional, installed with the `geo` extra
+    np = None  # type: ignore
+
+# Height in radians of the latitude strips the index is sorted by, about 6.4 km
+STRIP_HEIGHT: float = 0.001
+STRIP_KEY_SPAN: float = 10.0
+
+# (id, longitude, latitude, service names) of one active technician
+IndexRow = Tuple[UUID, float, float, Sequence[str]]
+
+
+class SearchEngine(Protocol):
+    """Answers the radius search of SearchService, selected by the SEARCH_ENGINE setting"""
+
+    name: str
+
+    async def search_nearby(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, UUID]],
+    ) -> List[Tuple[TechnicianInDB, float]]: ...
+
+    async def nearest_ids(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        limit: int,
+    ) -> List[Tuple[float, UUID]]: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class PostGISSearchEngine:
+    """The radius search in Postgres, on the GiST index and the nearby cell cache"""
+
+    name: str = "postgis"
+
+    def __init__(self, repo: SearchRepository) -> None:
+        self.repo = repo
+
+    async def search_nearby(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, UUID]],
+    ) -> List[Tuple[TechnicianInDB, float]]:
+        return await self.repo.search_nearby_technicians(
+            client_id, radius_km, service_names, skip, limit, after
+        )
+
+    async def nearest_ids(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        limit: int,
+    ) -> List[Tuple[float, UUID]]:
+        return await self.repo.nearest_ids(client_id, radius_km, service_names, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name}
+
+
+class NumpySearchEngine:
+    """
+    Every active technician's point and services held in NumPy arrays, so the radius and
+    service filter, the distances and the order are computed without a database query; only
+    the client's point and the technicians of the returned page are read from Postgres.
+
+    Built at startup and kept current from the technician_changed notifications: the rows of
+    the technicians named in a notification are re-read, anything else rebuilds the index.
+    Searches fall back to PostGIS until the first build is done, and again after a failed
+    update until a rebuild succeeds.
+    """
+
+    name: str = "numpy"
+
+    def __init__(self, db: AsyncDatabase, fallback: Optional[SearchRepository] = None) -> None:
+        if np is None:
+            raise RuntimeError("SEARCH_ENGINE=numpy needs numpy, install the `geo` extra")
+        self.db = db
+        self.repo = fallback or SearchRepository(db)
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._ready: bool = False
+        self._stale: bool = False
+        self._pending: Set[UUID] = set()
+        self._sync: Optional[asyncio.Task[None]] = None
+        self.rebuilds: int = 0
+        self.updates: int = 0
+        self.failures: int = 0
+        self.queries: int = 0
+        self.fallbacks: int = 0
+        self.load([])
+
+    async def start(self) -> None:
+        """Subscribe to technician and service changes, then build the index"""
+        await self.db.listen(TECHNICIAN_CHANNEL, self.on_technician_changed)
+        await self.db.listen(SERVICE_CHANNEL, self.on_service_changed)
+        async with self._lock:
+            await self.rebuild()
+
+    async def stop(self) -> None:
+        if self._sync is not None:
+            self._sync.cancel()
+            self._sync = None
+
+    def load(self, rows: Iterable[IndexRow]) -> None:
+        """Replace the whole index"""
+        self._ids: List[Optional[UUID]] = []
+        self._row: Dict[UUID, int] = {}
+        self._services: List[FrozenSet[str]] = []
+        self._free: List[int] = []
+        offering: Dict[str, List[int]] = {}
+        points: List[Tuple[float, float]] = []
+        for technician_id, lon, lat, services in rows:
+            self._row[technician_id] = len(self._ids)
+            self._ids.append(technician_id)
+            self._services.append(frozenset(services))
+            for service in services:
+                offering.setdefault(service, []).append(len(points))
+            points.append((lon, lat))
+        # One boolean column per service name: which rows offer it
+        self._offers: Dict[str, Any] = {}
+        for service, service_rows in offering.items():
+            self._offers[service] = np.zeros(len(points), dtype=bool)
+            self._offers[service][service_rows] = True
+        coordinates = np.radians(np.array(points, dtype=np.float64).reshape(-1, 2))
+        self._lon = coordinates[:, 0].copy()
+        self._lat = coordinates[:, 1].copy()
+        self._cos_lat = np.cos(self._lat)
+        self._alive = np.ones(len(points), dtype=bool)
+        self._sort()
+
+    def _sort(self) -> None:
+        """
+        Order the rows by latitude strip, then longitude, so a search only visits the slices
+        of its bounding box. Rows changed since are kept in `_dirty` and checked on every
+        search until the next sort.
+        """
+        size: int = len(self._ids)
+        keys = self._strip_keys(self._lat[:size], self._lon[:size])
+        self._by_key = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._by_key]
+        self._dirty: Set[int] = set()
+
+    @staticmethod
+    def _strip_keys(lat: Any, lon: Any) -> Any:
+        """Strip number, then longitude: the longitude (radians + pi) stays below STRIP_KEY_SPAN"""
+        return np.floor(lat / STRIP_HEIGHT) * STRIP_KEY_SPAN + (lon + np.pi)
+
+    def _bounding_box_rows(self, lon0: float, lat0: float, lat_span: float) -> Any:
+        """Rows of the sorted order inside the box around the point, plus the dirty rows"""
+        strips = np.arange(
+            np.floor((lat0 - lat_span) / STRIP_HEIGHT), np.floor((lat0 + lat_span) / STRIP_HEIGHT) + 1
+        )
+        # Widest longitude of the circle, all of them when it reaches a pole
+        lon_span: float = (
+            asin(sin(lat_span) / cos(lat0)) * 1.000001 if cos(lat0) > sin(lat_span) else pi
+        )
+        if lon_span >= pi:
+            low_keys, high_keys = strips * STRIP_KEY_SPAN, strips * STRIP_KEY_SPAN + 2 * pi
+        else:
+            low_keys = strips * STRIP_KEY_SPAN + (lon0 - lon_span + pi)
+            high_keys = strips * STRIP_KEY_SPAN + (lon0 + lon_span + pi)
+        lows = np.searchsorted(self._sorted_keys, low_keys, side="left")
+        highs = np.searchsorted(self._sorted_keys, high_keys, side="right")
+        slices: List[Any] = [self._by_key[low:high] for low, high in zip(lows, highs) if high > low]
+        if lon_span < pi and (lon0 - lon_span < -pi or lon0 + lon_span > pi):
+            # The box crosses the antimeridian, take the whole strips
+            slices = [
+                self._by_key[low:high]
+                for low, high in zip(
+                    np.searchsorted(self._sorted_keys, strips * STRIP_KEY_SPAN, side="left"),
+                    np.searchsorted(self._sorted_keys, strips * STRIP_KEY_SPAN + 2 * pi, side="right"),
+                )
+            ]
+        if self._dirty:
+            slices.append(np.fromiter(self._dirty, dtype=np.int64))
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(slices)) if self._dirty else np.concatenate(slices)
+
+    def _touch(self, row: int) -> None:
+        self._dirty.add(row)
+        if len(self._dirty) > max(1024, len(self._ids) // 20):
+            self._sort()
+
+    def upsert(self, technician_id: UUID, lon: float, lat: float, services: Sequence[str]) -> None:
+        row: Optional[int] = self._row.get(technician_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._grow()
+            self._row[technician_id] = row
+            self._ids[row] = technician_id
+        for service in self._services[row]:
+            self._offers[service][row] = False
+        self._services[row] = frozenset(services)
+        for service in services:
+            if service not in self._offers:
+                self._offers[service] = np.zeros(len(self._alive), dtype=bool)
+            self._offers[service][row] = True
+        self._lon[row], self._lat[row] = radians(lon), radians(lat)
+        self._cos_lat[row] = np.cos(self._lat[row])
+        self._alive[row] = True
+        self._touch(row)
+
+    def remove(self, technician_id: UUID) -> None:
+        row: Optional[int] = self._row.pop(technician_id, None)
+        if row is None:
+            return
+        for service in self._services[row]:
+            self._offers[service][row] = False
+        self._services[row] = frozenset()
+        self._ids[row] = None
+        self._alive[row] = False
+        self._free.append(row)
+        self._touch(row)
+
+    def _grow(self) -> int:
+        """Append one row, doubling the arrays when they are full"""
+        row: int = len(self._ids)
+        if row == len(self._alive):
+            capacity: int = max(16, 2 * row)
+            self._lon = np.resize(self._lon, capacity)
+            self._lat = np.resize(self._lat, capacity)
+            self._cos_lat = np.resize(self._cos_lat, capacity)
+            self._alive = self._resized(self._alive, capacity)
+            for service in self._offers:
+                self._offers[service] = self._resized(self._offers[service], capacity)
+        self._ids.append(None)
+        self._services.append(frozenset())
+        return row
+
+    @staticmethod
+    def _resized(flags: Any, capacity: int) -> Any:
+        grown = np.zeros(capacity, dtype=bool)
+        grown[: len(flags)] = flags
+        return grown
+
+    def nearest(
+        self,
+        lon: float,
+        lat: float,
+        radius_meters: float,
+        service_names: Optional[Sequence[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[Tuple[float, UUID]]:
+        """One page of (distance in meters, id) within the radius, nearest first"""
+        lon0, lat0 = radians(lon), radians(lat)
+        lat_span: float = radius_meters / EARTH_RADIUS_METERS
+        rows_in_band = self._bounding_box_rows(lon0, lat0, lat_span)
+        rows_in_band = rows_in_band[
+            self._alive[rows_in_band] & (np.abs(self._lat[rows_in_band] - lat0) <= lat_span)
+        ]
+        a = np.sin((self._lat[rows_in_band] - lat0) / 2) ** 2 + np.cos(lat0) * self._cos_lat[
+            rows_in_band
+        ] * np.sin((self._lon[rows_in_band] - lon0) / 2) ** 2
+        distances = 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        in_range = distances <= radius_meters
+        if after is not None:
+            in_range &= distances >= after[0]
+            skip = 0
+        rows_in_range, distances = rows_in_band[in_range], distances[in_range]
+        if service_names:
+            offered = np.zeros(len(rows_in_range), dtype=bool)
+            for service in service_names:
+                if service in self._offers:
+                    offered |= self._offers[service][rows_in_range]
+            rows_in_range, distances = rows_in_range[offered], distances[offered]
+        wanted: int = skip + limit
+        if after is not None:
+            # Rows at exactly the cursor distance may come before it and get dropped below
+            wanted += int(np.count_nonzero(distances == after[0]))
+        if len(distances) > wanted:
+            # Only the nearest `wanted` need sorting, plus whatever ties the last of them
+            kth: float = np.partition(distances, wanted - 1)[wanted - 1]
+            nearest = distances <= kth
+            rows_in_range, distances = rows_in_range[nearest], distances[nearest]
+        ranked: List[Tuple[float, UUID]] = sorted(
+            (distance, self._ids[row])  # type: ignore
+            for distance, row in zip(distances.tolist(), rows_in_range.tolist())
+        )
+        if after is not None:
+            ranked = [row for row in ranked if row > after]
+        return ranked[skip : skip + limit]
+
+    async def search_nearby(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[float, UUID]],
+    ) -> List[Tuple[TechnicianInDB, float]]:
+        if not self._ready:
+            self.fallbacks += 1
+            return await self.repo.search_nearby_technicians(
+                client_id, radius_km, service_names, skip, limit, after
+            )
+        origin: Optional[Tuple[float, float]] = await self.repo.client_point(client_id)
+        if origin is None:
+            return []
+        self.queries += 1
+        ranked: List[Tuple[float, UUID]] = self.nearest(
+            *origin, radius_km * 1000, service_names, skip, limit, after
+        )
+        return await self.repo.readall_ranked(ranked)
+
+    async def nearest_ids(
+        self,
+        client_id: UUID,
+        radius_km: float,
+        service_names: Optional[List[str]],
+        limit: int,
+    ) -> List[Tuple[float, UUID]]:
+        if not self._ready:
+            self.fallbacks += 1
+            return await self.repo.nearest_ids(client_id, radius_km, service_names, limit)
+        origin: Optional[Tuple[float, float]] = await self.repo.client_point(client_id)
+        if origin is None:
+            return []
+        self.queries += 1
+        return self.nearest(*origin, radius_km * 1000, service_names, 0, limit)
+
+    async def _read(self, technician_ids: Optional[List[UUID]] = None) -> List[IndexRow]:
+        """The index rows of the given active technicians, of all of them without ids"""
+        query: str = f"""
+        SELECT
+            t.id,
+            ST_X(t.location::geometry) AS longitude,
+            ST_Y(t.location::geometry) AS latitude,
+            COALESCE(tc.services, ARRAY[]::TEXT[]) AS services
+        FROM technician t
+        LEFT JOIN technician_card tc ON tc.technician_id = t.id
+        WHERE t.is_active = TRUE
+        {"AND t.id = ANY($1::uuid[])" if technician_ids is not None else ""}
+        """
+        args: List[Any] = [technician_ids] if technician_ids is not None else []
+        return [
+            (r["id"], r["longitude"], r["latitude"], r["services"])
+            async for r in self.db.fetch_iter(query, *args)
+        ]
+
+    async def rebuild(self) -> None:
+        rows: List[IndexRow] = await self._read()
+        self.load(rows)
+        self._ready = True
+        self.rebuilds += 1
+        logger.info(f"NumPy search index built with {len(rows)} technicians")
+
+    async def refresh(self, technician_ids: List[UUID]) -> None:
+        """Re-read some technicians, dropping those that are gone or no longer active"""
+        rows: List[IndexRow] = await self._read(technician_ids)
+        for row in rows:
+            self.upsert(*row)
+        for technician_id in set(technician_ids) - {row[0] for row in rows}:
+            self.remove(technician_id)
+        self.updates += len(technician_ids)
+
+    def on_technician_changed(self, payload: Optional[str]) -> None:
+        change: Optional[TechnicianChange] = parse_technician_change(payload)
+        if change is None:
+            self._stale = True
+        else:
+            self._pending.update(change.ids)
+        self._schedule()
+
+    def on_service_changed(self, payload: Optional[str]) -> None:
+        """A renamed service changes the service names of every technician offering it"""
+        self._stale = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._sync is None or self._sync.done():
+            self._sync = asyncio.create_task(self._apply_changes())
+
+    async def _apply_changes(self, delay: float = 1.0) -> None:
+        """
+        Drain the pending changes, re-reading rows from the primary so no write is missed.
+        A failed read leaves the index behind the database, so it stops being ready (searches
+        fall back to PostGIS) and is rebuilt with backoff until a rebuild succeeds.
+        """
+        async with self._lock:
+            while self._stale or self._pending:
+                try:
+                    if self._stale:
+                        self._stale = False
+                        self._pending.clear()
+                        await self.rebuild()
+                    else:
+                        technician_ids: List[UUID] = list(self._pending)
+                        self._pending.clear()
+                        await self.refresh(technician_ids)
+                except Exception as e:
+                    self._stale = True
+                    self._ready = False
+                    self.failures += 1
+                    logger.error(
+                        f"Failed to update the NumPy search index, retrying in {delay:.0f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ready": self._ready,
+            "technicians": len(self._row),
+            "rebuilds": self.rebuilds,
+            "updates": self.updates,
+            "failures": self.failures,
+            "queries": self.queries,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,56 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.database import AsyncDatabase
+from app.repository.service_catalogue import CHANNEL as SERVICE_CHANNEL
+from app.repository.technician_changes import CHANNEL as TECHNICIAN_CHANNEL
+from app.utils.cache import TTLCache
+from app.utils.singleflight import SingleFlight
+
+from .ranking import CHANNEL as FEATURES_CHANNEL
+
+
+class SearchResultCache:
+    """
+    Search results shared between requests with the same parameters.
+
+    Concurrent identical searches run once (single-flight) and their result is kept for `ttl`
+    seconds, so a burst of the same search costs one query per `ttl`; when an entry expires
+    the next burst is coalesced again instead of stampeding the database. Every entry is
+    dropped when technicians, their ranking features or the services change, and a result
+    read across such a change is not stored. Searches depending on anything else, like
+    booking statuses, are only coalesced.
+    """
+
+    def __init__(self, db: AsyncDatabase, maxsize: int, ttl: float) -> None:
+        self.db = db
+        self.results: TTLCache[Hashable, Any] = TTLCache(maxsize, ttl)
+        self.flights: SingleFlight[Hashable, Any] = SingleFlight()
+        self._generation: int = 0
+
+    async def start(self) -> None:
+        for channel in (TECHNICIAN_CHANNEL, FEATURES_CHANNEL, SERVICE_CHANNEL):
+            await self.db.listen(channel, self.invalidate)
+
+    async def get(self, key: Hashable, search: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached result of `key`, or the result of `search`, run once for concurrent callers"""
+        result: Any = self.results.get(key)
+        if result is not None:
+            return result
+        return await self.flights.do(key, lambda: self._search(key, search))
+
+    async def coalesce(self, key: Hashable, search: Callable[[], Awaitable[Any]]) -> Any:
+        """The result of `search`, run once for concurrent callers and not stored"""
+        return await self.flights.do(key, search)
+
+    async def _search(self, key: Hashable, search: Callable[[], Awaitable[Any]]) -> Any:
+        generation: int = self._generation
+        result: Any = await search()
+        if generation == self._generation and self.results.ttl > 0:
+            self.results.put(key, result)
+        return result
+
+    def invalidate(self, payload: Optional[str] = None) -> None:
+        self._generation += 1
+        self.results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.results.stats(), "single_flight": self.flights.stats()}
@@ -1,6 +1,12 @@
 from uuid import UUID
 from typing import Optional, List
-from app.models import ServiceInDB, ServiceCreate, ServiceUpdate, ServiceResponse
+from app.models import (
+    ServiceInDB,
+    ServiceCreate,
+    ServiceUpdate,
+    ServiceResponse,
+    ServiceSuggestion,
+)
 from app.repository import ServiceRepository
 from app.utils.exceptions import (
     NotFoundException,
@@ -29,6 +35,15 @@ class ServiceService:
             raise InternalServerException("Error creating service")
         return service_in_db_to_response(service)
 
+    async def create_services(self, data: List[ServiceCreate]) -> int:
+        """Create many services at once, returns the number created"""
+        return await self.repo.create_many(
+            [
+                {"name": service.name.lower(), "description": service.description.lower()}
+                for service in data
+            ]
+        )
+
     async def readone_service(self, service_id: UUID) -> ServiceResponse:
         """"""
         service: Optional[ServiceInDB] = await self.repo.readone(service_id)
@@ -68,3 +83,12 @@ class ServiceService:
         if service is None:
             raise NotFoundException(f"Service {service_name} not found")
         return service_in_db_to_response(service)
+
+    async def suggest_services(
+        self, text: str, limit: int = 10
+    ) -> List[ServiceSuggestion]:
+        """Autocomplete for service names, prefix matches before fuzzy ones"""
+        text = text.strip().lower()
+        if not text:
+            return []
+        return await self.repo.suggest(text, max(1, min(limit, 50)))
@@ -1,18 +1,22 @@
+import asyncio
 from uuid import UUID
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from app.models import (
     TechnicianInDB,
     TechnicianCreate,
     TechnicianResponse,
     TechnicianUpdate,
+    UserCredentials,
 )
 from app.repository import TechnicianRepository
 from app.utils.security import SecurityUtils
+from app.utils.pagination import decode_created_cursor, next_created_cursor
 from app.utils.exceptions import (
     NotFoundException,
     ConflictException,
     InternalServerException,
 )
+from .user_cache import UserCache
 
 
 def technician_in_db_to_response(technician: TechnicianInDB) -> TechnicianResponse:
@@ -21,15 +25,16 @@ def technician_in_db_to_response(technician: TechnicianInDB) -> TechnicianRespon
 
 
 class TechnicianService:
-    def __init__(self, repo: TechnicianRepository) -> None:
+    def __init__(self, repo: TechnicianRepository, users: Optional[UserCache] = None) -> None:
         self.repo = repo
+        self.users = users
 
     async def create_technician(self, data: TechnicianCreate) -> TechnicianResponse:
         """"""
         exists, message = await self.repo.exists(data.email, data.phone)
         if exists:
             raise ConflictException(message)
-        hashed_password: str = SecurityUtils.hash_password(data.password)
+        hashed_password: str = await SecurityUtils.hash_password_async(data.password)
         technician: Optional[TechnicianInDB] = await self.repo.create(
             {
                 "hashed_password": hashed_password,
@@ -40,8 +45,28 @@ class TechnicianService:
             raise InternalServerException("Error creating technician")
         return technician_in_db_to_response(technician)
 
+    async def create_technicians(self, data: List[TechnicianCreate]) -> int:
+        """Create many technicians at once, returns the number created"""
+        hashed_passwords: List[str] = await asyncio.gather(
+            *(SecurityUtils.hash_password_async(technician.password) for technician in data)
+        )
+        return await self.repo.create_many(
+            [
+                {
+                    "hashed_password": hashed_password,
+                    **technician.model_dump(exclude={"password"}),
+                }
+                for technician, hashed_password in zip(data, hashed_passwords)
+            ]
+        )
+
     async def readone_technician(self, technician_id: UUID) -> TechnicianResponse:
         """"""
+        if self.users is None:
+            return await self._readone_technician(technician_id)
+        return await self.users.get(technician_id, lambda: self._readone_technician(technician_id))
+
+    async def _readone_technician(self, technician_id: UUID) -> TechnicianResponse:
         technician: Optional[TechnicianInDB] = await self.repo.readone(technician_id)
         if technician is None:
             raise NotFoundException(f"Technician with id '{technician_id}' not found")
@@ -53,12 +78,16 @@ class TechnicianService:
         is_available: Optional[bool] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[TechnicianResponse]:
-        """"""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[TechnicianResponse], Optional[str]]:
+        """Returns one page of technicians and the cursor of the next page"""
         technicians: List[TechnicianInDB] = await self.repo.readall(
-            active, is_available, skip, limit
+            active, is_available, skip, limit, decode_created_cursor(cursor)
+        )
+        return (
+            [technician_in_db_to_response(technician) for technician in technicians],
+            next_created_cursor(technicians, limit),
         )
-        return [technician_in_db_to_response(technician) for technician in technicians]
 
     async def update_technician(
         self, technician_id: UUID, data: TechnicianUpdate
@@ -73,7 +102,7 @@ class TechnicianService:
             return technician_in_db_to_response(technician)
 
         if "password" in update_data:
-            hashed_password: str = SecurityUtils.hash_password(
+            hashed_password: str = await SecurityUtils.hash_password_async(
                 update_data.pop("password")
             )
             update_data["hashed_password"] = hashed_password
@@ -89,13 +118,18 @@ class TechnicianService:
         technician: Optional[TechnicianInDB] = await self.repo.update(
             technician_id, update_data
         )
+        if self.users is not None:
+            self.users.invalidate(technician_id)
         if technician is None:
             raise InternalServerException("Error updating technician")
         return technician_in_db_to_response(technician)
 
     async def delete_technician(self, technician_id: UUID) -> bool:
         """"""
-        return await self.repo.delete(technician_id)
+        deleted: bool = await self.repo.delete(technician_id)
+        if self.users is not None:
+            self.users.invalidate(technician_id)
+        return deleted
 
     async def readone_technician_by_email(self, email: str) -> TechnicianResponse:
         """"""
@@ -104,13 +138,22 @@ class TechnicianService:
             raise NotFoundException(f"Technician with email '{email}' not found")
         return technician_in_db_to_response(technician)
 
-    async def authenticate(
-        self, email: str, password: str
-    ) -> Optional[TechnicianResponse]:
-        """"""
-        technician: Optional[TechnicianInDB] = await self.repo.readone_by_email(email)
-        if technician is None:
+    async def read_access(self, technician_id: UUID) -> Optional[Tuple[bool, int]]:
+        """Active flag and token version of the technician, None once deleted"""
+        return await self.repo.read_access(technician_id)
+
+    async def verify_credentials(self, email: str, password: str) -> Optional[UserCredentials]:
+        """The credentials of the technician with this email, None unless the password matches"""
+        credentials: Optional[UserCredentials] = await self.repo.read_credentials(email)
+        if credentials is None:
             return None
-        if not SecurityUtils.verify_password(password, technician.hashed_password):
+        if not await SecurityUtils.verify_password_async(password, credentials.hashed_password):
             return None
-        return technician_in_db_to_response(technician)
+        return credentials
+
+    async def authenticate(self, email: str, password: str) -> Optional[TechnicianResponse]:
+        """"""
+        credentials: Optional[UserCredentials] = await self.verify_credentials(email, password)
+        if credentials is None:
+            return None
+        return await self.readone_technician(credentials.id)
@@ -37,6 +37,12 @@ class TechnicianAvailablityService:
             raise InternalServerException("Error creating technician availability")
         return self.technician_availability_in_db_to_response(technician_availability)
 
+    async def create_technician_availabilities(
+        self, data: List[TechnicianAvailabilityCreate]
+    ) -> int:
+        """Create or replace many availability slots at once"""
+        return await self.repo.create_many([slot.model_dump() for slot in data])
+
     async def readone_technician_availability(
         self, technician_availability_id: UUID
     ) -> TechnicianAvailabilityResponse:
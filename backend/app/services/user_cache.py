@@ -0,0 +1,88 @@
+from uuid import UUID
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from app.database import AsyncDatabase
+from app.models import TechnicianResponse
+from app.repository.service_catalogue import CHANNEL as SERVICE_CHANNEL
+from app.repository.technician_changes import (
+    CHANNEL as TECHNICIAN_CHANNEL,
+    TechnicianChange,
+    parse_technician_change,
+)
+from app.utils.cache import TTLCache
+
+from .ranking import CHANNEL as FEATURES_CHANNEL
+
+# NOTIFYed by the trg_*_user_changed triggers on every update or delete of an admin, client
+# or technician, the payload is the user id
+CHANNEL: str = "user_changed"
+
+U = TypeVar("U")
+
+
+class UserCache:
+    """
+    Admin, client and technician responses by id, so a user looked up by several requests
+    in a row is read once. Bounded to `maxsize` users (about a kilobyte each), each kept for
+    at most `ttl` seconds.
+
+    A user is dropped when Postgres NOTIFYs that their row changed, and technicians also when
+    their rating, verification or services change, so every process sees a write within a
+    round trip. A user read across such a change is not stored.
+    """
+
+    def __init__(self, db: AsyncDatabase, maxsize: int, ttl: float) -> None:
+        self.db = db
+        self.users: TTLCache[UUID, Any] = TTLCache(maxsize, ttl)
+        self._loading: Dict[UUID, object] = {}
+
+    async def start(self) -> None:
+        await self.db.listen(CHANNEL, self.on_user_changed)
+        await self.db.listen(FEATURES_CHANNEL, self.on_user_changed)
+        await self.db.listen(TECHNICIAN_CHANNEL, self.on_technician_changed)
+        await self.db.listen(SERVICE_CHANNEL, self.on_service_changed)
+
+    async def get(self, user_id: UUID, read: Callable[[], Awaitable[U]]) -> U:
+        """The cached user, or the result of `read`, stored unless the user changed meanwhile"""
+        user: Optional[U] = self.users.get(user_id)
+        if user is not None:
+            return user
+        loading: object = object()
+        self._loading[user_id] = loading
+        try:
+            user = await read()
+            if self._loading.get(user_id) is loading:
+                self.users.put(user_id, user)
+            return user
+        finally:
+            if self._loading.get(user_id) is loading:
+                del self._loading[user_id]
+
+    def invalidate(self, user_id: UUID) -> None:
+        self.users.pop(user_id)
+        self._loading.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.users.clear()
+        self._loading.clear()
+
+    def on_user_changed(self, payload: Optional[str]) -> None:
+        try:
+            self.invalidate(UUID(payload or ""))
+        except ValueError:
+            self.clear()
+
+    def on_technician_changed(self, payload: Optional[str]) -> None:
+        change: Optional[TechnicianChange] = parse_technician_change(payload)
+        if change is None:
+            self.clear()
+            return
+        for technician_id in change.ids:
+            self.invalidate(technician_id)
+
+    def on_service_changed(self, payload: Optional[str]) -> None:
+        """Technicians show their service names"""
+        self.users.pop_where(lambda _, user: isinstance(user, TechnicianResponse))
+        self._loading.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.users.stats(), "loading": len(self._loading)}
@@ -28,6 +28,11 @@ class UnauthorizedException(HTTPException):
         super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=message)
 
 
+class ForbiddenException(HTTPException):
+    def __init__(self, message: str = "Forbidden") -> None:
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=message)
+
+
 class NotImplementedException(HTTPException):
     def __init__(self, message: str = "Not implemented") -> None:
         super().__init__(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=message)
@@ -0,0 +1,54 @@
+import io
+import csv
+from typing import Any, AsyncIterator, Dict, List, Optional
+from pydantic import BaseModel
+
+from app.models.enums import ExportFormat
+
+MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested dictionaries into dotted keys, e.g. location.latitude"""
+    flat: Dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+async def ndjson_lines(models: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    """Serialize each model as one JSON document per line"""
+    async for model in models:
+        yield model.model_dump_json() + "\n"
+
+
+async def csv_lines(models: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    """Serialize each model as one CSV row, the header is taken from the first model"""
+    buffer = io.StringIO()
+    writer: Optional[csv.DictWriter] = None
+    fieldnames: List[str] = []
+    async for model in models:
+        row: Dict[str, Any] = flatten(model.model_dump(mode="json"))
+        if writer is None:
+            fieldnames = list(row.keys())
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writeheader()
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def export_lines(
+    models: AsyncIterator[BaseModel], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Serialize a stream of models in the requested export format"""
+    if export_format == ExportFormat.CSV:
+        return csv_lines(models)
+    return ndjson_lines(models)
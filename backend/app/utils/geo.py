@@ -0,0 +1,55 @@
+from math import asin, cos, radians, sin, sqrt
+from typing import List, Tuple
+
+# The mean radius of WGS 84, (2a + b) / 3, the sphere PostGIS measures geography on with
+# use_spheroid => false and for the <-> operator
+EARTH_RADIUS_METERS: float = 6371008.7714
+
+BASE32: str = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_meters(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Great-circle distance between two points on the mean-radius sphere"""
+    dlat: float = radians(lat2 - lat1)
+    dlon: float = radians(lon2 - lon1)
+    a: float = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * asin(min(1.0, sqrt(a)))
+
+
+def geohash(lon: float, lat: float, precision: int) -> str:
+    """The geohash cell of a point, each extra character makes the cell 32 times smaller"""
+    lon_range, lat_range = [-180.0, 180.0], [-90.0, 90.0]
+    cell: List[str] = []
+    bits, value, even = 0, 0, True
+    while len(cell) < precision:
+        span, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle: float = (span[0] + span[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            span[0] = middle
+        else:
+            value = value * 2
+            span[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(cell)
+
+
+def geohash_bounds(cell: str) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a geohash cell"""
+    lon_range, lat_range = [-180.0, 180.0], [-90.0, 90.0]
+    even: bool = True
+    for char in cell:
+        value: int = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            span = lon_range if even else lat_range
+            middle: float = (span[0] + span[1]) / 2
+            if (value >> shift) & 1:
+                span[0] = middle
+            else:
+                span[1] = middle
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
@@ -0,0 +1,47 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+from typing import Any, Callable, List, Optional, Protocol, Sequence, Tuple
+from app.utils.exceptions import BadRequestException
+
+NEXT_CURSOR_HEADER: str = "X-Next-Cursor"
+
+
+class Keyed(Protocol):
+    id: UUID
+    created_at: datetime
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row of a page into an opaque, url-safe token"""
+    raw: bytes = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> Tuple[Any, ...]:
+    """Unpack a token made by `encode_cursor`, parsing each value with the matching parser"""
+    try:
+        raw: bytes = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values: List[str] = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError, binascii.Error):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def decode_created_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Decode a `(created_at, id)` cursor, None when no cursor was given"""
+    if not cursor:
+        return None
+    created_at, id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+    return created_at, id
+
+
+def next_created_cursor(items: Sequence[Keyed], limit: int) -> Optional[str]:
+    """The cursor of the page after `items`, None when `items` was the last page"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].created_at, items[-1].id)
@@ -1,4 +1,7 @@
-from typing import ClassVar, Dict, Any
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple, TypeVar
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from jose import jwt
@@ -8,6 +11,62 @@ from fastapi.security import OAuth2PasswordBearer
 from app.core import settings
 from app.models import TokenData
 
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded pool of threads, off the event loop. bcrypt releases the GIL
+    while hashing, so the workers hash in parallel and the loop keeps serving requests; calls
+    beyond `workers` wait in the pool's queue, their depth and wait are in `stats`.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.pending: int = 0
+        self.max_queued: int = 0
+        self.completed: int = 0
+        self.wait_total_ms: float = 0.0
+        self.wait_max_ms: float = 0.0
+        self.busy_total_ms: float = 0.0
+
+    @staticmethod
+    def _timed(call: Callable[..., T], submitted: float, *args: Any) -> Tuple[T, float, float]:
+        started: float = time.perf_counter()
+        result: T = call(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    async def run(self, call: Callable[..., T], *args: Any) -> T:
+        self.pending += 1
+        self.max_queued = max(self.max_queued, self.pending - self.workers)
+        try:
+            result, waited, busy = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._timed, call, time.perf_counter(), *args
+            )
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.wait_total_ms += waited * 1000
+        self.wait_max_ms = max(self.wait_max_ms, waited * 1000)
+        self.busy_total_ms += busy * 1000
+        return result
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "wait_avg_ms": self.wait_total_ms / self.completed if self.completed else 0.0,
+            "wait_max_ms": self.wait_max_ms,
+            "hash_avg_ms": self.busy_total_ms / self.completed if self.completed else 0.0,
+        }
+
 
 class SecurityUtils:
     PWD_CONTEXT: ClassVar[CryptContext] = CryptContext(
@@ -16,6 +75,7 @@ class SecurityUtils:
     OUTH_2_SCHEME: ClassVar[OAuth2PasswordBearer] = OAuth2PasswordBearer(
         tokenUrl=f"{settings.API_V1_STR}/auth/login"
     )
+    HASHER: ClassVar[Optional[PasswordHasher]] = None
 
     @classmethod
     def hash_password(cls, password: str) -> str:
@@ -27,6 +87,29 @@ class SecurityUtils:
         """Verify if the password is correct"""
         return cls.PWD_CONTEXT.verify(password, hashed_password)
 
+    @classmethod
+    def hasher(cls) -> PasswordHasher:
+        """The process wide bcrypt pool, started on first use"""
+        if cls.HASHER is None:
+            cls.HASHER = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
+        return cls.HASHER
+
+    @classmethod
+    def stop_hasher(cls) -> None:
+        if cls.HASHER is not None:
+            cls.HASHER.shutdown()
+            cls.HASHER = None
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """hash_password on the bcrypt pool, without blocking the event loop"""
+        return await cls.hasher().run(cls.PWD_CONTEXT.hash, password)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, hashed_password: str) -> bool:
+        """verify_password on the bcrypt pool, without blocking the event loop"""
+        return await cls.hasher().run(cls.PWD_CONTEXT.verify, password, hashed_password)
+
     @classmethod
     def create_access_token(cls, data: TokenData, expires_delta: timedelta) -> str:
         """Create a JWT access token"""
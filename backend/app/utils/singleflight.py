@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the call, every caller
+    arriving while it is in flight awaits the same result (or exception) instead of running it
+    again. The call runs in its own task, so a caller that is cancelled does not cancel it for
+    the others.
+
+    Not thread safe, it is meant to be used from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[K, asyncio.Task[V]] = {}
+        self.calls: int = 0
+        self.executions: int = 0
+        self.coalesced: int = 0
+        self.failures: int = 0
+
+    async def do(self, key: K, call: Callable[[], Awaitable[V]]) -> V:
+        self.calls += 1
+        task: Optional[asyncio.Task[V]] = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: K, task: "asyncio.Task[V]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / self.calls if self.calls else 0.0,
+            "failures": self.failures,
+        }
@@ -0,0 +1,87 @@
+"""
+Rows per second for the bulk create paths.
+
+    python -m benchmarks.bulk_insert [rows]
+
+Everything runs inside one transaction that is rolled back, so the database is left untouched.
+Passwords are pre-hashed once, the benchmark measures the database write path only.
+"""
+
+import sys
+import time
+import random
+import asyncio
+from datetime import time as clock
+from typing import Any, Dict, List
+from app.repository import TechnicianRepository, TechnicianAvailabilityRepository
+from app.utils.security import SecurityUtils
+
+from .common import database_from_settings
+
+
+class Rollback(Exception):
+    pass
+
+
+def synthetic_technicians(rows: int) -> List[Dict[str, Any]]:
+    hashed_password: str = SecurityUtils.hash_password("benchmark")
+    return [
+        {
+            "fullname": f"Benchmark Technician {i}",
+            "email": f"bench.technician{i}@example.com",
+            "phone": f"+2771{i:08d}",
+            "hashed_password": hashed_password,
+            "location": {
+                "location_name": "Pretoria",
+                "latitude": -25.74 + random.uniform(-0.2, 0.2),
+                "longitude": 28.21 + random.uniform(-0.2, 0.2),
+            },
+        }
+        for i in range(rows)
+    ]
+
+
+async def main(rows: int) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    technician_repo = TechnicianRepository(db)
+    availability_repo = TechnicianAvailabilityRepository(db)
+    data: List[Dict[str, Any]] = synthetic_technicians(rows)
+    try:
+        async with db.transaction():
+            started: float = time.perf_counter()
+            created: int = await technician_repo.create_many(data)
+            elapsed: float = time.perf_counter() - started
+            print(f"technician create_many: {created} rows in {elapsed:.3f}s ({created / elapsed:,.0f} rows/s)")
+
+            ids = [
+                r["id"]
+                for r in await db.fetchall(
+                    "SELECT id FROM technician WHERE email LIKE 'bench.technician%'"
+                )
+            ]
+            slots: List[Dict[str, Any]] = [
+                {
+                    "technician_id": technician_id,
+                    "timeslot": {
+                        "day": day,
+                        "start_time": clock(8, 0),
+                        "end_time": clock(17, 0),
+                    },
+                }
+                for technician_id in ids
+                for day in range(1, 6)
+            ]
+            started = time.perf_counter()
+            created = await availability_repo.create_many(slots)
+            elapsed = time.perf_counter() - started
+            print(f"availability create_many: {created} rows in {elapsed:.3f}s ({created / elapsed:,.0f} rows/s)")
+            raise Rollback()
+    except Rollback:
+        pass
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
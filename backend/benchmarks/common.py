@@ -0,0 +1,56 @@
+import time
+from typing import Any, List, Type
+from app.core import settings
+from app.database import AsyncDatabase
+
+
+def database_from_settings(
+    database_class: Type[AsyncDatabase] = AsyncDatabase, **overrides: Any
+) -> AsyncDatabase:
+    """Build an AsyncDatabase (or subclass) from the application settings, overriding pool options"""
+    options: dict[str, Any] = {
+        "host": settings.DATABASE_HOST,
+        "database": settings.DATABASE_NAME,
+        "username": settings.DATABASE_USER,
+        "password": settings.DATABASE_PASSWORD,
+        "port": settings.DATABASE_PORT,
+        "min_size": settings.DATABASE_POOL_MIN_SIZE,
+        "max_size": settings.DATABASE_POOL_MAX_SIZE,
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DATABASE_COMMAND_TIMEOUT,
+        "statement_timeout_ms": settings.DATABASE_STATEMENT_TIMEOUT_MS,
+    }
+    options.update(overrides)
+    return database_class(**options)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples"""
+    if not samples:
+        return 0.0
+    ordered: List[float] = sorted(samples)
+    index: int = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Stopwatch:
+    """Collect wall-clock samples in milliseconds"""
+
+    def __init__(self) -> None:
+        self.samples: List[float] = []
+        self._started: float = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.samples.append((time.perf_counter() - self._started) * 1000)
+
+    def summary(self) -> str:
+        return (
+            f"n={len(self.samples)} "
+            f"p50={percentile(self.samples, 50):.3f}ms "
+            f"p95={percentile(self.samples, 95):.3f}ms "
+            f"p99={percentile(self.samples, 99):.3f}ms"
+        )
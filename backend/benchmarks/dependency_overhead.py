@@ -0,0 +1,178 @@
+"""
+Per-request cost of resolving the service dependencies, built per request or shared.
+
+    python -m benchmarks.dependency_overhead [requests]
+
+A FastAPI app with the real dependencies answers `requests` (5000 by default) empty requests
+per route through an ASGI client: one route without dependencies, as the baseline, and for
+the auth, search and booking services one route resolving them the way deps.py used to (a
+Depends chain building the repositories and services per request) and one reading them from
+the app's Container. The difference to the baseline is the dependency overhead. Nothing is
+connected to a database, the routes do not call the services.
+"""
+
+import sys
+import asyncio
+from typing import Any, Callable, Dict, List
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from app.core import settings
+from app.database import AsyncDatabase
+from app.dependencies import (
+    Container,
+    get_auth_service,
+    get_booking_service,
+    get_db,
+    get_search_service,
+)
+from app.repository import (
+    AccessRevocations,
+    AdminRepository,
+    BookingRepository,
+    ClientRepository,
+    NearbyCache,
+    SearchRepository,
+    ServiceCatalogue,
+    TechnicianRepository,
+)
+from app.services import (
+    AdminService,
+    AuthService,
+    BookingService,
+    ClientService,
+    SearchService,
+    TechnicianService,
+)
+
+from .common import Stopwatch, database_from_settings, percentile
+
+
+# The per-request construction deps.py did before the container
+async def per_request_admin_service(request: Request, db: AsyncDatabase = Depends(get_db)) -> AdminService:
+    return AdminService(AdminRepository(db), request.app.state.user_cache)
+
+
+async def per_request_client_repository(db: AsyncDatabase = Depends(get_db)) -> ClientRepository:
+    return ClientRepository(db)
+
+
+async def per_request_client_service(
+    request: Request, repo: ClientRepository = Depends(per_request_client_repository)
+) -> ClientService:
+    return ClientService(repo, request.app.state.user_cache)
+
+
+async def per_request_technician_repository(
+    db: AsyncDatabase = Depends(get_db),
+) -> TechnicianRepository:
+    return TechnicianRepository(db)
+
+
+async def per_request_technician_service(
+    request: Request, repo: TechnicianRepository = Depends(per_request_technician_repository)
+) -> TechnicianService:
+    return TechnicianService(repo, request.app.state.user_cache)
+
+
+async def per_request_revocations(request: Request) -> AccessRevocations:
+    return request.app.state.access_revocations
+
+
+async def per_request_auth_service(
+    admin_service: AdminService = Depends(per_request_admin_service),
+    client_service: ClientService = Depends(per_request_client_service),
+    technician_service: TechnicianService = Depends(per_request_technician_service),
+    revocations: AccessRevocations = Depends(per_request_revocations),
+) -> AuthService:
+    return AuthService((admin_service, client_service, technician_service), revocations)
+
+
+async def per_request_nearby_cache(request: Request) -> NearbyCache:
+    return request.app.state.nearby_cache
+
+
+async def per_request_search_repository(
+    db: AsyncDatabase = Depends(get_db),
+    nearby_cache: NearbyCache = Depends(per_request_nearby_cache),
+) -> SearchRepository:
+    return SearchRepository(db, nearby_cache)
+
+
+async def per_request_search_service(
+    request: Request, repo: SearchRepository = Depends(per_request_search_repository)
+) -> SearchService:
+    return SearchService(
+        repo,
+        request.app.state.search_engine,
+        request.app.state.ranker,
+        request.app.state.search_results,
+    )
+
+
+async def per_request_booking_repository(db: AsyncDatabase = Depends(get_db)) -> BookingRepository:
+    return BookingRepository(db)
+
+
+async def per_request_booking_service(
+    repo: BookingRepository = Depends(per_request_booking_repository),
+) -> BookingService:
+    return BookingService(repo)
+
+
+DEPENDENCIES: Dict[str, Callable[..., Any]] = {
+    "auth/per-request": per_request_auth_service,
+    "auth/container": get_auth_service,
+    "search/per-request": per_request_search_service,
+    "search/container": get_search_service,
+    "booking/per-request": per_request_booking_service,
+    "booking/container": get_booking_service,
+}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    db: AsyncDatabase = database_from_settings()
+    app.state.db = db
+    app.state.service_catalogue = ServiceCatalogue(db)
+    app.state.access_revocations = AccessRevocations(db, settings.TOKEN_EXPIRE_MINUTES)
+    app.state.user_cache = None
+    app.state.nearby_cache = None
+    app.state.search_engine = None
+    app.state.ranker = None
+    app.state.search_results = None
+    app.state.container = Container.from_state(app.state)
+
+    @app.get("/none")
+    async def no_dependencies() -> None:
+        return None
+
+    for path, dependency in DEPENDENCIES.items():
+
+        async def route(service: Any = Depends(dependency)) -> None:
+            return None
+
+        app.add_api_route(f"/{path}", route, methods=["GET"])
+    return app
+
+
+async def main(requests: int) -> None:
+    app: FastAPI = build_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        timings: Dict[str, Stopwatch] = {}
+        for path in ["none", *DEPENDENCIES]:
+            for _ in range(requests // 10):
+                await client.get(f"/{path}")
+            stopwatch = Stopwatch()
+            for _ in range(requests):
+                with stopwatch:
+                    await client.get(f"/{path}")
+            timings[path] = stopwatch
+    baseline: float = percentile(timings["none"].samples, 50)
+    for path, stopwatch in timings.items():
+        samples: List[float] = stopwatch.samples
+        overhead_us: float = (percentile(samples, 50) - baseline) * 1000
+        print(f"{path:>20}: {stopwatch.summary()} dependencies={overhead_us:.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,149 @@
+"""
+Golden check and timing for the two-stage description search.
+
+    python -m benchmarks.description_search [client_id] [radius_km] [repeats]
+
+Runs every description in DESCRIPTIONS through the original single-statement search and the
+two-stage one. The technicians, their order and their relevance scores must match for every
+description, otherwise the script exits non-zero before timing anything. Both statements
+break ties on relevance and distance by technician id, so equal rows come back in one order.
+Read only.
+"""
+
+import sys
+import asyncio
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+from app.repository import SearchRepository
+from app.repository.technician import RETURN_QUERY as TECHNICIAN_RETURN_QUERY, CARD_JOIN
+
+from .common import Stopwatch, database_from_settings
+
+DESCRIPTIONS: List[str] = [
+    "leaking pipe",
+    "blocked drain",
+    "electrical wiring",
+    "paint",
+    "garden maintenance",
+    "install new geyser",
+    "broken window",
+]
+
+# The statement search_technicians_by_description ran before it was split into stages
+SINGLE_STAGE_QUERY: str = f"""
+            SELECT {TECHNICIAN_RETURN_QUERY},
+            ST_Distance(t.location::geometry, c.location::geometry) AS distance_meters,
+            -- Calculate relevance score using multiple search methods
+            GREATEST(
+                -- Exact phrase match in name (highest priority)
+                (SELECT MAX(CASE WHEN s.name ILIKE '%' || $3 || '%' THEN 1.0 ELSE 0.0 END)
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id),
+                
+                -- Exact phrase match in description
+                (SELECT MAX(CASE WHEN s.description ILIKE '%' || $3 || '%' THEN 0.9 ELSE 0.0 END)
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id),
+                
+                -- Full-text search with plainto_tsquery (flexible)
+                (SELECT MAX(ts_rank(s.search_vector, plainto_tsquery('english', $3)) * 0.8)
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id
+                AND s.search_vector @@ plainto_tsquery('english', $3)),
+                
+                -- Full-text search with websearch_to_tsquery (handles phrases better)
+                (SELECT MAX(ts_rank(s.search_vector, websearch_to_tsquery('english', $3)) * 0.85)
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id
+                AND s.search_vector @@ websearch_to_tsquery('english', $3)),
+                
+                -- Individual word matching (OR strategy)
+                (SELECT MAX(ts_rank(s.search_vector, 
+                    to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g'))) * 0.7)
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id
+                AND s.search_vector @@ to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g')))
+            ) AS relevance_score
+            
+            FROM technician t
+            JOIN client c ON c.id = $1
+            {CARD_JOIN}
+            WHERE ST_DWithin(t.location, c.location, $2::float8 * 1000)
+            AND EXISTS (
+                SELECT 1
+                FROM technician_service ts
+                JOIN service s ON ts.service_id = s.id
+                WHERE ts.technician_id = t.id
+                AND (
+                    -- Multiple search conditions
+                    s.name ILIKE '%' || $3 || '%'
+                    OR s.description ILIKE '%' || $3 || '%'
+                    OR s.search_vector @@ plainto_tsquery('english', $3)
+                    OR s.search_vector @@ websearch_to_tsquery('english', $3)
+                    OR s.search_vector @@ to_tsquery('english', regexp_replace(trim($3), '\\s+', ' | ', 'g'))
+                )
+            )
+            ORDER BY relevance_score DESC, distance_meters ASC, t.id
+            OFFSET $4 LIMIT $5
+"""
+
+
+def golden(records: List[Any]) -> List[Tuple[UUID, float]]:
+    return [(r["id"], round(float(r["relevance_score"]), 5)) for r in records]
+
+
+async def main(client_id: Optional[UUID], radius_km: float, repeats: int) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    repo = SearchRepository(db)
+    try:
+        if client_id is None:
+            record: Any = await db.fetchone("SELECT id FROM client LIMIT 1")
+            if record is None:
+                sys.exit("no clients to search from")
+            client_id = record["id"]
+
+        two_stage_query: str = repo.description_query()
+        counts: Dict[str, int] = {}
+        differing: List[str] = []
+        for description in DESCRIPTIONS:
+            params: List[Any] = [client_id, radius_km, description, 0, 100]
+            expected = golden(await db.fetchall(SINGLE_STAGE_QUERY, *params))
+            actual = golden(await db.fetchall(two_stage_query, *params))
+            if expected != actual:
+                differing.append(description)
+            counts[description] = len(actual)
+        if differing:
+            sys.exit(
+                "two-stage results differ from the original search for "
+                + ", ".join(repr(description) for description in differing)
+            )
+
+        for description in DESCRIPTIONS:
+            params = [client_id, radius_km, description, 0, 100]
+            single_stage, two_stage = Stopwatch(), Stopwatch()
+            for _ in range(repeats):
+                with single_stage:
+                    await db.fetchall(SINGLE_STAGE_QUERY, *params)
+                with two_stage:
+                    await db.fetchall(two_stage_query, *params)
+            print(f"{description!r} ({counts[description]} technicians)")
+            print(f"    single stage: {single_stage.summary()}")
+            print(f"       two stage: {two_stage.summary()}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            UUID(sys.argv[1]) if len(sys.argv) > 1 else None,
+            float(sys.argv[2]) if len(sys.argv) > 2 else 50.0,
+            int(sys.argv[3]) if len(sys.argv) > 3 else 50,
+        )
+    )
@@ -0,0 +1,222 @@
+"""
+End-to-end load against the FastAPI app, in process.
+
+    python -m benchmarks.load [concurrency] [duration_seconds] [mix]
+
+Runs the application (lifespan included) and `concurrency` (20 by default) simulated users
+against it for `duration_seconds` (30 by default) through an ASGI client, so every request
+goes through the real routers, dependencies, services and database but no network or
+server. Each user picks its next request from `mix`, weights such as the default
+"login=1,search=6,booking=1,notifications=3,report=1":
+
+    login          POST /auth/login as a seeded client
+    search         GET  /search/nearby/{client_id}/10/, first page of 20
+    booking        POST /booking/ for a seeded technician and one of its services, on a
+                   random hour a year or two ahead; a taken hour is a 409
+    notifications  GET  /notification/client/{client_id}, first page of 20
+    report         GET  /report/technician/{technician_id}
+
+Reports throughput and p50/p95/p99 per endpoint, non-2xx responses by status, and the
+database pool acquire wait over the run. Needs the seeded dataset (python -m benchmarks.seed);
+the bookings it creates belong to seeded users and go with `python -m benchmarks.seed reset`.
+"""
+
+import sys
+import time
+import random
+import asyncio
+from collections import Counter
+from datetime import date, timedelta
+from uuid import UUID
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Tuple
+from httpx import ASGITransport, AsyncClient, Response
+from app.main import app
+from app.database import AsyncDatabase
+
+from .common import Stopwatch
+from .seed import CENTER, SEED_DOMAIN
+
+API: str = "/api/v1"
+PASSWORD: str = "benchmark"
+RADIUS_KM: int = 10
+PAGE: int = 20
+SAMPLE: int = 1000
+DEFAULT_MIX: str = "login=1,search=6,booking=1,notifications=3,report=1"
+
+
+class Users(NamedTuple):
+    """Seeded users the simulated ones act as"""
+
+    clients: List[Tuple[UUID, str]]
+    technicians: List[UUID]
+    offers: List[Tuple[UUID, str]]
+
+
+async def load_users(db: AsyncDatabase) -> Users:
+    clients: List[Any] = await db.fetchall(
+        f"SELECT id, email FROM client WHERE email LIKE '%@{SEED_DOMAIN}' ORDER BY random() LIMIT $1",
+        SAMPLE,
+    )
+    technicians: List[Any] = await db.fetchall(
+        f"SELECT id FROM technician WHERE email LIKE '%@{SEED_DOMAIN}' ORDER BY random() LIMIT $1",
+        SAMPLE,
+    )
+    offers: List[Any] = await db.fetchall(
+        f"""
+        SELECT ts.technician_id, s.name FROM technician_service ts
+        JOIN service s ON s.id = ts.service_id
+        JOIN technician t ON t.id = ts.technician_id
+        WHERE t.email LIKE '%@{SEED_DOMAIN}'
+        ORDER BY random() LIMIT $1
+        """,
+        SAMPLE,
+    )
+    if not clients or not technicians or not offers:
+        raise SystemExit("No seeded users, run `python -m benchmarks.seed` first")
+    return Users(
+        [(record["id"], record["email"]) for record in clients],
+        [record["id"] for record in technicians],
+        [(record["technician_id"], record["name"]) for record in offers],
+    )
+
+
+Scenario = Callable[[AsyncClient, Users, random.Random], Awaitable[Response]]
+
+
+def login(client: AsyncClient, users: Users, rng: random.Random) -> Awaitable[Response]:
+    _, email = rng.choice(users.clients)
+    return client.post(
+        f"{API}/auth/login", json={"email": email, "password": PASSWORD, "user_role": "CLIENT"}
+    )
+
+
+def search(client: AsyncClient, users: Users, rng: random.Random) -> Awaitable[Response]:
+    client_id, _ = rng.choice(users.clients)
+    return client.get(f"{API}/search/nearby/{client_id}/{RADIUS_KM}/", params={"limit": PAGE})
+
+
+def booking(client: AsyncClient, users: Users, rng: random.Random) -> Awaitable[Response]:
+    client_id, _ = rng.choice(users.clients)
+    technician_id, service_name = rng.choice(users.offers)
+    hour: int = rng.randint(8, 16)
+    return client.post(
+        f"{API}/booking/",
+        json={
+            "client_id": str(client_id),
+            "technician_id": str(technician_id),
+            "service_name": service_name,
+            "description": "load test booking",
+            "timeslot": {
+                "slot_date": (date.today() + timedelta(days=rng.randint(365, 730))).isoformat(),
+                "start_time": f"{hour:02d}:00:00",
+                "end_time": f"{hour + 1:02d}:00:00",
+            },
+            "location": {"location_name": "Pretoria", "longitude": CENTER[0], "latitude": CENTER[1]},
+        },
+    )
+
+
+def notifications(client: AsyncClient, users: Users, rng: random.Random) -> Awaitable[Response]:
+    client_id, _ = rng.choice(users.clients)
+    return client.get(f"{API}/notification/client/{client_id}", params={"limit": PAGE})
+
+
+def report(client: AsyncClient, users: Users, rng: random.Random) -> Awaitable[Response]:
+    return client.get(f"{API}/report/technician/{rng.choice(users.technicians)}")
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": login,
+    "search": search,
+    "booking": booking,
+    "notifications": notifications,
+    "report": report,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name.strip()!r}, pick from {', '.join(SCENARIOS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def pool_waits(db: AsyncDatabase) -> Dict[str, Tuple[int, float]]:
+    """(queries, total acquire wait in ms) of every pool so far"""
+    return {
+        pool["name"]: (pool["queries"], pool["acquire_wait_avg_ms"] * pool["queries"])
+        for pool in db.metrics()
+    }
+
+
+async def user(
+    client: AsyncClient,
+    users: Users,
+    weights: Dict[str, float],
+    deadline: float,
+    seed: int,
+    latencies: Dict[str, Stopwatch],
+    failures: Dict[str, Counter[int]],
+) -> None:
+    rng = random.Random(seed)
+    names: List[str] = list(weights)
+    while time.perf_counter() < deadline:
+        name: str = rng.choices(names, [weights[name] for name in names])[0]
+        with latencies[name]:
+            try:
+                response: Response = await SCENARIOS[name](client, users, rng)
+                status: int = response.status_code
+            except Exception:
+                status = 0
+        if not 200 <= status < 300:
+            failures[name][status] += 1
+
+
+async def main(concurrency: int, duration: float, weights: Dict[str, float]) -> None:
+    async with app.router.lifespan_context(app):
+        db: AsyncDatabase = app.state.db
+        users: Users = await load_users(db)
+        latencies: Dict[str, Stopwatch] = {name: Stopwatch() for name in weights}
+        failures: Dict[str, Counter[int]] = {name: Counter() for name in weights}
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://benchmark", timeout=None
+        ) as client:
+            before: Dict[str, Tuple[int, float]] = pool_waits(db)
+            started: float = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    user(client, users, weights, started + duration, seed, latencies, failures)
+                    for seed in range(concurrency)
+                )
+            )
+            elapsed: float = time.perf_counter() - started
+            after: Dict[str, Tuple[int, float]] = pool_waits(db)
+
+    total: int = sum(len(stopwatch.samples) for stopwatch in latencies.values())
+    print(f"{concurrency} users for {elapsed:.1f}s: {total} requests, {total / elapsed:.1f} req/s")
+    for name, stopwatch in latencies.items():
+        failed: str = ", ".join(f"{status}: {n}" for status, n in sorted(failures[name].items()))
+        print(
+            f"{name:>13}: {len(stopwatch.samples) / elapsed:7.1f} req/s {stopwatch.summary()}"
+            + (f"  non-2xx {failed}" if failed else "")
+        )
+    for pool, (queries, waited_ms) in after.items():
+        queries -= before.get(pool, (0, 0.0))[0]
+        waited_ms -= before.get(pool, (0, 0.0))[1]
+        print(
+            f"{'pool ' + pool:>13}: {queries} queries, acquire wait "
+            f"{waited_ms / queries if queries else 0.0:.3f}ms avg, {waited_ms:.0f}ms total"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+            float(sys.argv[2]) if len(sys.argv) > 2 else 30.0,
+            parse_mix(sys.argv[3] if len(sys.argv) > 3 else DEFAULT_MIX),
+        )
+    )
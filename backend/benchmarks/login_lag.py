@@ -0,0 +1,73 @@
+"""
+Event loop lag while many logins verify their password, inline or on the bcrypt pool.
+
+    python -m benchmarks.login_lag [logins] [workers]
+
+Starts `logins` (500 by default) concurrent password verifications against one bcrypt hash,
+the CPU part of a login, first inline on the event loop (as before) then on a PasswordHasher
+of `workers` threads (PASSWORD_HASH_WORKERS by default). Meanwhile a probe sleeps 5ms at a
+time and records how late it wakes up: the delay any other request would see. No database.
+"""
+
+import sys
+import time
+import asyncio
+from typing import Awaitable, Callable, List
+from app.core import settings
+from app.utils.security import PasswordHasher, SecurityUtils
+
+from .common import Stopwatch
+
+PASSWORD: str = "benchmark"
+PROBE_INTERVAL: float = 0.005
+
+
+async def probe(lag: Stopwatch, stop: asyncio.Event) -> None:
+    """Record how much later than asked every short sleep returns, in ms"""
+    while not stop.is_set():
+        started: float = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lag.samples.append(max(0.0, time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+
+async def burst(logins: int, verify: Callable[[], Awaitable[bool]]) -> None:
+    lag = Stopwatch()
+    stop = asyncio.Event()
+    probing: asyncio.Task[None] = asyncio.create_task(probe(lag, stop))
+    await asyncio.sleep(0)
+    started: float = time.perf_counter()
+    results: List[bool] = await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed: float = time.perf_counter() - started
+    stop.set()
+    await probing
+    assert all(results)
+    print(f"  {logins} logins in {elapsed:.2f}s ({logins / elapsed:.1f}/s)")
+    print(f"  loop lag: {lag.summary()} max={max(lag.samples, default=0.0):.1f}ms")
+
+
+async def main(logins: int, workers: int) -> None:
+    hashed_password: str = SecurityUtils.hash_password(PASSWORD)
+
+    async def inline() -> bool:
+        return SecurityUtils.verify_password(PASSWORD, hashed_password)
+
+    hasher = PasswordHasher(workers)
+
+    async def pooled() -> bool:
+        return await hasher.run(SecurityUtils.PWD_CONTEXT.verify, PASSWORD, hashed_password)
+
+    print("inline on the event loop")
+    await burst(logins, inline)
+    print(f"bcrypt pool of {workers} threads")
+    await burst(logins, pooled)
+    print(f"  {hasher.stats()}")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+            int(sys.argv[2]) if len(sys.argv) > 2 else settings.PASSWORD_HASH_WORKERS,
+        )
+    )
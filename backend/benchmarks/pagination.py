@@ -0,0 +1,77 @@
+"""
+Page 1 against page 1000 of the notification list, in legacy OFFSET mode and keyset cursor mode.
+
+    python -m benchmarks.pagination [page_size] [repeats]
+
+Seeds page_size * 1000 notifications inside one transaction that is rolled back,
+so the database is left untouched.
+"""
+
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from app.repository import NotificationRepository
+
+from .bulk_insert import Rollback
+from .common import Stopwatch, database_from_settings
+
+PAGES: int = 1000
+
+
+async def main(page_size: int, repeats: int) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    repo = NotificationRepository(db)
+    rows: int = page_size * PAGES
+    started: datetime = datetime(2025, 1, 1)
+    try:
+        async with db.transaction():
+            await db.copy_records(
+                "notification",
+                [
+                    (f"Benchmark {i}", "benchmark", started + timedelta(seconds=i))
+                    for i in range(rows)
+                ],
+                columns=["title", "message", "created_at"],
+            )
+            await db.execute("ANALYZE notification")
+
+            skip: int = (PAGES - 1) * page_size
+            last: Any = await db.fetchone(
+                """
+                SELECT created_at, id FROM notification
+                ORDER BY created_at DESC, id DESC
+                OFFSET $1 LIMIT 1
+                """,
+                skip - 1,
+            )
+            page_1000_cursor: Tuple[datetime, UUID] = (last["created_at"], last["id"])
+
+            cases: List[Tuple[str, int, Optional[Tuple[datetime, UUID]]]] = [
+                ("offset page 1", 0, None),
+                (f"offset page {PAGES}", skip, None),
+                ("keyset page 1", 0, None),
+                (f"keyset page {PAGES}", 0, page_1000_cursor),
+            ]
+            for name, case_skip, after in cases:
+                stopwatch = Stopwatch()
+                for _ in range(repeats):
+                    with stopwatch:
+                        await repo.readall(None, case_skip, page_size, after)
+                print(f"{name:>18}: {stopwatch.summary()}")
+            raise Rollback()
+    except Rollback:
+        pass
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        )
+    )
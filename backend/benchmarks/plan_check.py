@@ -0,0 +1,73 @@
+"""
+Plan regression check: the radius search must be able to run on the GiST index of technician.location,
+and the availability search's booking overlap check on idx_booking_technician_slot.
+
+    python -m benchmarks.plan_check
+
+Sequential scans are disabled for the check, so a small development table still shows
+whether the predicates can use the index at all. Exits non-zero when one cannot.
+"""
+
+import sys
+import json
+import asyncio
+from uuid import uuid4
+from datetime import date, time
+from typing import Any, Dict, Iterator, List, Tuple
+from app.repository import SearchRepository
+
+from .common import database_from_settings
+
+INDEX: str = "idx_technician_location"
+BOOKING_INDEX: str = "idx_booking_technician_slot"
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def uses_index(plan: Dict[str, Any], index: str) -> bool:
+    return any(node.get("Index Name") == index for node in plan_nodes(plan))
+
+
+async def main() -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    repo = SearchRepository(db)
+    slot: List[Any] = [0, date(2025, 6, 2), time(10), time(12)]
+    cases: List[Tuple[str, bool, bool, bool, List[Any]]] = [
+        ("nearby", False, False, False, [uuid4(), 10.0, 0, 20]),
+        ("nearby by service", True, False, False, [uuid4(), 10.0, ["plumbing"], 0, 20]),
+        ("nearby next page", False, True, False, [uuid4(), 10.0, 150.0, uuid4(), 0, 20]),
+        ("nearby available", False, False, True, [uuid4(), 10.0, *slot, 0, 20]),
+    ]
+    failed: bool = False
+    try:
+        async with db.transaction():
+            await db.execute("SET LOCAL enable_seqscan = off")
+            for name, by_service, paged, available, params in cases:
+                query: str = repo.nearby_query(by_service, paged, available)
+                records: List[Any] = await db.fetchall(f"EXPLAIN (FORMAT JSON) {query}", *params)
+                explained: Any = records[0][0]
+                if isinstance(explained, str):
+                    explained = json.loads(explained)
+                plan: Dict[str, Any] = explained[0]["Plan"]
+                missing: List[str] = [
+                    index
+                    for index in [INDEX, *([BOOKING_INDEX] if available else [])]
+                    if not uses_index(plan, index)
+                ]
+                failed = failed or bool(missing)
+                status: str = "no scan on " + ", ".join(missing) if missing else "index scan"
+                print(f"{name:>18}: {status}")
+    finally:
+        await db.disconnect()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
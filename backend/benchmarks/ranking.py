@@ -0,0 +1,79 @@
+"""
+Re-ranking cost of the search ranker, in memory.
+
+    python -m benchmarks.ranking [candidates] [repeats] [technicians]
+
+Loads random features for `technicians` (100k by default) into a FeatureStore, then ranks
+`candidates` (5000 by default) random ones of them into a first page of 20 and a page after
+it, the work a ranked search adds on top of finding the candidates. Ids are asyncpg UUIDs,
+as read from the database. Needs the `geo` extra, no database.
+"""
+
+import sys
+import random
+from uuid import UUID, uuid4
+from typing import List, Tuple
+from asyncpg.pgproto.pgproto import UUID as RecordUUID  # type: ignore
+from app.services.ranking import FeatureRow, FeatureStore, Ranker, RankingWeights
+
+from .common import Stopwatch
+
+PAGE: int = 20
+RADIUS_METERS: float = 10_000.0
+WEIGHTS: RankingWeights = RankingWeights(
+    distance=0.35,
+    rating=0.2,
+    reviews=0.1,
+    verified=0.1,
+    price=0.1,
+    experience=0.05,
+    recency=0.1,
+    relevance=0.5,
+)
+
+
+def random_row(rng: random.Random) -> FeatureRow:
+    reviews: int = rng.randint(0, 300)
+    return (
+        RecordUUID(str(uuid4())),
+        sum(rng.randint(1, 5) for _ in range(min(reviews, 20))) * max(1, reviews // 20),
+        reviews,
+        rng.random() < 0.3,
+        rng.uniform(50, 2000) if rng.random() < 0.95 else None,
+        rng.randint(0, 30),
+        rng.uniform(0, 365 * 86400),
+    )
+
+
+def main(candidates: int, repeats: int, technicians: int) -> None:
+    rng = random.Random(42)
+    rows: List[FeatureRow] = [random_row(rng) for _ in range(technicians)]
+    store = FeatureStore(db=None)  # type: ignore
+    build = Stopwatch()
+    with build:
+        store.load(rows)
+    ranker = Ranker(store, WEIGHTS)
+    ids: List[UUID] = [row[0] for row in rows]
+
+    first, next_page = Stopwatch(), Stopwatch()
+    for _ in range(repeats):
+        batch: List[Tuple[float, UUID]] = sorted(
+            (rng.uniform(0, RADIUS_METERS), technician_id)
+            for technician_id in rng.sample(ids, candidates)
+        )
+        with first:
+            page = ranker.rank(batch, RADIUS_METERS, None, 0, PAGE)
+        score, _, last_id = page[-1]
+        with next_page:
+            ranker.rank(batch, RADIUS_METERS, None, 0, PAGE, (score, last_id))
+    print(f"{technicians} technicians loaded in {build.samples[0]:.1f}ms")
+    print(f"{'first page':>10}: {first.summary()}")
+    print(f"{'next page':>10}: {next_page.summary()}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 100_000,
+    )
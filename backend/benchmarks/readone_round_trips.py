@@ -0,0 +1,62 @@
+"""
+Round trips per TechnicianRepository.readone, with and without a wrapping transaction.
+
+    python -m benchmarks.readone_round_trips [iterations]
+
+The legacy mode reproduces the old behaviour of AsyncDatabase.fetchone, which opened
+connection.transaction() around every read (BEGIN, SELECT, COMMIT).
+"""
+
+import sys
+import asyncio
+from typing import Any, List, Optional
+from asyncpg import Record  # type: ignore
+from app.repository import TechnicianRepository
+
+from .common import Stopwatch, database_from_settings
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def __call__(self, record: Any) -> None:
+        self.statements.append(record.query.strip().split()[0].upper())
+
+
+async def main(iterations: int) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    try:
+        record: Optional[Record] = await db.fetchone("SELECT id FROM technician LIMIT 1")
+        if record is None:
+            print("No technicians found, seed the database first.")
+            return
+        technician_id = record["id"]
+        repo = TechnicianRepository(db)
+        counter = StatementCounter()
+        async with db._acquire() as connection:
+            connection.add_query_logger(counter)  # type: ignore
+
+        async def legacy() -> None:
+            async with db.transaction():
+                await repo.readone(technician_id)
+
+        async def autocommit() -> None:
+            await repo.readone(technician_id)
+
+        for name, call in (("transaction", legacy), ("autocommit", autocommit)):
+            await call()  # warm the statement cache
+            counter.statements.clear()
+            stopwatch = Stopwatch()
+            for _ in range(iterations):
+                with stopwatch:
+                    await call()
+            per_call: float = len(counter.statements) / iterations
+            print(f"{name:<12} round trips/readone={per_call:.1f} {stopwatch.summary()}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
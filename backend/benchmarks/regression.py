@@ -0,0 +1,367 @@
+"""
+Latency and query plan regression suite for the repository SQL.
+
+    python -m benchmarks.seed                # once, or whenever the dataset should change
+    python -m benchmarks.regression update   # record baselines.json
+    python -m benchmarks.regression [check] [repeats] [tolerance]
+
+Every CASES entry calls one repository method against the seeded database: once to record
+the statements it sends, then `repeats` times (50 by default) for its latency, and each
+recorded statement once more under EXPLAIN (ANALYZE, BUFFERS). `update` writes the results
+to BASELINES; `check` compares with them and exits non-zero when a case got more than
+`tolerance` (0.25) slower at p95, fails where it did not, or when one of its plans changed
+shape, e.g. an index scan turned into a sequential scan. Baselines are only comparable on
+the dataset they were recorded with, the row counts are part of the file.
+
+Read only, EXPLAIN ANALYZE runs inside a transaction that is rolled back.
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+from datetime import date, time, timedelta
+from uuid import UUID
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from app.database import AsyncDatabase
+from app.models.base import TimeSlot
+from app.repository import (
+    BookingRepository,
+    ClientRepository,
+    NotificationRepository,
+    PaymentRepository,
+    ReportRepository,
+    ReviewRepository,
+    SearchRepository,
+    ServiceRepository,
+    TechnicianAvailabilityRepository,
+    TechnicianRepository,
+    TechnicianServiceRepository,
+)
+
+from .bulk_insert import Rollback
+from .common import Stopwatch, database_from_settings, percentile
+from .seed import dataset_counts
+
+BASELINES: Path = Path(__file__).parent / "baselines.json"
+RADIUS_KM: float = 10.0
+PAGE: int = 20
+# A p95 within this many milliseconds of the baseline never counts as a regression
+MIN_SLOWDOWN_MS: float = 0.5
+
+
+class RecordingDatabase(AsyncDatabase):
+    """An AsyncDatabase that remembers the statements sent while `recording` is a list"""
+
+    recording: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+
+    def _record(self, query: str, values: Tuple[Any, ...]) -> None:
+        if self.recording is not None:
+            self.recording.append((query, values))
+
+    async def execute(self, query: str, *values: Any) -> str:
+        self._record(query, values)
+        return await super().execute(query, *values)
+
+    async def fetchone(self, query: str, *values: Any, replica: bool = False) -> Any:
+        self._record(query, values)
+        return await super().fetchone(query, *values, replica=replica)
+
+    async def fetchall(self, query: str, *values: Any, replica: bool = False) -> Any:
+        self._record(query, values)
+        return await super().fetchall(query, *values, replica=replica)
+
+    async def fetch_iter(
+        self, query: str, *values: Any, prefetch: int = 500, replica: bool = False
+    ) -> AsyncIterator[Any]:
+        self._record(query, values)
+        async for record in super().fetch_iter(
+            query, *values, prefetch=prefetch, replica=replica
+        ):
+            yield record
+
+
+class Fixtures(NamedTuple):
+    """Ids the cases read, the busiest of each so the plans see the largest fan-out"""
+
+    client_id: UUID
+    client_email: str
+    technician_id: UUID
+    technician_email: str
+    service_name: str
+    slot: TimeSlot
+
+
+async def load_fixtures(db: AsyncDatabase) -> Fixtures:
+    client: Any = await db.fetchone(
+        """
+        SELECT c.id, c.email FROM client c
+        JOIN booking b ON b.client_id = c.id
+        GROUP BY c.id ORDER BY COUNT(*) DESC, c.id LIMIT 1
+        """
+    )
+    technician: Any = await db.fetchone(
+        """
+        SELECT t.id, t.email FROM technician t
+        JOIN booking b ON b.technician_id = t.id
+        GROUP BY t.id ORDER BY COUNT(*) DESC, t.id LIMIT 1
+        """
+    )
+    service: Any = await db.fetchone(
+        """
+        SELECT s.name FROM service s
+        JOIN technician_service ts ON ts.service_id = s.id
+        GROUP BY s.id ORDER BY COUNT(*) DESC, s.name LIMIT 1
+        """
+    )
+    if client is None or technician is None or service is None:
+        raise SystemExit("No bookings or services to benchmark, run `python -m benchmarks.seed` first")
+    monday: date = date.today() + timedelta(days=7 - date.today().weekday())
+    return Fixtures(
+        client["id"],
+        client["email"],
+        technician["id"],
+        technician["email"],
+        service["name"],
+        TimeSlot(slot_date=monday, start_time=time(10), end_time=time(12)),
+    )
+
+
+Case = Callable[[AsyncDatabase, Fixtures], Awaitable[Any]]
+
+CASES: Dict[str, Case] = {
+    "search.nearby": lambda db, f: SearchRepository(db).search_nearby_technicians(
+        f.client_id, RADIUS_KM, None, 0, PAGE
+    ),
+    "search.nearby_by_service": lambda db, f: SearchRepository(db).search_nearby_technicians(
+        f.client_id, RADIUS_KM, [f.service_name], 0, PAGE
+    ),
+    "search.nearby_next_page": lambda db, f: SearchRepository(db).search_nearby_technicians(
+        f.client_id, RADIUS_KM, None, 0, PAGE, (1000.0, UUID(int=0))
+    ),
+    "search.nearby_available": lambda db, f: SearchRepository(db).search_nearby_technicians(
+        f.client_id, RADIUS_KM, None, 0, PAGE, None, f.slot
+    ),
+    "search.nearest_ids": lambda db, f: SearchRepository(db).nearest_ids(
+        f.client_id, RADIUS_KM, None, 5000
+    ),
+    "search.description": lambda db, f: SearchRepository(db).search_technicians_by_description(
+        f.client_id, "leaking pipe", RADIUS_KM, 0, PAGE
+    ),
+    "search.description_candidates": lambda db, f: SearchRepository(db).description_candidates(
+        f.client_id, "leaking pipe", RADIUS_KM, 5000
+    ),
+    "technician.readone": lambda db, f: TechnicianRepository(db).readone(f.technician_id),
+    "technician.readone_by_email": lambda db, f: TechnicianRepository(db).readone_by_email(
+        f.technician_email
+    ),
+    "technician.read_credentials": lambda db, f: TechnicianRepository(db).read_credentials(
+        f.technician_email
+    ),
+    "technician.exists": lambda db, f: TechnicianRepository(db).exists(
+        f.technician_email, "+27000000000"
+    ),
+    "technician.readall": lambda db, f: TechnicianRepository(db).readall(True, None, 0, PAGE),
+    "client.readone_by_email": lambda db, f: ClientRepository(db).readone_by_email(f.client_email),
+    "client.read_credentials": lambda db, f: ClientRepository(db).read_credentials(
+        f.client_email
+    ),
+    "client.exists": lambda db, f: ClientRepository(db).exists(f.client_email, "+27000000000"),
+    "client.readall": lambda db, f: ClientRepository(db).readall(None, 0, PAGE),
+    "client.readall_favorite_technicians": lambda db, f: ClientRepository(
+        db
+    ).readall_favorite_technicians(f.client_id),
+    "booking.readall_by_technician": lambda db, f: BookingRepository(db).readall(
+        None, f.technician_id, None, None, 0, PAGE
+    ),
+    "booking.readall_by_client": lambda db, f: BookingRepository(db).readall(
+        f.client_id, None, None, None, 0, PAGE
+    ),
+    "booking.collides": lambda db, f: BookingRepository(db).collides(f.technician_id, f.slot),
+    "review.readall_by_technician": lambda db, f: ReviewRepository(db).readall(
+        None, f.technician_id, None, 0, PAGE
+    ),
+    "payment.readall_by_technician": lambda db, f: PaymentRepository(db).readall_payments(
+        None, f.technician_id, None, None, None, 0, PAGE
+    ),
+    "notification.readall_by_client_id": lambda db, f: NotificationRepository(
+        db
+    ).readall_by_client_id(f.client_id, None, 0, PAGE),
+    "technician_availability.readall_by_technician_id": lambda db, f: TechnicianAvailabilityRepository(
+        db
+    ).readall_by_technician_id(f.technician_id),
+    "technician_service.readall_by_technician": lambda db, f: TechnicianServiceRepository(
+        db
+    ).readall(f.technician_id),
+    "service.suggest": lambda db, f: ServiceRepository(db).suggest("plum", 10),
+    "report.read_technician_report": lambda db, f: ReportRepository(db).read_technician_report(
+        f.technician_id
+    ),
+    "report.read_most_booked_technician": lambda db, f: ReportRepository(
+        db
+    ).read_most_booked_technician(),
+    "report.read_most_earning_technician": lambda db, f: ReportRepository(
+        db
+    ).read_most_earning_technician(),
+    "report.read_most_favorite_technician": lambda db, f: ReportRepository(
+        db
+    ).read_most_favorite_technician(),
+    "report.read_number_of_bookings": lambda db, f: ReportRepository(db).read_number_of_bookings(),
+}
+
+
+def plan_shape(plan: Dict[str, Any]) -> str:
+    """The operators of a plan and what they read, without costs or row counts"""
+    label: str = plan["Node Type"]
+    target: List[str] = [
+        plan[key] for key in ("Relation Name", "Index Name", "CTE Name") if key in plan
+    ]
+    if target:
+        label += f"[{' '.join(target)}]"
+    children: List[Dict[str, Any]] = plan.get("Plans", [])
+    if children:
+        label += f"({', '.join(plan_shape(child) for child in children)})"
+    return label
+
+
+def sequential_scans(shape: str) -> List[str]:
+    return sorted(part.split("]")[0] for part in shape.split("Seq Scan[")[1:])
+
+
+async def explain(db: AsyncDatabase, query: str, values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """EXPLAIN (ANALYZE, BUFFERS) of one statement, rolled back"""
+    explained: Any = None
+    try:
+        async with db.transaction():
+            records: List[Any] = await db.fetchall(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", *values
+            )
+            explained = records[0][0]
+            raise Rollback()
+    except Rollback:
+        pass
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    plan: Dict[str, Any] = explained[0]["Plan"]
+    return {
+        "query": " ".join(query.split())[:160],
+        "shape": plan_shape(plan),
+        "planning_ms": explained[0].get("Planning Time"),
+        "execution_ms": explained[0].get("Execution Time"),
+        "shared_hit_blocks": plan.get("Shared Hit Blocks"),
+        "shared_read_blocks": plan.get("Shared Read Blocks"),
+    }
+
+
+async def run_case(
+    db: RecordingDatabase, fixtures: Fixtures, case: Case, repeats: int
+) -> Dict[str, Any]:
+    try:
+        db.recording = []
+        await case(db, fixtures)
+        statements: List[Tuple[str, Tuple[Any, ...]]] = db.recording
+        db.recording = None
+        stopwatch = Stopwatch()
+        for _ in range(repeats):
+            with stopwatch:
+                await case(db, fixtures)
+        return {
+            "p50_ms": round(percentile(stopwatch.samples, 50), 3),
+            "p95_ms": round(percentile(stopwatch.samples, 95), 3),
+            "p99_ms": round(percentile(stopwatch.samples, 99), 3),
+            "repeats": repeats,
+            "plans": [await explain(db, query, values) for query, values in statements],
+            "error": None,
+        }
+    except Exception as e:
+        db.recording = None
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def regressions(
+    name: str, result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """What got worse in one case since its baseline"""
+    if result["error"] is not None:
+        return [] if baseline.get("error") is not None else [f"fails: {result['error']}"]
+    if baseline.get("error") is not None:
+        return []
+    found: List[str] = []
+    allowed: float = max(
+        baseline["p95_ms"] * (1 + tolerance), baseline["p95_ms"] + MIN_SLOWDOWN_MS
+    )
+    if result["p95_ms"] > allowed:
+        found.append(f"p95 {baseline['p95_ms']:.3f}ms -> {result['p95_ms']:.3f}ms")
+    shapes: List[str] = [plan["shape"] for plan in result["plans"]]
+    baseline_shapes: List[str] = [plan["shape"] for plan in baseline["plans"]]
+    if shapes != baseline_shapes:
+        for before, after in zip(baseline_shapes, shapes):
+            if before != after:
+                new_scans: str = ", ".join(
+                    table for table in sequential_scans(after) if table not in sequential_scans(before)
+                )
+                note: str = f" (new Seq Scan on {new_scans})" if new_scans else ""
+                found.append(f"plan changed{note}:\n      was {before}\n      now {after}")
+        if len(shapes) != len(baseline_shapes):
+            found.append(f"{len(baseline_shapes)} statements -> {len(shapes)}")
+    return found
+
+
+async def main(mode: str, repeats: int, tolerance: float) -> None:
+    db: RecordingDatabase = database_from_settings(RecordingDatabase, min_size=1, max_size=1)  # type: ignore
+    await db.connect()
+    try:
+        fixtures: Fixtures = await load_fixtures(db)
+        dataset: Dict[str, int] = await dataset_counts(db)
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, case in CASES.items():
+            results[name] = await run_case(db, fixtures, case, repeats)
+            result: Dict[str, Any] = results[name]
+            if result["error"] is not None:
+                print(f"{name:>50}: {result['error']}")
+            else:
+                seq: str = ", ".join(
+                    sorted({table for plan in result["plans"] for table in sequential_scans(plan["shape"])})
+                )
+                print(
+                    f"{name:>50}: p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms"
+                    + (f"  Seq Scan on {seq}" if seq else "")
+                )
+    finally:
+        await db.disconnect()
+
+    if mode == "update":
+        BASELINES.write_text(json.dumps({"dataset": dataset, "cases": results}, indent=2) + "\n")
+        print(f"Baselines written to {BASELINES}")
+        return
+
+    if not BASELINES.exists():
+        raise SystemExit(f"No {BASELINES.name}, record one with `python -m benchmarks.regression update`")
+    baselines: Dict[str, Any] = json.loads(BASELINES.read_text())
+    if baselines["dataset"] != dataset:
+        raise SystemExit(
+            f"Baselines were recorded on {baselines['dataset']}, the database has {dataset}; "
+            "seed the same dataset or record new baselines"
+        )
+    failed: bool = False
+    for name, result in results.items():
+        baseline: Optional[Dict[str, Any]] = baselines["cases"].get(name)
+        if baseline is None:
+            print(f"{name}: no baseline")
+            continue
+        for regression in regressions(name, result, baseline, tolerance):
+            failed = True
+            print(f"REGRESSION {name}: {regression}")
+    if failed:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            sys.argv[1] if len(sys.argv) > 1 else "check",
+            int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+            float(sys.argv[3]) if len(sys.argv) > 3 else 0.25,
+        )
+    )
@@ -0,0 +1,136 @@
+"""
+Revocation check: a token must stop being accepted once its user is deleted, also after the
+revocation set was reloaded from the database.
+
+    python -m benchmarks.revocation_check
+
+Each case creates a client inside a transaction that is rolled back, so the database is left
+untouched, issues it a token the way a login does, changes the client and reloads the
+revocation set. AuthService.identify is then asked about the token twice: answered by the
+revocation set, and by reading the user as when the set is not loaded or
+AUTH_STATELESS_IDENTITY is off. Exits non-zero when either accepts a revoked token.
+"""
+
+import sys
+import asyncio
+from uuid import UUID, uuid4
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi import HTTPException
+from app.core import settings
+from app.database import AsyncDatabase
+from app.dependencies import Container
+from app.models import TokenData
+from app.models.enums import UserRole
+from app.repository import AccessRevocations, ServiceCatalogue
+from app.utils.security import SecurityUtils
+
+from .common import database_from_settings
+
+
+class Rollback(Exception):
+    pass
+
+
+async def create_client(db: AsyncDatabase) -> UUID:
+    marker: str = uuid4().hex
+    record: Any = await db.fetchone(
+        """
+        INSERT INTO client (fullname, email, phone, hashed_password, location_name, location)
+        VALUES ('Revocation Check', $1, $2, 'not a hash', 'Pretoria',
+            ST_SetSRID(ST_MakePoint(28.19, -25.65), 4326)::geography)
+        RETURNING id
+        """,
+        f"revocation.{marker}@check.example.com",
+        marker,
+    )
+    return record["id"]
+
+
+async def issue_token(db: AsyncDatabase, client_id: UUID) -> str:
+    """A token carrying the client's current claims, as AuthService.authenticate builds it"""
+    record: Any = await db.fetchone(
+        "SELECT email, is_active, token_version FROM client WHERE id = $1", client_id
+    )
+    return SecurityUtils.create_access_token(
+        data=TokenData(
+            email=record["email"],
+            user_id=client_id,
+            user_role=UserRole.CLIENT,
+            is_active=record["is_active"],
+            token_version=record["token_version"],
+        ),
+        expires_delta=timedelta(minutes=settings.TOKEN_EXPIRE_MINUTES),
+    )
+
+
+async def deleted_after_reload(db: AsyncDatabase, revocations: AccessRevocations) -> str:
+    """The client is deleted, then the set is reloaded, as on a startup or a missed NOTIFY"""
+    client_id: UUID = await create_client(db)
+    token: str = await issue_token(db, client_id)
+    await db.execute("DELETE FROM client WHERE id = $1", client_id)
+    await revocations.reload()
+    return token
+
+
+async def reactivated(db: AsyncDatabase, revocations: AccessRevocations) -> str:
+    """The client is deactivated and activated again, which revokes the earlier tokens"""
+    client_id: UUID = await create_client(db)
+    token: str = await issue_token(db, client_id)
+    await db.execute("UPDATE client SET is_active = FALSE WHERE id = $1", client_id)
+    await db.execute("UPDATE client SET is_active = TRUE WHERE id = $1", client_id)
+    await revocations.reload()
+    return token
+
+
+Case = Callable[[AsyncDatabase, AccessRevocations], Awaitable[str]]
+
+CASES: Dict[str, Case] = {
+    "deleted, set reloaded": deleted_after_reload,
+    "deactivated, reactivated": reactivated,
+}
+
+
+async def rejection(container: Container, token: str) -> Optional[str]:
+    """Why identify rejected the token, None when it was accepted"""
+    try:
+        await container.auth_service.identify(token)
+    except HTTPException as e:
+        return str(e.detail)
+    return None
+
+
+async def main() -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    failed: bool = False
+    try:
+        for name, case in CASES.items():
+            revocations = AccessRevocations(db, settings.TOKEN_EXPIRE_MINUTES)
+            modes: Dict[str, Container] = {
+                "revocation set": Container(
+                    db, ServiceCatalogue(db), access_revocations=revocations
+                ),
+                "database": Container(db, ServiceCatalogue(db)),
+            }
+            rejections: Dict[str, Optional[str]] = {}
+            try:
+                async with db.transaction():
+                    token: str = await case(db, revocations)
+                    for mode, container in modes.items():
+                        rejections[mode] = await rejection(container, token)
+                    raise Rollback()
+            except Rollback:
+                pass
+            for mode, rejected in rejections.items():
+                failed = failed or rejected is None
+                outcome: str = "ACCEPTED" if rejected is None else f"rejected ({rejected})"
+                print(f"{name:>24} / {mode:<14}: {outcome}")
+    finally:
+        await db.disconnect()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
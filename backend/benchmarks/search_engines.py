@@ -0,0 +1,122 @@
+"""
+The PostGIS radius query against the NumPy search index at growing technician counts.
+
+    python -m benchmarks.search_engines [radius_km] [repeats] [sizes...]
+
+For every size (10k, 100k and 1M by default) the same random points around Pretoria are
+loaded into a temporary table with a GiST index and into a NumPy index. Both then answer the
+same nearest-first page of 20 from random client points, compared by technician ids before
+they are timed. Only the ranking is timed, reading the page's technicians costs both engines
+the same. Runs inside one transaction that is rolled back.
+"""
+
+import sys
+import random
+import asyncio
+from uuid import UUID, uuid4
+from typing import Any, List, Tuple
+from app.services.search_engine import IndexRow, NumpySearchEngine
+
+from .bulk_insert import Rollback
+from .common import Stopwatch, database_from_settings
+
+SIZES: List[int] = [10_000, 100_000, 1_000_000]
+PAGE: int = 20
+CENTER: Tuple[float, float] = (28.19, -25.65)
+
+QUERY: str = """
+WITH origin AS MATERIALIZED (
+    SELECT ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography AS location
+)
+SELECT t.id, t.location <-> (SELECT location FROM origin) AS distance_meters
+FROM search_engine_technician t
+WHERE ST_DWithin(t.location, (SELECT location FROM origin), $3::float8 * 1000)
+ORDER BY t.location <-> (SELECT location FROM origin), t.id
+LIMIT $4
+"""
+
+
+def random_point(rng: random.Random, spread: float) -> Tuple[float, float]:
+    return CENTER[0] + rng.uniform(-spread, spread), CENTER[1] + rng.uniform(-spread, spread)
+
+
+async def main(radius_km: float, repeats: int, sizes: List[int]) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    rng = random.Random(42)
+    try:
+        async with db.transaction():
+            await db.execute(
+                """
+                CREATE TEMP TABLE search_engine_technician (
+                    id UUID PRIMARY KEY,
+                    location GEOGRAPHY(POINT, 4326) NOT NULL
+                ) ON COMMIT DROP
+                """
+            )
+            await db.execute(
+                "CREATE INDEX ON search_engine_technician USING GIST (location)"
+            )
+            rows: List[IndexRow] = []
+            engine = NumpySearchEngine(db)
+            for size in sizes:
+                added: List[IndexRow] = [
+                    (uuid4(), *random_point(rng, 1.0), []) for _ in range(size - len(rows))
+                ]
+                await db.execute(
+                    """
+                    INSERT INTO search_engine_technician (id, location)
+                    SELECT id, ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography
+                    FROM unnest($1::uuid[], $2::float8[], $3::float8[]) AS p(id, lon, lat)
+                    """,
+                    [row[0] for row in added],
+                    [row[1] for row in added],
+                    [row[2] for row in added],
+                )
+                await db.execute("ANALYZE search_engine_technician")
+                rows.extend(added)
+
+                build = Stopwatch()
+                with build:
+                    engine.load(rows)
+                origins: List[Tuple[float, float]] = [
+                    random_point(rng, 0.5) for _ in range(repeats)
+                ]
+
+                mismatched: int = 0
+                for lon, lat in origins:
+                    records: List[Any] = await db.fetchall(QUERY, lon, lat, radius_km, PAGE)
+                    expected: List[UUID] = [r["id"] for r in records]
+                    actual: List[UUID] = [
+                        technician_id
+                        for _, technician_id in engine.nearest(lon, lat, radius_km * 1000, None, 0, PAGE)
+                    ]
+                    mismatched += expected != actual
+
+                postgis, numpy = Stopwatch(), Stopwatch()
+                for lon, lat in origins:
+                    with postgis:
+                        await db.fetchall(QUERY, lon, lat, radius_km, PAGE)
+                    with numpy:
+                        engine.nearest(lon, lat, radius_km * 1000, None, 0, PAGE)
+                print(f"{size:>9} technicians, numpy build {build.samples[0]:.1f}ms")
+                print(f"{'postgis':>9}: {postgis.summary()}")
+                print(f"{'numpy':>9}: {numpy.summary()}")
+                if mismatched:
+                    # Sphere against spheroid distances can swap near-equidistant neighbours
+                    print(f"{'':>9}  {mismatched}/{len(origins)} pages ordered differently")
+            raise Rollback()
+    except Rollback:
+        pass
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            float(sys.argv[1]) if len(sys.argv) > 1 else 10.0,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+            [int(size) for size in sys.argv[3:]] or SIZES,
+        )
+    )
@@ -0,0 +1,309 @@
+"""
+Seed the database with a synthetic dataset for the benchmarks.
+
+    python -m benchmarks.seed [technicians] [clients] [bookings] [reviews] [payments] [services]
+    python -m benchmarks.seed reset
+
+Defaults to 10k technicians, 20k clients, 100k bookings, 30k reviews, 50k payments and 50
+services around Pretoria, plus each technician's services, weekday availability and
+verification, clients' favourites and a notification per booking. Everything is generated
+in set-based SQL from a fixed seed, so the same arguments give the same dataset.
+
+Seeded rows are recognisable (SEED_DOMAIN e-mails, SEED_SERVICE names) and replaced on every
+run, `reset` only removes them. Row triggers are switched off while writing and the ratings
+and technician cards are rebuilt once at the end, the running app is told to reload.
+"""
+
+import sys
+import asyncio
+from loguru import logger
+from typing import Any, Dict, List
+from app.database import AsyncDatabase
+from app.utils.security import SecurityUtils
+
+from .common import database_from_settings
+
+SEED_DOMAIN: str = "seed.example.com"
+SEED_SERVICE: str = "seed service"
+CENTER: List[float] = [28.19, -25.65]
+SPREAD_DEGREES: float = 1.0
+
+DEFAULTS: Dict[str, int] = {
+    "technicians": 10_000,
+    "clients": 20_000,
+    "bookings": 100_000,
+    "reviews": 30_000,
+    "payments": 50_000,
+    "services": 50,
+}
+
+# Description words of the seeded services, so the description search has something to match
+WORDS: List[str] = [
+    "plumbing", "leaking", "pipe", "drain", "blocked", "geyser", "electrical", "wiring",
+    "socket", "lights", "paint", "walls", "garden", "lawn", "tree", "roof", "gutter", "tiles",
+    "window", "glass", "door", "lock", "carpentry", "cabinet", "appliance", "fridge",
+    "washing", "machine", "aircon", "cleaning", "carpet", "pest", "fence", "gate", "solar",
+]
+
+TRIGGERED_TABLES: List[str] = [
+    "admin",
+    "client",
+    "service",
+    "technician",
+    "technician_service",
+    "verified_technician",
+    "booking",
+    "review",
+]
+
+SEEDED_TECHNICIANS: str = f"SELECT id FROM technician WHERE email LIKE '%@{SEED_DOMAIN}'"
+SEEDED_CLIENTS: str = f"SELECT id FROM client WHERE email LIKE '%@{SEED_DOMAIN}'"
+
+# Random picks out of the seeded ids: (SELECT ids FROM pool)[1 + floor(random() * n)]
+ID_POOLS: str = f"""
+technicians AS MATERIALIZED (
+    SELECT array_agg(id ORDER BY id) AS ids, COUNT(*)::int AS n FROM ({SEEDED_TECHNICIANS}) t
+),
+clients AS MATERIALIZED (
+    SELECT array_agg(id ORDER BY id) AS ids, COUNT(*)::int AS n FROM ({SEEDED_CLIENTS}) c
+),
+services AS MATERIALIZED (
+    SELECT array_agg(id ORDER BY name) AS ids, array_agg(name ORDER BY name) AS names, COUNT(*)::int AS n
+    FROM service WHERE name LIKE '{SEED_SERVICE} %'
+)
+"""
+
+
+def pick(pool: str, column: str = "ids") -> str:
+    return f"(SELECT {column} FROM {pool})[1 + floor(random() * (SELECT n FROM {pool}))::int]"
+
+
+async def reset(db: AsyncDatabase) -> None:
+    """Delete the seeded rows, children first"""
+    for statement in [
+        f"DELETE FROM payment WHERE technician_id IN ({SEEDED_TECHNICIANS}) OR client_id IN ({SEEDED_CLIENTS})",
+        f"DELETE FROM review WHERE technician_id IN ({SEEDED_TECHNICIANS}) OR client_id IN ({SEEDED_CLIENTS})",
+        f"DELETE FROM notification WHERE technician_id IN ({SEEDED_TECHNICIANS}) OR client_id IN ({SEEDED_CLIENTS})",
+        f"DELETE FROM favorite_technician WHERE technician_id IN ({SEEDED_TECHNICIANS}) OR client_id IN ({SEEDED_CLIENTS})",
+        f"DELETE FROM booking WHERE technician_id IN ({SEEDED_TECHNICIANS}) OR client_id IN ({SEEDED_CLIENTS})",
+        f"DELETE FROM technician_availability WHERE technician_id IN ({SEEDED_TECHNICIANS})",
+        f"DELETE FROM verified_technician WHERE technician_id IN ({SEEDED_TECHNICIANS})",
+        f"DELETE FROM technician_service WHERE technician_id IN ({SEEDED_TECHNICIANS})"
+        f" OR service_id IN (SELECT id FROM service WHERE name LIKE '{SEED_SERVICE} %')",
+        f"DELETE FROM technician WHERE email LIKE '%@{SEED_DOMAIN}'",
+        f"DELETE FROM client WHERE email LIKE '%@{SEED_DOMAIN}'",
+        f"DELETE FROM admin WHERE email LIKE '%@{SEED_DOMAIN}'",
+        f"DELETE FROM service WHERE name LIKE '{SEED_SERVICE} %'",
+    ]:
+        await db.execute(statement)
+
+
+async def seed(db: AsyncDatabase, counts: Dict[str, int]) -> None:
+    hashed_password: str = SecurityUtils.hash_password("benchmark")
+    await db.execute("SELECT setseed(0.42)")
+    await db.execute(
+        f"""
+        INSERT INTO admin (fullname, email, phone, hashed_password, role)
+        VALUES ('Seed Admin', 'admin@{SEED_DOMAIN}', '+27740000000', $1, 'SUPER_ADMIN')
+        """,
+        hashed_password,
+    )
+    await db.execute(
+        f"""
+        INSERT INTO service (name, description)
+        SELECT
+            '{SEED_SERVICE} ' || i,
+            array_to_string(ARRAY(
+                SELECT ($2::text[])[1 + floor(random() * cardinality($2::text[]))::int]
+                FROM generate_series(1, 6 + i % 3)
+            ), ' ')
+        FROM generate_series(1, $1) i
+        """,
+        counts["services"],
+        WORDS,
+    )
+    for table, phone_prefix, extra_columns, extra_values in [
+        ("technician", "+2772", ", is_available", ", random() < 0.9"),
+        ("client", "+2773", "", ""),
+    ]:
+        await db.execute(
+            f"""
+            INSERT INTO {table} (
+                fullname, email, phone, hashed_password, location_name, location, created_at
+                {extra_columns}
+            )
+            SELECT
+                'Seed {table.title()} ' || i,
+                '{table}' || i || '@{SEED_DOMAIN}',
+                '{phone_prefix}' || lpad(i::text, 8, '0'),
+                $2,
+                'Pretoria',
+                ST_SetSRID(ST_MakePoint(
+                    $3 + (random() - 0.5) * $5, $4 + (random() - 0.5) * $5
+                ), 4326)::geography,
+                NOW() - random() * INTERVAL '730 days'
+                {extra_values}
+            FROM generate_series(1, $1) i
+            """,
+            counts[f"{table}s"],
+            hashed_password,
+            CENTER[0],
+            CENTER[1],
+            SPREAD_DEGREES,
+        )
+    await db.execute(
+        f"""
+        WITH {ID_POOLS}
+        INSERT INTO technician_service (service_id, technician_id, experience_years, price)
+        SELECT DISTINCT ON (technician_id, service_id)
+            service_id, technician_id, floor(random() * 20)::smallint, round((50 + random() * 1950)::numeric, 2)
+        FROM (
+            SELECT t.id AS technician_id, {pick("services")} AS service_id
+            FROM ({SEEDED_TECHNICIANS}) t
+            CROSS JOIN generate_series(1, 3) k
+            WHERE k = 1 OR random() < 0.4
+        ) offered
+        """
+    )
+    await db.execute(
+        f"""
+        INSERT INTO verified_technician (technician_id, admin_id)
+        SELECT t.id, (SELECT id FROM admin WHERE email = 'admin@{SEED_DOMAIN}')
+        FROM ({SEEDED_TECHNICIANS}) t
+        WHERE random() < 0.3
+        """
+    )
+    await db.execute(
+        f"""
+        INSERT INTO technician_availability (technician_id, day, start_time, end_time)
+        SELECT t.id, day, TIME '08:00', TIME '17:00'
+        FROM ({SEEDED_TECHNICIANS}) t
+        CROSS JOIN generate_series(1, 5) day -- Monday to Friday, 0 is Sunday
+        """
+    )
+    await db.execute(
+        f"""
+        WITH {ID_POOLS},
+        picked AS (
+            SELECT
+                {pick("clients")} AS client_id,
+                {pick("technicians")} AS technician_id,
+                {pick("services", "names")} AS service_name,
+                8 + floor(random() * 8)::int AS start_hour,
+                1 + floor(random() * 2)::int AS hours,
+                (ARRAY['REQUESTED', 'ACCEPTED', 'REJECTED', 'IN_PROGRESS', 'COMPLETED', 'COMPLETED', 'COMPLETED', 'CANCELLED'])
+                    [1 + floor(random() * 8)::int] AS status,
+                CURRENT_DATE + (floor(random() * 180)::int - 120) AS booking_date,
+                NOW() - random() * INTERVAL '365 days' AS created_at
+            FROM generate_series(1, $1)
+        )
+        INSERT INTO booking (
+            client_id, technician_id, service_name, description, booking_date, start_time, end_time,
+            location_name, location, status, created_at
+        )
+        SELECT
+            p.client_id, p.technician_id, p.service_name, 'seed booking', p.booking_date,
+            make_time(p.start_hour, 0, 0), make_time(p.start_hour + p.hours, 0, 0),
+            c.location_name, c.location, p.status, p.created_at
+        FROM picked p
+        JOIN client c ON c.id = p.client_id
+        """,
+        counts["bookings"],
+    )
+    await db.execute(
+        f"""
+        INSERT INTO review (booking_id, technician_id, client_id, rating, comment, created_at)
+        SELECT b.id, b.technician_id, b.client_id, 1 + floor(random() * 5)::int, 'seed review',
+            b.created_at + random() * INTERVAL '7 days'
+        FROM booking b
+        WHERE b.technician_id IN ({SEEDED_TECHNICIANS}) AND b.status = 'COMPLETED'
+        ORDER BY random()
+        LIMIT $1
+        """,
+        counts["reviews"],
+    )
+    await db.execute(
+        f"""
+        INSERT INTO payment (booking_id, client_id, technician_id, amount, status, created_at)
+        SELECT b.id, b.client_id, b.technician_id, round((50 + random() * 1950)::numeric, 2),
+            (ARRAY['PENDING', 'EZCROW', 'COMPLETED', 'COMPLETED', 'RETURNED'])[1 + floor(random() * 5)::int],
+            b.created_at
+        FROM booking b
+        WHERE b.technician_id IN ({SEEDED_TECHNICIANS})
+        ORDER BY random()
+        LIMIT $1
+        """,
+        counts["payments"],
+    )
+    await db.execute(
+        f"""
+        WITH {ID_POOLS}
+        INSERT INTO favorite_technician (client_id, technician_id)
+        SELECT c.id, {pick("technicians")}
+        FROM ({SEEDED_CLIENTS}) c
+        WHERE random() < 0.3
+        ON CONFLICT DO NOTHING
+        """
+    )
+    await db.execute(
+        f"""
+        INSERT INTO notification (client_id, technician_id, title, message, is_read, created_at)
+        SELECT b.client_id, b.technician_id, 'Booking ' || lower(b.status), 'seed notification',
+            random() < 0.5, b.created_at
+        FROM booking b
+        WHERE b.technician_id IN ({SEEDED_TECHNICIANS})
+        """
+    )
+
+
+async def main(counts: Dict[str, int], only_reset: bool) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    try:
+        async with db.transaction():
+            for table in TRIGGERED_TABLES:
+                await db.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+            await reset(db)
+            if not only_reset:
+                await seed(db, counts)
+            await db.execute("SELECT reconcile_technician_ratings()")
+            await db.execute("SELECT reconcile_technician_cards()")
+            for table in TRIGGERED_TABLES:
+                await db.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+            # The triggers were off, every in-process cache and index has to reload
+            await db.notify("technician_changed", "{}")
+            await db.notify("service_changed", "SEED")
+            await db.notify("user_access_changed", "{}")
+            await db.notify("user_changed", "SEED")
+        await db.execute("ANALYZE")
+        dataset: Dict[str, Any] = await dataset_counts(db)
+        logger.success(f"Seeded dataset: {dataset}")
+    finally:
+        await db.disconnect()
+
+
+async def dataset_counts(db: AsyncDatabase) -> Dict[str, int]:
+    """Row counts of the tables the benchmarks read"""
+    return {
+        table: await db.count(f"SELECT COUNT(*) AS count FROM {table}")
+        for table in [
+            "technician",
+            "client",
+            "service",
+            "technician_service",
+            "booking",
+            "review",
+            "payment",
+            "notification",
+            "favorite_technician",
+        ]
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["reset"]:
+        asyncio.run(main(DEFAULTS, only_reset=True))
+    else:
+        counts: Dict[str, int] = dict(DEFAULTS)
+        counts.update(zip(DEFAULTS, (int(value) for value in sys.argv[1:])))
+        asyncio.run(main(counts, only_reset=False))
@@ -0,0 +1,84 @@
+"""
+Technician listing through the technician_card read model against the correlated subqueries it replaced.
+
+    python -m benchmarks.technician_card [page_size] [repeats]
+
+Read only, runs against whatever technicians are already in the database.
+Both queries must return the same cards, the benchmark refuses to time them otherwise.
+"""
+
+import sys
+import asyncio
+from typing import Any, Dict, List
+from app.repository.technician import RETURN_QUERY, CARD_JOIN
+
+from .common import Stopwatch, database_from_settings
+
+SUBQUERY_RETURN_QUERY: str = """
+    t.id,
+    t.fullname,
+    t.email,
+    t.phone,
+    t.hashed_password,
+    t.location_name,
+    ST_X(t.location::geometry) AS longitude,
+    ST_Y(t.location::geometry) AS latitude,
+    (SELECT AVG(r.rating) FROM review r WHERE technician_id = t.id) AS rating,
+    ARRAY(
+        SELECT s.name
+        FROM technician_service ts
+        JOIN service s ON s.id = ts.service_id
+        WHERE ts.technician_id = t.id
+        ORDER BY s.name
+    ) AS services,
+    t.is_available,
+    (SELECT COUNT(*) > 0 FROM verified_technician vt WHERE vt.technician_id = t.id) AS is_verified,
+    t.is_active,
+    t.created_at
+"""
+
+QUERIES: Dict[str, str] = {
+    "subqueries": f"""
+        SELECT {SUBQUERY_RETURN_QUERY} FROM technician t
+        ORDER BY t.created_at DESC, t.id DESC LIMIT $1
+    """,
+    "technician_card": f"""
+        SELECT {RETURN_QUERY} FROM technician t {CARD_JOIN}
+        ORDER BY t.created_at DESC, t.id DESC LIMIT $1
+    """,
+}
+
+
+def cards(records: List[Any]) -> List[Any]:
+    return [
+        (r["id"], round(float(r["rating"] or 0), 6), list(r["services"]), r["is_verified"])
+        for r in records
+    ]
+
+
+async def main(page_size: int, repeats: int) -> None:
+    db = database_from_settings(min_size=1, max_size=1)
+    await db.connect()
+    try:
+        expected, actual = [
+            cards(await db.fetchall(query, page_size)) for query in QUERIES.values()
+        ]
+        if expected != actual:
+            sys.exit("technician_card disagrees with the source tables, run check-technician-cards")
+        for name, query in QUERIES.items():
+            stopwatch = Stopwatch()
+            for _ in range(repeats):
+                with stopwatch:
+                    await db.fetchall(query, page_size)
+            print(f"{name:>16}: {stopwatch.summary()}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        )
+    )